@@ -0,0 +1,156 @@
+"""
+Provides an AIMD controller that tunes an upstream's concurrency limit.
+
+The `AIMDController` adjusts a `ConcurrencyLimiter` at runtime using the
+additive-increase / multiplicative-decrease scheme known from TCP congestion
+control:
+
+-   While responses arrive with latency close to the observed baseline, the
+    limit grows by a fixed step once per "window" of successful responses
+    (one window being as many responses as the current limit).
+-   When the upstream signals overload (429/503 responses or timeouts), or when
+    recent latency rises well above the baseline, the limit is multiplied by a
+    decrease factor. Decreases are rate-limited by a cooldown so that a burst of
+    failures from one overload episode only cuts the limit once.
+
+The limit always stays within configurable minimum and maximum bounds.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.api.concurrency_limiter import ConcurrencyLimiter
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease concurrency controller.
+
+    Attributes:
+        limiter (ConcurrencyLimiter): The limiter whose limit is adjusted.
+        min_limit (int): The lowest limit the controller will set.
+        max_limit (int): The highest limit the controller will set.
+    """
+
+    # Smoothing factors for the slow-moving baseline and the fast-moving
+    # recent latency averages.
+    BASELINE_ALPHA = 0.02
+    RECENT_ALPHA = 0.3
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        min_limit: int,
+        max_limit: int,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the AIMDController.
+
+        Args:
+            limiter (ConcurrencyLimiter): The limiter to control. Its current
+                limit is clamped into [min_limit, max_limit].
+            min_limit (int): The lowest allowed limit.
+            max_limit (int): The highest allowed limit.
+            increase_step (int): How much the limit grows per healthy window.
+                Defaults to 1.
+            decrease_factor (float): Multiplier applied on overload, between
+                0 and 1. Defaults to 0.5.
+            latency_tolerance (float): Recent latency above
+                `baseline * latency_tolerance` counts as overload. Defaults to 2.0.
+            cooldown_seconds (float): Minimum time between two decreases.
+                Defaults to 1.0.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self.limiter = limiter
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._cooldown_seconds = cooldown_seconds
+        self._clock = clock
+
+        self._baseline_latency: Optional[float] = None
+        self._recent_latency: Optional[float] = None
+        self._successes_in_window = 0
+        self._last_decrease: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+        self.limiter.set_limit(self._clamp(self.limiter.limit))
+
+    def _clamp(self, limit: int) -> int:
+        """Keeps a limit within the configured bounds."""
+        return max(self.min_limit, min(self.max_limit, limit))
+
+    def record_success(self, latency: float) -> None:
+        """
+        Records a successful response and its latency.
+
+        Args:
+            latency (float): The response latency in seconds.
+        """
+        if self._baseline_latency is None or self._recent_latency is None:
+            self._baseline_latency = self._recent_latency = latency
+        else:
+            self._recent_latency += self.RECENT_ALPHA * (latency - self._recent_latency)
+            self._baseline_latency += self.BASELINE_ALPHA * (
+                latency - self._baseline_latency
+            )
+
+        if self._recent_latency > self._baseline_latency * self._latency_tolerance:
+            self._decrease()
+            return
+
+        self._successes_in_window += 1
+        if self._successes_in_window >= self.limiter.limit:
+            self._successes_in_window = 0
+            new_limit = self._clamp(self.limiter.limit + self._increase_step)
+            if new_limit != self.limiter.limit:
+                self.limiter.set_limit(new_limit)
+                self.increases += 1
+
+    def record_overload(self) -> None:
+        """Records an overload signal, such as a 429/503 response or a timeout."""
+        self._decrease()
+
+    def _decrease(self) -> None:
+        """Cuts the limit multiplicatively, at most once per cooldown period."""
+        now = self._clock()
+        if (
+            self._last_decrease is not None
+            and now - self._last_decrease < self._cooldown_seconds
+        ):
+            return
+        self._last_decrease = now
+        self._successes_in_window = 0
+        # Let the recent average start over so one slow episode is not
+        # counted again after the cut.
+        self._recent_latency = self._baseline_latency
+        new_limit = self._clamp(int(self.limiter.limit * self._decrease_factor))
+        if new_limit != self.limiter.limit:
+            self.limiter.set_limit(new_limit)
+            self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the controller's state.
+
+        Returns:
+            Dict[str, Any]: The current limit, bounds, latency averages and
+            adjustment counters.
+        """
+        return {
+            "current_limit": self.limiter.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "baseline_latency_seconds": self._baseline_latency,
+            "recent_latency_seconds": self._recent_latency,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
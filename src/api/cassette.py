@@ -0,0 +1,256 @@
+"""
+Records upstream traffic to a cassette file and replays it offline.
+
+A cassette holds every request/response pair of a run together with the time
+each response took. Recording a real run against Jira and Confluence and
+replaying it later lets the sync endpoints be profiled and benchmarked
+deterministically, against production-shaped data, without live access.
+
+-   **Recording:** `RecordingTransport` wraps the real transport of an
+    upstream pool and adds every exchange to a `Cassette`, which is written
+    when the `HTTPSHelper` is closed.
+-   **Replaying:** `ReplayTransport` answers requests from a loaded cassette,
+    optionally sleeping for the recorded latency multiplied by a scale factor
+    (1 keeps the original timings, 0 replays as fast as possible).
+
+Cassettes are gzip-compressed JSON lines. Only the method, URL and a hash of
+the request body are stored for requests, so credentials never reach the
+file. Repeated identical requests are answered in recorded order, and the last
+recorded answer is reused once a request has been replayed more often than it
+was recorded.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Response headers that are not worth storing in a cassette.
+_SKIPPED_HEADERS = frozenset({"set-cookie", "date"})
+
+# Headers describing the encoded body, dropped when the body is stored decoded.
+_ENCODING_HEADERS = frozenset({"content-encoding", "content-length"})
+
+InteractionKey = Tuple[str, str, str]
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised when a replayed request has no recorded response."""
+
+    pass
+
+
+def interaction_key(request: httpx.Request) -> InteractionKey:
+    """
+    Returns the key a request is recorded and looked up under.
+
+    Args:
+        request (httpx.Request): The request, with its body already read.
+
+    Returns:
+        InteractionKey: The method, the full URL and a hash of the body.
+    """
+    body_hash = hashlib.sha256(request.content).hexdigest()[:16]
+    return request.method, str(request.url), body_hash
+
+
+class Cassette:
+    """
+    An ordered collection of recorded request/response pairs.
+
+    Attributes:
+        path (str): The file the cassette is loaded from and saved to.
+        interactions (List[Dict[str, Any]]): The recorded interactions.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes an empty Cassette.
+
+        Args:
+            path (str): The file the cassette is saved to.
+        """
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[InteractionKey, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[InteractionKey, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """
+        Reads a cassette from disk.
+
+        Args:
+            path (str): The cassette file.
+
+        Returns:
+            Cassette: The cassette, ready for replay.
+        """
+        cassette = cls(path)
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            cassette.interactions = [json.loads(line) for line in file if line.strip()]
+        queues: Dict[InteractionKey, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for interaction in cassette.interactions:
+            queues[cls._key_of(interaction)].append(interaction)
+        cassette._queues = dict(queues)
+        logger.info(f"Loaded {len(cassette.interactions)} interactions from {path}.")
+        return cassette
+
+    def save(self) -> None:
+        """Writes the recorded interactions to the cassette file."""
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            for interaction in self.interactions:
+                file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+        logger.info(f"Saved {len(self.interactions)} interactions to {self.path}.")
+
+    @staticmethod
+    def _key_of(interaction: Dict[str, Any]) -> InteractionKey:
+        """Returns the lookup key of a recorded interaction."""
+        return interaction["method"], interaction["url"], interaction["body_hash"]
+
+    def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        content: bytes,
+        elapsed: float,
+        decoded: bool = False,
+    ) -> None:
+        """
+        Adds an exchange to the cassette.
+
+        Args:
+            request (httpx.Request): The request, with its body already read.
+            response (httpx.Response): The response, for its status and headers.
+            content (bytes): The response body.
+            elapsed (float): Seconds from sending the request to receiving the
+                whole body.
+            decoded (bool): Whether `content` has already been decoded, in
+                which case the content-coding headers are not stored.
+                Defaults to False.
+        """
+        skipped = _SKIPPED_HEADERS | _ENCODING_HEADERS if decoded else _SKIPPED_HEADERS
+        method, url, body_hash = interaction_key(request)
+        self.interactions.append(
+            {
+                "method": method,
+                "url": url,
+                "body_hash": body_hash,
+                "status": response.status_code,
+                "headers": [
+                    [name, value]
+                    for name, value in response.headers.multi_items()
+                    if name.lower() not in skipped
+                ],
+                "content": base64.b64encode(content).decode("ascii"),
+                "elapsed": round(elapsed, 6),
+            }
+        )
+
+    def next_for(self, request: httpx.Request) -> Dict[str, Any]:
+        """
+        Returns the recorded interaction that answers a request.
+
+        Args:
+            request (httpx.Request): The request, with its body already read.
+
+        Returns:
+            Dict[str, Any]: The next unused interaction for the request, or
+            the last one if all have been used.
+
+        Raises:
+            CassetteMissError: If the request was never recorded.
+        """
+        key = interaction_key(request)
+        queue = self._queues.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        if key not in self._last:
+            raise CassetteMissError(
+                f"No recorded response for {request.method} {request.url}",
+                request=request,
+            )
+        return self._last[key]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """A transport that forwards requests and records every exchange."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cassette: Cassette):
+        """
+        Initializes the RecordingTransport.
+
+        Args:
+            transport (httpx.AsyncBaseTransport): The transport that talks to
+                the upstream.
+            cassette (Cassette): The cassette exchanges are recorded to.
+        """
+        self._transport = transport
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        started = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        if response.is_stream_consumed:
+            # The inner transport has already read and decoded the body (see
+            # CompressionTransport), so it is recorded decoded.
+            elapsed = time.monotonic() - started
+            self._cassette.record(
+                request, response, response.content, elapsed, decoded=True
+            )
+            return response
+        try:
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        self._cassette.record(request, response, content, time.monotonic() - started)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            extensions={
+                "http_version": response.extensions.get("http_version", b"HTTP/1.1")
+            },
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """A transport that answers requests from a cassette."""
+
+    def __init__(self, cassette: Cassette, timing_scale: float = 1.0):
+        """
+        Initializes the ReplayTransport.
+
+        Args:
+            cassette (Cassette): The cassette to replay.
+            timing_scale (float): Multiplier for the recorded latencies; 0
+                answers immediately. Defaults to 1.
+        """
+        self._cassette = cassette
+        self.timing_scale = max(0.0, timing_scale)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        interaction = self._cassette.next_for(request)
+        delay = interaction["elapsed"] * self.timing_scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            status_code=interaction["status"],
+            headers=interaction["headers"],
+            content=base64.b64decode(interaction["content"]),
+            extensions={"http_version": b"HTTP/1.1"},
+        )
@@ -0,0 +1,195 @@
+"""
+Provides a circuit breaker that stops calls to an upstream that is down.
+
+Without a breaker, every request to an unavailable upstream still goes through
+the full retry schedule, so a single sync run can hang for minutes while
+holding concurrency slots. The `CircuitBreaker` tracks the outcome of recent
+requests to one upstream and moves between three states:
+
+-   **closed:** Requests flow normally. Outcomes are recorded in a sliding
+    time window, and once the window holds enough requests with a failure rate
+    at or above the threshold, the circuit opens.
+-   **open:** Requests are rejected immediately. After the open period has
+    elapsed the circuit becomes half-open.
+-   **half-open:** A limited number of probe requests is let through. A
+    successful probe closes the circuit again; a failed probe re-opens it.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class CircuitBreaker:
+    """
+    A sliding-window, error-rate based circuit breaker for one upstream.
+
+    Attributes:
+        failure_rate_threshold (float): Failure ratio (0-1) that opens the circuit.
+        minimum_requests (int): Requests needed in the window before the
+            failure rate is evaluated.
+        window_seconds (float): Length of the sliding window.
+        open_seconds (float): How long the circuit stays open before probing.
+        half_open_max_calls (int): Concurrent probes allowed while half-open.
+        times_opened (int): How often the circuit has opened.
+        rejected (int): Requests rejected because the circuit was open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_requests: int = 20,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            failure_rate_threshold (float): Failure ratio that opens the
+                circuit. Defaults to 0.5.
+            minimum_requests (int): Requests needed in the window before the
+                circuit may open. Defaults to 20.
+            window_seconds (float): Length of the sliding window in seconds.
+                Defaults to 30.
+            open_seconds (float): Seconds the circuit stays open before a probe
+                is allowed. Defaults to 30.
+            half_open_max_calls (int): Concurrent probes allowed while
+                half-open. Defaults to 1.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_requests = max(1, minimum_requests)
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+
+        self._state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+        self._last_probe_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, moving from open to half-open once it is due."""
+        if (
+            self._state == self.OPEN
+            and self._opened_at is not None
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Decides whether a request may be sent to the upstream.
+
+        Returns:
+            bool: True if the request may proceed, False if it must be
+            rejected because the circuit is open.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = self._clock()
+            # A probe that never reported back (e.g. it was cancelled) must
+            # not keep the circuit half-open forever.
+            if (
+                self._probes_in_flight < self.half_open_max_calls
+                or now - self._last_probe_at >= self.open_seconds
+            ):
+                self._probes_in_flight += 1
+                self._last_probe_at = now
+                return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Records a request that reached a healthy upstream."""
+        if self._state == self.HALF_OPEN:
+            self._close()
+        elif self._state == self.CLOSED:
+            self._record(success=True)
+
+    def record_failure(self) -> None:
+        """Records a request that failed because of the upstream."""
+        if self._state == self.HALF_OPEN:
+            self._open()
+        elif self._state == self.CLOSED:
+            self._record(success=False)
+            total = len(self._outcomes)
+            if (
+                total >= self.minimum_requests
+                and self._failures / total >= self.failure_rate_threshold
+            ):
+                self._open()
+
+    def _record(self, success: bool) -> None:
+        """Adds an outcome to the window and drops expired ones."""
+        now = self._clock()
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        """Drops outcomes that have left the sliding window."""
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            _, expired_success = self._outcomes.popleft()
+            if not expired_success:
+                self._failures -= 1
+
+    def _open(self) -> None:
+        """Opens the circuit."""
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+    def _close(self) -> None:
+        """Closes the circuit and starts a fresh window."""
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+        self._failures = 0
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through, or 0."""
+        if self.state != self.OPEN or self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - self._clock())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the breaker's state.
+
+        Returns:
+            Dict[str, Any]: The state, the failure rate over the current
+            window, seconds until the next probe, and counters.
+        """
+        self._expire(self._clock())
+        total = len(self._outcomes)
+        return {
+            "state": self.state,
+            "window_requests": total,
+            "failure_rate": round(self._failures / total, 3) if total else 0.0,
+            "retry_in_seconds": round(self.retry_in, 3),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,187 @@
+"""
+Negotiates response compression per upstream and measures its effect.
+
+Confluence storage-format bodies are large and compress very well, but whether
+a response actually arrives compressed depends on the upstream and on every
+proxy in between. The `CompressionTransport` sets the `Accept-Encoding` header
+configured for its upstream on every request and records, per content coding,
+how many bytes came over the wire versus how many the body has once decoded.
+Those counters are exposed through `CompressionStats` so the bandwidth savings
+can be checked in `/metrics`.
+
+Brotli (`br`) and Zstandard (`zstd`) are only offered if the optional
+`brotli`/`brotlicffi` or `zstandard` package is installed, since httpx cannot
+decode them otherwise (`pip install .[compression]`).
+"""
+
+import importlib.util
+import logging
+from typing import Any, Dict, List
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Encodings that httpx always decodes, in order of preference.
+_BUILTIN_ENCODINGS = ["gzip", "deflate"]
+
+# Responses at least this large that arrive uncompressed trigger a warning.
+UNCOMPRESSED_WARNING_BYTES = 16 * 1024
+
+
+def available_encodings() -> List[str]:
+    """
+    Returns the content codings httpx can decode in this environment.
+
+    Returns:
+        List[str]: Supported codings, most preferred first.
+    """
+    encodings = []
+    if importlib.util.find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    if any(
+        importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")
+    ):
+        encodings.append("br")
+    return encodings + _BUILTIN_ENCODINGS
+
+
+def resolve_accept_encoding(setting: str) -> str:
+    """
+    Turns a configured compression setting into an `Accept-Encoding` value.
+
+    Args:
+        setting (str): 'auto' for every supported coding, 'identity' (or an
+            empty string) to disable compression, or a comma-separated list
+            of codings such as 'zstd, gzip'.
+
+    Returns:
+        str: The `Accept-Encoding` header value. Codings that cannot be
+        decoded here are dropped with a warning.
+    """
+    setting = setting.strip().lower()
+    supported = available_encodings()
+    if setting == "auto":
+        return ", ".join(supported)
+    requested = [coding.strip() for coding in setting.split(",") if coding.strip()]
+    accepted = [coding for coding in requested if coding in supported]
+    dropped = [coding for coding in requested if coding not in accepted]
+    if dropped and dropped != ["identity"]:
+        logger.warning(
+            f"Cannot decode content coding(s) {', '.join(dropped)}; "
+            "install the 'compression' extra to enable them."
+        )
+    return ", ".join(accepted) or "identity"
+
+
+class CompressionStats:
+    """
+    Wire and decoded byte counters of one upstream, per content coding.
+
+    Attributes:
+        accept_encoding (str): The `Accept-Encoding` value sent upstream.
+    """
+
+    def __init__(self, accept_encoding: str):
+        """
+        Initializes the CompressionStats.
+
+        Args:
+            accept_encoding (str): The `Accept-Encoding` value sent upstream.
+        """
+        self.accept_encoding = accept_encoding
+        self._by_encoding: Dict[str, Dict[str, int]] = {}
+
+    def record(self, encoding: str, wire_bytes: int, decoded_bytes: int) -> None:
+        """
+        Records the size of one response body.
+
+        Args:
+            encoding (str): The response's content coding, or 'identity'.
+            wire_bytes (int): Body bytes received over the network.
+            decoded_bytes (int): Body bytes after decoding.
+        """
+        counters = self._by_encoding.setdefault(
+            encoding, {"responses": 0, "wire_bytes": 0, "decoded_bytes": 0}
+        )
+        counters["responses"] += 1
+        counters["wire_bytes"] += wire_bytes
+        counters["decoded_bytes"] += decoded_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the byte counters and the overall saving.
+
+        Returns:
+            Dict[str, Any]: The negotiated codings, counters per received
+            content coding, and totals with the fraction of bytes saved.
+        """
+        wire = sum(c["wire_bytes"] for c in self._by_encoding.values())
+        decoded = sum(c["decoded_bytes"] for c in self._by_encoding.values())
+        return {
+            "accept_encoding": self.accept_encoding,
+            "by_encoding": {k: dict(v) for k, v in sorted(self._by_encoding.items())},
+            "wire_bytes": wire,
+            "decoded_bytes": decoded,
+            "saved_ratio": round(1 - wire / decoded, 3) if decoded else 0.0,
+        }
+
+
+class CompressionTransport(httpx.AsyncHTTPTransport):
+    """
+    An `AsyncHTTPTransport` that negotiates compression and measures it.
+
+    The response body is read here, so that both its size on the wire and
+    its decoded size are known before the response is handed to the client.
+    """
+
+    def __init__(self, name: str, compression: CompressionStats, **kwargs: Any) -> None:
+        """
+        Initializes the CompressionTransport.
+
+        Args:
+            name (str): The upstream name, used in logs.
+            compression (CompressionStats): Receives the byte counts.
+            **kwargs (Any): Passed on to `httpx.AsyncHTTPTransport`.
+        """
+        super().__init__(**kwargs)
+        self._name = name
+        self.compression = compression
+        self._warned_uncompressed = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers["Accept-Encoding"] = self.compression.accept_encoding
+        response = await super().handle_async_request(request)
+        try:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+
+        # Building the response from the raw bytes decodes the body once; the
+        # client then uses the decoded content as is.
+        decoded = httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=raw,
+            extensions=response.extensions,
+        )
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+        self.compression.record(encoding, len(raw), len(decoded.content))
+        logger.debug(
+            f"{self._name}: {request.method} {request.url.path} "
+            f"{encoding} {len(raw)} bytes on the wire, "
+            f"{len(decoded.content)} bytes decoded."
+        )
+        if (
+            encoding == "identity"
+            and self.compression.accept_encoding != "identity"
+            and len(raw) >= UNCOMPRESSED_WARNING_BYTES
+            and not self._warned_uncompressed
+        ):
+            self._warned_uncompressed = True
+            logger.warning(
+                f"Upstream '{self._name}' sent a {len(raw)}-byte response "
+                f"uncompressed although '{self.compression.accept_encoding}' "
+                "was accepted. A proxy may be stripping compression."
+            )
+        return decoded
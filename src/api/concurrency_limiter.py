@@ -0,0 +1,119 @@
+"""
+Provides an asyncio concurrency limiter with an adjustable limit.
+
+This module contains the `ConcurrencyLimiter`, a semaphore-like primitive used
+by the `HTTPSHelper` to bound the number of in-flight requests per upstream.
+Unlike `asyncio.Semaphore`, its limit can be changed at runtime and it reports
+how many coroutines are currently waiting for a slot, which makes queueing in
+front of a slow upstream visible.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the number of concurrent holders of a slot.
+
+    Waiters are served in FIFO order. The limiter does not bind to an event
+    loop until a coroutine actually has to wait, so a single instance can be
+    created at import time and used from the running application loop.
+
+    Attributes:
+        limit (int): The maximum number of concurrent slot holders.
+        in_flight (int): The number of slots currently held.
+        queue_depth (int): The number of coroutines waiting for a slot.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initializes the ConcurrencyLimiter.
+
+        Args:
+            limit (int): The maximum number of concurrent slot holders. Values
+                below 1 are raised to 1.
+        """
+        self._limit = max(1, int(limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """The maximum number of concurrent slot holders."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """The number of slots currently held."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of coroutines currently waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Changes the limit, waking waiters if new slots became available.
+
+        Lowering the limit never interrupts current holders; it only delays
+        new acquisitions until enough slots have been released.
+
+        Args:
+            limit (int): The new limit. Values below 1 are raised to 1.
+        """
+        self._limit = max(1, int(limit))
+        self._wake_waiters()
+
+    async def acquire(self) -> None:
+        """Waits until a slot is available and takes it."""
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation; give it back.
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Releases a slot and hands it to the next waiter, if any."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Hands free slots to waiters in FIFO order."""
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the limiter's state.
+
+        Returns:
+            Dict[str, Any]: The current limit, in-flight count and queue depth.
+        """
+        return {
+            "limit": self._limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+        }
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
@@ -0,0 +1,78 @@
+"""
+Groups request URLs into low-cardinality endpoint classes.
+
+Latency differs a lot between endpoints (fetching a page body is much slower
+than looking up a user), so latency-based decisions and metrics are kept per
+endpoint class rather than per URL. A class is the HTTP method plus the REST
+path with identifiers replaced by placeholders, for example
+`GET content/{id}/child/page` or `POST issue/{key}/transitions`.
+
+Non-REST paths, such as the page links users paste into requests, name pages
+by short code, space or title. They are collapsed to a few fixed classes so
+that every distinct link does not get a class of its own.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+_REST_PREFIX = re.compile(r"^.*?/rest/api/(?:\d+/|latest/)?")
+_NUMERIC_ID = re.compile(r"^\d+$")
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+# Non-REST page links and the class each is reported under. Anything else
+# outside the REST API falls into _OTHER_PAGE_PATH.
+_PAGE_LINK_CLASSES = (
+    (re.compile(r"(?:^|/)x/[^/]+$"), "x/{code}"),
+    (re.compile(r"(?:^|/)display/[^/]+/[^/]+$"), "display/{space}/{title}"),
+    (re.compile(r"(?:^|/)display/[^/]+$"), "display/{space}"),
+    (
+        re.compile(r"(?:^|/)spaces/[^/]+/pages/\d+(?:/[^/]*)?$"),
+        "spaces/{space}/pages/{id}",
+    ),
+    (re.compile(r"(?:^|/)pages/(\w+\.action)$"), r"pages/\1"),
+)
+_OTHER_PAGE_PATH = "{page}"
+
+
+def classify_endpoint(method: str, url: str) -> str:
+    """
+    Returns the endpoint class of a request.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The request URL. Query parameters are ignored.
+
+    Returns:
+        str: The method followed by the templated REST path, or by a fixed
+        class for paths outside the REST API.
+    """
+    path = urlsplit(url).path
+    if not _REST_PREFIX.match(path):
+        return f"{method.upper()} {_classify_page_link(path.strip('/'))}"
+    path = _REST_PREFIX.sub("", path).strip("/")
+    segments = []
+    for segment in path.split("/"):
+        if _NUMERIC_ID.match(segment):
+            segments.append("{id}")
+        elif _ISSUE_KEY.match(segment):
+            segments.append("{key}")
+        else:
+            segments.append(segment)
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+def _classify_page_link(path: str) -> str:
+    """
+    Returns the fixed class of a path outside the REST API.
+
+    Args:
+        path (str): The URL path without leading or trailing slashes.
+
+    Returns:
+        str: The templated page link, or `{page}` for unknown paths.
+    """
+    for pattern, template in _PAGE_LINK_CLASSES:
+        match = pattern.search(path)
+        if match:
+            return match.expand(template)
+    return _OTHER_PAGE_PATH
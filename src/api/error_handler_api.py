@@ -3,8 +3,10 @@ import logging
 from typing import Any, Callable, Type
 
 from src.api.https_helper import (
+    HTTPXCircuitOpenError,
     HTTPXClientError,
     HTTPXCustomError,
+    HTTPXDeadlineExceededError,
     HTTPXServerError,
 )
 from src.exceptions import ApiError
@@ -31,7 +33,11 @@ def handle_api_errors(api_error_class: Type[ApiError]) -> Callable[..., Any]:
             try:
                 # Execute the decorated API call function (e.g., get_issue)
                 return await func(*args, **kwargs)
-            except (HTTPXClientError, HTTPXServerError, HTTPXCustomError) as e:
+            except (
+                HTTPXClientError,
+                HTTPXServerError,
+                HTTPXCustomError,
+            ) as e:
                 # This is the single place where the translation logic lives.
                 func_name = func.__name__
                 # The first argument of the wrapped method is 'self',
@@ -43,10 +49,18 @@ def handle_api_errors(api_error_class: Type[ApiError]) -> Callable[..., Any]:
                 logger.error(log_message)
 
                 # Raise the specific error class (JiraApiError or ConfluenceApiError)
-                # with details from the original exception.
+                # with details from the original exception. A request rejected
+                # by an open circuit breaker never reached the upstream, so it
+                # is reported as the upstream being unavailable; one that ran
+                # out of time is reported as a gateway timeout.
+                status_code = e.status_code
+                if isinstance(e, HTTPXCircuitOpenError):
+                    status_code = 503
+                elif isinstance(e, HTTPXDeadlineExceededError):
+                    status_code = 504
                 raise api_error_class(
                     message=log_message,
-                    status_code=e.status_code,
+                    status_code=status_code,
                     details=e.details,
                 ) from e
 
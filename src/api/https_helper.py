@@ -9,9 +9,43 @@ communication with web services. Key features include:
     non-blocking HTTP calls.
 -   **Connection Pooling:** Manages a single client instance to reuse connections,
     improving efficiency.
+-   **Per-Upstream Pools:** Routes each upstream host (Jira, Confluence) to its
+    own connection pool with its own keep-alive policy and concurrency limit,
+    so that one slow upstream cannot starve requests to another.
+-   **Adaptive Concurrency:** Optionally tunes each upstream's concurrency limit
+    at runtime with an AIMD controller driven by latency and 429/503 responses.
+-   **HTTP/2 Multiplexing:** Optionally negotiates HTTP/2 so that many concurrent
+    requests share a few connections per upstream, and reports how many
+    connections and streams are in use.
+-   **Request Coalescing:** Concurrent identical GET requests share a single
+    upstream call and its decoded result.
+-   **Conditional GET Cache:** Optionally keeps ETag/Last-Modified validated
+    GET responses within a byte budget and revalidates them, so unchanged
+    resources come back as small 304 responses.
+-   **Fast JSON Decoding:** Decodes response bodies with `orjson` when it is
+    installed, and lets write calls skip decoding bodies nobody reads.
+-   **Request Hedging:** Optionally sends a second copy of a GET that is
+    slower than its endpoint's recent p95 latency, within a small budget, and
+    uses whichever response arrives first.
 -   **Automatic Retries:** Implements an exponential backoff retry strategy for
     transient network errors and 5xx server responses using the `tenacity`
     library.
+-   **Throttle Handling:** Treats 429/503 responses as throttling, honours
+    their `Retry-After` header and pauses every request to that upstream
+    through a shared token bucket.
+-   **Circuit Breaking:** Stops sending requests to an upstream whose recent
+    error rate is too high and fails fast until a probe request succeeds.
+-   **Retry Budget:** Limits retries to each upstream to a fraction of its
+    recent successful requests, so a brownout is not amplified by retries.
+-   **Deadlines:** Caps each call's timeout by the time left until the
+    request-level deadline and skips retries that could not finish in time.
+-   **Request Timing:** Records queue wait, connect, time to first byte and
+    total time of every request in histograms per endpoint class.
+-   **Compression:** Negotiates gzip/brotli/zstd per upstream and counts the
+    bytes received on the wire versus decoded.
+-   **Record/Replay:** Optionally records all upstream traffic to a cassette
+    file, or replays a cassette instead of using the network, for offline
+    profiling and benchmark runs.
 -   **Custom Exceptions:** Defines a hierarchy of custom exceptions to provide
     more specific and actionable error handling for different HTTP failure
     scenarios.
@@ -23,27 +57,82 @@ application that needs to make external HTTP requests reliably.
 """
 
 import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import (
     Any,
+    Awaitable,
+    Callable,
     Dict,
+    List,
     Optional,
+    Tuple,
     cast,
 )
+from urllib.parse import urlsplit
 
 import httpx
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
+from tenacity.retry import retry_base
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
 
+from src.api.cassette import Cassette, RecordingTransport, ReplayTransport
+from src.api.endpoint_classifier import classify_endpoint
+from src.api.request_coalescer import RequestCoalescer
+from src.api.request_hedger import RequestHedger
+from src.api.request_timing import RequestTimings, RequestTrace
+from src.api.response_cache import ResponseCache
+from src.api.upstream_pool import UpstreamPool
 from src.config import config
+from src.utils.deadline import time_remaining
 
 logger = logging.getLogger(__name__)
 
 
+def parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """
+    Parses the `Retry-After` header of a response into seconds.
+
+    The header may contain either a number of seconds or an HTTP date.
+
+    Args:
+        response (Optional[httpx.Response]): The response to inspect.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header
+        is missing or malformed.
+    """
+    headers = getattr(response, "headers", None)
+    if not isinstance(headers, httpx.Headers):
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class HTTPXCustomError(httpx.RequestError):
     """Base custom exception for errors originating from httpx_helper."""
 
@@ -71,6 +160,7 @@ class HTTPXCustomError(httpx.RequestError):
         self.original_exception = original_exception
         self.status_code = response.status_code if response else None
         self.details = response.text if response else None
+        self.retry_after = parse_retry_after(response)
 
 
 class HTTPXConnectionError(HTTPXCustomError):
@@ -86,6 +176,13 @@ class HTTPXTimeoutError(HTTPXCustomError):
     pass
 
 
+class HTTPXDeadlineExceededError(HTTPXTimeoutError):
+    """Custom exception for requests not sent, or cut short, because the
+    request-level deadline has passed. These are never retried."""
+
+    pass
+
+
 class HTTPXClientError(HTTPXCustomError):
     """Custom exception for 4xx client errors from the API."""
 
@@ -98,6 +195,124 @@ class HTTPXServerError(HTTPXCustomError):
     pass
 
 
+class HTTPXRateLimitError(HTTPXClientError):
+    """Custom exception for 429 Too Many Requests responses from the API."""
+
+    pass
+
+
+class HTTPXCircuitOpenError(HTTPXCustomError):
+    """Custom exception for requests rejected because an upstream's circuit
+    breaker is open. These are never retried."""
+
+    pass
+
+
+class wait_retry_after(wait_base):
+    """
+    A tenacity wait strategy that honours the server's `Retry-After` hint.
+
+    If the exception that triggered the retry carries a `retry_after` value
+    (parsed from a 429/503 response), that delay is used, capped at
+    `max_wait`. Otherwise the fallback strategy decides.
+    """
+
+    def __init__(self, fallback: wait_base, max_wait: float):
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        retry_after = getattr(exception, "retry_after", None)
+        if retry_after is not None:
+            return min(float(retry_after), self.max_wait)
+        return self.fallback(retry_state)
+
+
+class stop_before_deadline(stop_base):
+    """
+    A tenacity stop condition that gives up when a retry cannot finish in time.
+
+    It stops if the request-level deadline (see `src.utils.deadline`) would
+    pass before the next attempt even starts, so no time is spent sleeping for
+    an attempt that is bound to be cut short.
+    """
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        remaining = time_remaining()
+        if remaining is None:
+            return False
+        return (retry_state.upcoming_sleep or 0.0) >= remaining
+
+
+class retry_if_budget_allows(retry_base):
+    """
+    A tenacity retry condition that spends from the upstream's retry budget.
+
+    It is combined with the exception-type conditions, so it is only consulted
+    for retryable failures. It reads the helper and URL from the arguments of
+    the decorated `HTTPSHelper._make_request` call.
+    """
+
+    def __init__(self, max_attempts: int):
+        self.max_attempts = max_attempts
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        # The final attempt is never retried, so it must not spend the budget.
+        if retry_state.attempt_number >= self.max_attempts:
+            return True
+        args, kwargs = retry_state.args, retry_state.kwargs
+        helper = args[0]
+        url = args[2] if len(args) > 2 else kwargs["url"]
+        pool = helper.pool_for(url)
+        if pool.allow_retry():
+            return True
+        logger.warning(
+            f"Retry budget for upstream '{pool.name}' is spent. "
+            f"Not retrying the request to {url}."
+        )
+        return False
+
+
+def is_http2_available() -> bool:
+    """
+    Checks whether the optional `h2` package required for HTTP/2 is installed.
+
+    Returns:
+        bool: True if httpx can negotiate HTTP/2, False otherwise.
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+JsonDecoder = Callable[[bytes], Any]
+
+
+def get_json_decoder(name: str = config.JSON_DECODER) -> JsonDecoder:
+    """
+    Returns the function used to decode JSON response bodies.
+
+    Args:
+        name (str): 'orjson', 'json', or 'auto' to use `orjson` if it is
+            installed and the standard library otherwise.
+            Defaults to config.JSON_DECODER.
+
+    Returns:
+        JsonDecoder: A function that decodes UTF-8 JSON bytes.
+    """
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+
+            return cast(JsonDecoder, orjson.loads)
+        except ImportError:
+            if name == "orjson":
+                logger.warning(
+                    "JSON_DECODER is 'orjson' but the package is not installed. "
+                    "Falling back to the standard library decoder."
+                )
+    return cast(JsonDecoder, json.loads)
+
+
 class HTTPSHelper:
     """
     A helper class for making asynchronous HTTPS requests using httpx.
@@ -105,9 +320,13 @@ class HTTPSHelper:
     """
 
     _client: Optional[httpx.AsyncClient] = None
-    _semaphore: Optional[asyncio.Semaphore] = None
 
-    def __init__(self, verify_ssl: bool = True):
+    def __init__(
+        self,
+        verify_ssl: bool = True,
+        http2: bool = config.HTTP2_ENABLED,
+        upstream_urls: Optional[Dict[str, str]] = None,
+    ):
         """
         Initializes the HTTPSHelper.
 
@@ -117,10 +336,217 @@ class HTTPSHelper:
 
         Args:
             verify_ssl (bool): Whether to verify the SSL certificate. Defaults to True.
+            http2 (bool): Whether to negotiate HTTP/2 with upstreams. Falls back
+                to HTTP/1.1 if the `h2` package is not installed.
+                Defaults to config.HTTP2_ENABLED.
+            upstream_urls (Optional[Dict[str, str]]): Maps upstream names to
+                their base URLs. Each gets its own pool configured from
+                `config.UPSTREAM_POOL_SETTINGS`. Defaults to Jira and Confluence.
         """
         self._verify_ssl = verify_ssl
-        if HTTPSHelper._semaphore is None:
-            HTTPSHelper._semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_API_CALLS)
+        self._http2 = http2
+        if http2 and not is_http2_available():
+            logger.warning(
+                "HTTP/2 was requested but the 'h2' package is not installed. "
+                "Falling back to HTTP/1.1."
+            )
+            self._http2 = False
+        self._active_streams = 0
+        self._peak_active_streams = 0
+        self._json_loads = get_json_decoder()
+        self._coalescer: Optional[RequestCoalescer] = (
+            RequestCoalescer() if config.REQUEST_COALESCING_ENABLED else None
+        )
+        self._hedger: Optional[RequestHedger] = (
+            RequestHedger(
+                percentile=config.HEDGING_PERCENTILE,
+                budget_ratio=config.HEDGING_BUDGET_RATIO,
+                min_samples=config.HEDGING_MIN_SAMPLES,
+                min_delay=config.HEDGING_MIN_DELAY_SECONDS,
+            )
+            if config.HEDGING_ENABLED
+            else None
+        )
+        self._timings: Optional[RequestTimings] = (
+            RequestTimings() if config.REQUEST_TIMING_ENABLED else None
+        )
+        self._response_cache: Optional[ResponseCache] = (
+            ResponseCache(config.RESPONSE_CACHE_MAX_BYTES)
+            if config.RESPONSE_CACHE_ENABLED
+            else None
+        )
+        self._cassette_mode = config.HTTP_CASSETTE_MODE
+        self._cassette: Optional[Cassette] = None
+        if self._cassette_mode == "record":
+            self._cassette = Cassette(config.HTTP_CASSETTE_PATH)
+        elif self._cassette_mode == "replay":
+            self._cassette = Cassette.load(config.HTTP_CASSETTE_PATH)
+        elif self._cassette_mode:
+            logger.warning(
+                f"Unknown HTTP_CASSETTE_MODE '{self._cassette_mode}'. "
+                "Using live traffic."
+            )
+
+        if upstream_urls is None:
+            upstream_urls = {
+                "jira": config.JIRA_URL,
+                "confluence": config.CONFLUENCE_URL,
+            }
+        self._upstream_urls = dict(upstream_urls)
+        self._default_pool = UpstreamPool.from_settings(
+            "default",
+            config.UPSTREAM_POOL_SETTINGS["default"],
+            accept_encoding=config.UPSTREAM_ACCEPT_ENCODING["default"],
+        )
+        self._pools: Dict[str, UpstreamPool] = {}
+        for name, base_url in upstream_urls.items():
+            host = self._host_of(base_url)
+            settings = config.UPSTREAM_POOL_SETTINGS.get(
+                name, config.UPSTREAM_POOL_SETTINGS["default"]
+            )
+            accept_encoding = config.UPSTREAM_ACCEPT_ENCODING.get(
+                name, config.UPSTREAM_ACCEPT_ENCODING["default"]
+            )
+            self._pools[host] = UpstreamPool.from_settings(
+                name, settings, host=host, accept_encoding=accept_encoding
+            )
+
+        if config.ADAPTIVE_CONCURRENCY_ENABLED:
+            for pool in [*self._pools.values(), self._default_pool]:
+                pool.enable_adaptive_concurrency(
+                    min_limit=config.ADAPTIVE_CONCURRENCY_MIN,
+                    max_limit=config.ADAPTIVE_CONCURRENCY_MAX,
+                    decrease_factor=config.ADAPTIVE_CONCURRENCY_DECREASE_FACTOR,
+                    latency_tolerance=config.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE,
+                )
+        if config.CIRCUIT_BREAKER_ENABLED:
+            for pool in [*self._pools.values(), self._default_pool]:
+                pool.enable_circuit_breaker(
+                    failure_rate_threshold=config.CIRCUIT_BREAKER_FAILURE_RATE,
+                    minimum_requests=config.CIRCUIT_BREAKER_MINIMUM_REQUESTS,
+                    window_seconds=config.CIRCUIT_BREAKER_WINDOW_SECONDS,
+                    open_seconds=config.CIRCUIT_BREAKER_OPEN_SECONDS,
+                )
+        if config.RETRY_BUDGET_ENABLED:
+            for pool in [*self._pools.values(), self._default_pool]:
+                pool.enable_retry_budget(
+                    ratio=config.RETRY_BUDGET_RATIO,
+                    min_retries_per_second=config.RETRY_BUDGET_MIN_PER_SECOND,
+                    window_seconds=config.RETRY_BUDGET_WINDOW_SECONDS,
+                )
+
+    @staticmethod
+    def _host_of(url: str) -> str:
+        """Returns the lower-cased `host[:port]` part of a URL."""
+        return urlsplit(url).netloc.lower()
+
+    def pool_for(self, url: str) -> UpstreamPool:
+        """
+        Returns the upstream pool responsible for a request URL.
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            UpstreamPool: The pool for the URL's host, or the default pool if
+            the host is not a configured upstream.
+        """
+        return self._pools.get(self._host_of(url), self._default_pool)
+
+    def endpoint_class(self, method: str, url: str) -> str:
+        """
+        Returns the low-cardinality endpoint class of a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+
+        Returns:
+            str: The upstream name followed by the templated method and path,
+            e.g. 'confluence GET content/{id}'.
+        """
+        return f"{self.pool_for(url).name} {classify_endpoint(method, url)}"
+
+    @staticmethod
+    def _request_key(
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, str]],
+    ) -> Tuple[str, str, Tuple[Tuple[str, str], ...], str]:
+        """
+        Builds the key under which identical requests are coalesced or cached.
+
+        Requests only share a result if they were made with the same headers,
+        which covers the credentials they were made with (their auth scope).
+        The headers are hashed so that tokens are not kept in the key.
+        """
+        header_items = sorted((k.lower(), str(v)) for k, v in (headers or {}).items())
+        scope = hashlib.sha256(repr(header_items).encode()).hexdigest()
+        param_items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return method.upper(), url, param_items, scope
+
+    @property
+    def http2_enabled(self) -> bool:
+        """Whether clients built by this helper negotiate HTTP/2."""
+        return self._http2
+
+    def decode_json(self, response: httpx.Response) -> Any:
+        """
+        Decodes a response body with the configured JSON decoder.
+
+        Bodies declared in an encoding other than UTF-8 are decoded to text
+        first, honouring the response's charset.
+
+        Args:
+            response (httpx.Response): The response to decode.
+
+        Returns:
+            Any: The decoded JSON value.
+        """
+        encoding = response.charset_encoding
+        if encoding and encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return json.loads(response.text)
+        return self._json_loads(response.content)
+
+    def build_client(self) -> httpx.AsyncClient:
+        """
+        Creates a new httpx.AsyncClient configured for this helper.
+
+        This is the single place where client options are decided, so that the
+        client created by the FastAPI lifespan and the fallback client created
+        on first use behave identically.
+
+        Returns:
+            httpx.AsyncClient: A new, unopened asynchronous client.
+        """
+        if self._cassette_mode == "replay" and self._cassette is not None:
+            return httpx.AsyncClient(
+                verify=self._verify_ssl,
+                cookies=httpx.Cookies(),
+                transport=ReplayTransport(
+                    self._cassette, config.HTTP_CASSETTE_TIMING_SCALE
+                ),
+            )
+        mounts: Dict[str, Optional[httpx.AsyncBaseTransport]] = {
+            pattern: self._build_transport(pool)
+            for pool in self._pools.values()
+            if (pattern := pool.mount_pattern)
+        }
+        return httpx.AsyncClient(
+            verify=self._verify_ssl,
+            cookies=httpx.Cookies(),
+            http2=self._http2,
+            transport=self._build_transport(self._default_pool),
+            mounts=mounts,
+        )
+
+    def _build_transport(self, pool: UpstreamPool) -> httpx.AsyncBaseTransport:
+        """Builds a pool's transport, recording its traffic if enabled."""
+        transport = pool.build_transport(self._verify_ssl, self._http2)
+        if self._cassette_mode == "record" and self._cassette is not None:
+            return RecordingTransport(transport, self._cassette)
+        return transport
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -139,9 +565,7 @@ class HTTPSHelper:
                 "httpx.AsyncClient not set. Initializing a new client. "
                 "Consider using FastAPI lifespan for proper management."
             )
-            self._client = httpx.AsyncClient(
-                verify=self._verify_ssl, cookies=httpx.Cookies()
-            )
+            self._client = self.build_client()
         return self._client
 
     @client.setter
@@ -166,14 +590,40 @@ class HTTPSHelper:
         httpx.WriteError,
     )
 
-    RETRY_SERVER_EXCEPTIONS = (HTTPXServerError,)
+    RETRY_SERVER_EXCEPTIONS = (HTTPXServerError, HTTPXRateLimitError)
+
+    MAX_ATTEMPTS = 5
+
+    def _install_trace(self, request: httpx.Request) -> Optional[RequestTrace]:
+        """
+        Attaches a `RequestTrace` to a request if timing is enabled.
+
+        Args:
+            request (httpx.Request): The request about to be sent.
+
+        Returns:
+            Optional[RequestTrace]: The trace, or None if timing is disabled or
+            the request (e.g. a test double) has no extensions.
+        """
+        extensions = getattr(request, "extensions", None)
+        if self._timings is None or not isinstance(extensions, dict):
+            return None
+        trace = RequestTrace()
+        extensions["trace"] = trace
+        return trace
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        stop=stop_after_attempt(5),
+        wait=wait_retry_after(
+            fallback=wait_exponential(multiplier=1, min=1, max=10),
+            max_wait=config.THROTTLE_MAX_RETRY_AFTER_SECONDS,
+        ),
+        stop=stop_after_attempt(MAX_ATTEMPTS) | stop_before_deadline(),
         retry=(
-            retry_if_exception_type(RETRY_NETWORK_EXCEPTIONS)
-            | retry_if_exception_type(RETRY_SERVER_EXCEPTIONS)
+            (
+                retry_if_exception_type(RETRY_NETWORK_EXCEPTIONS)
+                | retry_if_exception_type(RETRY_SERVER_EXCEPTIONS)
+            )
+            & retry_if_budget_allows(MAX_ATTEMPTS)
         ),
         reraise=True,
     )
@@ -188,12 +638,64 @@ class HTTPSHelper:
         follow_redirects: bool = False,
     ) -> httpx.Response:
         """
-        Makes an asynchronous HTTPS request and handles common exceptions.
+        Makes an asynchronous HTTPS request, retrying transient errors.
+
+        Each attempt is made by `_send_once`. The `tenacity` decorator retries
+        network errors and 5xx responses, as long as the upstream's retry
+        budget is not spent and the request-level deadline allows it.
+
+        Args:
+            method (str): The HTTP method (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url (str): The URL for the request.
+            headers (Optional[Dict[str, str]]): Dictionary of HTTP headers.
+                Defaults to None.
+            json_data (Optional[Dict[str, Any]]):
+                JSON data to send in the request body.
+                Defaults to None.
+            params (Optional[Dict[str, str]]): Dictionary of URL parameters.
+                Defaults to None.
+            timeout (int): Request timeout in seconds.
+                Defaults to config.API_REQUEST_TIMEOUT.
+            follow_redirects (bool): Whether to automatically follow HTTP redirects.
+                Defaults to False.
+
+        Returns:
+            httpx.Response: The httpx response object on success.
+
+        Raises:
+            HTTPXCustomError: Or one of its subclasses, as raised by the last
+                attempt of `_send_once`.
+        """
+        return await self._send_once(
+            method,
+            url,
+            headers=headers,
+            json_data=json_data,
+            params=params,
+            timeout=timeout,
+            follow_redirects=follow_redirects,
+        )
+
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, str]] = None,
+        timeout: int = config.API_REQUEST_TIMEOUT,
+        follow_redirects: bool = False,
+    ) -> httpx.Response:
+        """
+        Makes a single attempt at an HTTPS request and handles common exceptions.
 
         This is the core method for all HTTP requests made by the helper. It
         builds and sends a request, handles status code validation, and wraps
         potential `httpx` exceptions in custom, more specific exception types.
-        The `tenacity` decorator provides retry logic for transient errors.
+        Before sending, the request waits for the upstream's shared token
+        bucket, which is paused whenever the upstream answers 429/503. If the
+        upstream's circuit breaker is open, the request fails immediately. If a
+        request-level deadline is set, the timeout is capped by the time left.
 
         Args:
             method (str): The HTTP method (e.g., 'GET', 'POST', 'PUT', 'DELETE').
@@ -214,18 +716,44 @@ class HTTPSHelper:
             httpx.Response: The httpx response object on success.
 
         Raises:
-            HTTPXClientError: For 4xx HTTP status codes.
-            HTTPXServerError: For 5xx HTTP status codes, which may trigger retries.
+            HTTPXCircuitOpenError: If the upstream's circuit breaker is open.
+            HTTPXDeadlineExceededError: If the request-level deadline passed
+                before the request could be sent.
+            HTTPXRateLimitError: For 429 responses.
+            HTTPXClientError: For other 4xx HTTP status codes.
+            HTTPXServerError: For 5xx HTTP status codes.
             HTTPXConnectionError: For DNS or connection-refused errors.
             HTTPXTimeoutError: For request timeouts.
             HTTPXCustomError: For other `httpx` request-related errors or unexpected
                 HTTP status codes.
         """
-        assert HTTPSHelper._semaphore is not None
-        async with HTTPSHelper._semaphore:
-            current_timeout = (
+        pool = self.pool_for(url)
+        if not pool.allow_request():
+            logger.warning(
+                f"Circuit breaker for upstream '{pool.name}' is open. "
+                f"Rejecting {method.upper()} request to {url}."
+            )
+            raise HTTPXCircuitOpenError(
+                f"Circuit breaker open for upstream '{pool.name}'; "
+                f"request to {url} was not sent"
+            )
+        started_at = time.monotonic()
+        await pool.rate_limiter.acquire()
+        async with pool.limiter:
+            current_timeout: float = (
                 timeout if timeout is not None else config.API_REQUEST_TIMEOUT
             )
+            remaining = time_remaining()
+            if remaining is not None:
+                if remaining <= 0:
+                    logger.warning(
+                        f"Deadline exceeded before {method.upper()} request to "
+                        f"{url} could be sent."
+                    )
+                    raise HTTPXDeadlineExceededError(
+                        f"Deadline exceeded; request to {url} was not sent"
+                    )
+                current_timeout = min(current_timeout, remaining)
             try:
                 request_obj = self.client.build_request(
                     method=method.upper(),
@@ -235,26 +763,69 @@ class HTTPSHelper:
                     params=params,
                     timeout=current_timeout,
                 )
+                trace = self._install_trace(request_obj)
 
-                response = await self.client.send(request_obj)
+                self._active_streams += 1
+                self._peak_active_streams = max(
+                    self._peak_active_streams, self._active_streams
+                )
+                sent_at = time.monotonic()
+                try:
+                    response = await self.client.send(request_obj)
+                finally:
+                    self._active_streams -= 1
+                finished_at = time.monotonic()
+                latency = finished_at - sent_at
+                pool.record_response(response.status_code, latency)
+                if self._timings is not None:
+                    self._timings.record_request(
+                        self.endpoint_class(method, url),
+                        started_at,
+                        sent_at,
+                        finished_at,
+                        trace,
+                    )
+                if (
+                    self._hedger is not None
+                    and method.upper() == "GET"
+                    and response.status_code < 500
+                ):
+                    # The hedge timer starts before the request is queued, so
+                    # the samples it is compared against include the wait too.
+                    self._hedger.record_latency(
+                        self.endpoint_class(method, url), finished_at - started_at
+                    )
 
                 if 400 <= response.status_code < 600:
                     response.raise_for_status()
 
                 logger.info(
                     f"Successfully executed {method.upper()} request to {url}. "
-                    f"Status: {response.status_code}"
+                    f"Status: {response.status_code} "
+                    f"(queued {sent_at - started_at:.3f}s, took {latency:.3f}s)"
                 )
                 return response
             except httpx.ConnectError as e:
                 logger.error(f"Connection Error for {method} {url}: {e}")
+                pool.record_error()
                 raise HTTPXConnectionError(
                     f"Network connection failed to {url}",
                     request=e.request,
                     original_exception=e,
                 ) from e
             except httpx.TimeoutException as e:
+                remaining = time_remaining()
+                if remaining is not None and remaining <= 0:
+                    # The timeout was capped by the deadline, so it says
+                    # nothing about the upstream's health.
+                    logger.warning(f"Deadline exceeded during {method} {url}")
+                    raise HTTPXDeadlineExceededError(
+                        f"Deadline exceeded while waiting for {url}",
+                        request=e.request,
+                        original_exception=e,
+                    ) from e
                 logger.error(f"Timeout Error for {method} {url}: {e}")
+                pool.record_timeout()
                 raise HTTPXTimeoutError(
                     f"Request timed out for {url}",
                     request=e.request,
@@ -267,7 +838,25 @@ class HTTPSHelper:
                     f"HTTP Error for {method} {url} - "
                     f"Status: {status_code}, Details: {error_details}"
                 )
-                if 400 <= status_code < 500:
+                if status_code in pool.OVERLOAD_STATUS_CODES:
+                    retry_after = parse_retry_after(e.response)
+                    pool.record_throttle(
+                        min(
+                            retry_after
+                            if retry_after is not None
+                            else config.THROTTLE_DEFAULT_BACKOFF_SECONDS,
+                            config.THROTTLE_MAX_RETRY_AFTER_SECONDS,
+                        )
+                    )
+                if status_code == 429:
+                    logger.warning(log_message)
+                    raise HTTPXRateLimitError(
+                        f"Rate limited by API ({status_code}) for {url}",
+                        request=e.request,
+                        response=e.response,
+                        original_exception=e,
+                    ) from e
+                elif 400 <= status_code < 500:
                     logger.warning(log_message)
                     raise HTTPXClientError(
                         f"Client error from API ({status_code}) for {url}",
@@ -296,6 +885,7 @@ class HTTPSHelper:
                     "A general httpx.RequestError occurred while "
                     f"requesting {e.request.url!r}: {e}"
                 )
+                pool.record_error()
                 raise HTTPXCustomError(
                     f"A general request error occurred for {url}",
                     request=e.request,
@@ -325,7 +915,10 @@ class HTTPSHelper:
 
         This method is a convenient wrapper around `_make_request` for the
         common case of making a GET request and expecting a JSON object as the
-        response.
+        response. Concurrent calls with the same URL, parameters and headers
+        are coalesced into a single upstream request. If the response cache is
+        enabled, previously seen resources are revalidated with a conditional
+        request and served from the cache on `304 Not Modified`.
 
         Args:
             url (str): The URL for the GET request.
@@ -338,10 +931,99 @@ class HTTPSHelper:
         Returns:
             Dict[str, Any]: A dictionary parsed from the JSON response body.
         """
-        response = await self._make_request(
-            "GET", url, headers=headers, params=params, timeout=timeout
+        key = self._request_key("GET", url, headers, params)
+
+        async def fetch() -> Dict[str, Any]:
+            if self._response_cache is not None:
+                return await self._cached_get(key, url, headers, params, timeout)
+            response = await self._send_get(url, headers, params, timeout)
+            return cast(Dict[str, Any], self.decode_json(response))
+
+        if self._coalescer is None:
+            return await fetch()
+        # A leader that ran out of its own deadline says nothing about the
+        # resource, so followers retry under their own deadlines.
+        return cast(
+            Dict[str, Any],
+            await self._coalescer.run(
+                key, fetch, retry_on=(HTTPXDeadlineExceededError,)
+            ),
         )
-        return cast(Dict[str, Any], response.json())
+
+    async def _send_get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, str]],
+        timeout: int,
+    ) -> httpx.Response:
+        """
+        Sends a GET request, hedging it if request hedging is enabled.
+
+        The hedge is a single attempt. Should it fail, the original request
+        (which is retried as usual) still decides the outcome.
+
+        Args:
+            url (str): The URL for the GET request.
+            headers (Optional[Dict[str, str]]): HTTP headers.
+            params (Optional[Dict[str, str]]): URL parameters.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            httpx.Response: The first successful response.
+        """
+
+        def send() -> Awaitable[httpx.Response]:
+            return self._make_request(
+                "GET", url, headers=headers, params=params, timeout=timeout
+            )
+
+        def send_hedge() -> Awaitable[httpx.Response]:
+            return self._send_once(
+                "GET", url, headers=headers, params=params, timeout=timeout
+            )
+
+        if self._hedger is None:
+            return await send()
+        return await self._hedger.run(
+            self.endpoint_class("GET", url), send, send_hedge=send_hedge
+        )
+
+    async def _cached_get(
+        self,
+        key: Tuple[str, str, Tuple[Tuple[str, str], ...], str],
+        url: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, str]],
+        timeout: int,
+    ) -> Dict[str, Any]:
+        """
+        Performs a GET through the conditional response cache.
+
+        Args:
+            key: The request key from `_request_key`.
+            url (str): The URL for the GET request.
+            headers (Optional[Dict[str, str]]): HTTP headers.
+            params (Optional[Dict[str, str]]): URL parameters.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            Dict[str, Any]: The decoded JSON body, either freshly downloaded or
+            taken from the cache after a `304 Not Modified`.
+        """
+        cache = cast(ResponseCache, self._response_cache)
+        entry = cache.get(key)
+        if entry is not None:
+            headers = {**(headers or {}), **entry.conditional_headers()}
+        response = await self._send_get(url, headers, params, timeout)
+        if entry is not None and response.status_code == 304:
+            cache.hits += 1
+            logger.debug(f"Response for {url} not modified; using cached body.")
+            return cast(Dict[str, Any], self._json_loads(entry.content))
+        cache.misses += 1
+        if isinstance(response.headers, httpx.Headers):
+            cache.store(key, response)
+        return cast(Dict[str, Any], self.decode_json(response))
 
     async def post(
         self,
@@ -351,13 +1033,15 @@ class HTTPSHelper:
         json_data: Optional[Dict[str, Any]] = None,
         timeout: int = config.API_REQUEST_TIMEOUT,
         follow_redirects: bool = False,
+        decode_response: bool = True,
     ) -> Any:
         """
         Performs an asynchronous POST request.
 
         This method handles POST requests and returns the JSON response body if
         one is provided. It correctly handles cases like a 204 No Content
-        response by returning an empty dictionary.
+        response by returning an empty dictionary. Callers that do not use
+        the response body can pass `decode_response=False` to skip decoding.
 
         Args:
             url (str): The URL for the POST request.
@@ -367,9 +1051,12 @@ class HTTPSHelper:
             timeout (int): Request timeout in seconds.
             Defaults to config.API_REQUEST_TIMEOUT.
             follow_redirects (bool): Whether to follow redirects. Defaults to False.
+            decode_response (bool): Whether to decode the response body.
+                Defaults to True.
 
         Returns:
-            Any: The parsed JSON response, or an empty dictionary for 204 responses.
+            Any: The parsed JSON response, or an empty dictionary for 204
+            responses and when `decode_response` is False.
         """
         response = await self._make_request(
             "POST",
@@ -379,9 +1066,9 @@ class HTTPSHelper:
             json_data=json_data,
             timeout=timeout,
         )
-        if response.status_code == 204:
+        if response.status_code == 204 or not decode_response:
             return {}
-        return response.json()
+        return self.decode_json(response)
 
     async def put(
         self,
@@ -391,13 +1078,15 @@ class HTTPSHelper:
         json_data: Optional[Dict[str, Any]] = None,
         timeout: int = config.API_REQUEST_TIMEOUT,
         follow_redirects: bool = False,
+        decode_response: bool = True,
     ) -> Any:
         """
         Performs an asynchronous PUT request.
 
         This method handles PUT requests and returns the JSON response body if
         one is provided. It correctly handles cases like a 204 No Content
-        response by returning an empty dictionary.
+        response by returning an empty dictionary. Callers that do not use
+        the response body can pass `decode_response=False` to skip decoding.
 
         Args:
             url (str): The URL for the PUT request.
@@ -407,9 +1096,12 @@ class HTTPSHelper:
             timeout (int): Request timeout in seconds.
             Defaults to config.API_REQUEST_TIMEOUT.
             follow_redirects (bool): Whether to follow redirects. Defaults to False.
+            decode_response (bool): Whether to decode the response body.
+                Defaults to True.
 
         Returns:
-            Any: The parsed JSON response, or an empty dictionary for 204 responses.
+            Any: The parsed JSON response, or an empty dictionary for 204
+            responses and when `decode_response` is False.
         """
         response = await self._make_request(
             "PUT",
@@ -419,9 +1111,9 @@ class HTTPSHelper:
             json_data=json_data,
             timeout=timeout,
         )
-        if response.status_code == 204:
+        if response.status_code == 204 or not decode_response:
             return {}
-        return response.json()
+        return self.decode_json(response)
 
     async def delete(
         self,
@@ -450,16 +1142,155 @@ class HTTPSHelper:
         )
         return response
 
+    async def warm_up(self, connections: int) -> Dict[str, int]:
+        """
+        Opens connections to every configured upstream ahead of real traffic.
+
+        For each upstream, up to `connections` concurrent HEAD requests are
+        sent to its base URL, so that DNS resolution and TCP/TLS handshakes
+        are done before the first sync request. The requests bypass the
+        limiter and retries; their status code does not matter.
+
+        Args:
+            connections (int): Connections to open per upstream, capped by the
+                upstream's connection limit.
+
+        Returns:
+            Dict[str, int]: Maps upstream names to the number of warm-up
+            requests that completed.
+        """
+
+        async def open_connection(url: str) -> bool:
+            try:
+                await self.client.head(url, timeout=config.API_REQUEST_TIMEOUT)
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Warm-up request to {url} failed: {e}")
+                return False
+
+        async def warm_upstream(base_url: str) -> int:
+            count = min(connections, self.pool_for(base_url).max_connections)
+            results = await asyncio.gather(
+                *(open_connection(base_url) for _ in range(count))
+            )
+            return sum(results)
+
+        names = list(self._upstream_urls)
+        opened = await asyncio.gather(
+            *(warm_upstream(self._upstream_urls[name]) for name in names)
+        )
+        warmed = dict(zip(names, opened, strict=True))
+        logger.info(f"Warmed up upstream connections: {warmed}")
+        return warmed
+
+    def _pool_connections(self) -> List[Any]:
+        """
+        Returns the httpcore connections currently held by the client's pools.
+
+        httpx does not expose its connection pools publicly, so this walks the
+        transports defensively and returns an empty list if the client (or a
+        test double standing in for it) does not have the expected shape.
+        """
+        if self._client is None:
+            return []
+        transports = [getattr(self._client, "_transport", None)]
+        transports.extend(getattr(self._client, "_mounts", {}).values())
+        connections: List[Any] = []
+        for transport in transports:
+            pool = getattr(transport, "_pool", None)
+            connections.extend(getattr(pool, "connections", []) or [])
+        return connections
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """
+        Reports how many connections and streams the client is using.
+
+        With HTTP/2 enabled, many streams share one connection, so comparing
+        `active_streams` against `connections` shows how well requests are
+        being multiplexed and helps size `MAX_CONCURRENT_API_CALLS`.
+
+        Returns:
+            Dict[str, Any]: Connection and stream counters for the client.
+        """
+        connections = self._pool_connections()
+        infos = [str(conn.info()) for conn in connections]
+        return {
+            "http2_enabled": self._http2,
+            "connections": len(connections),
+            "http2_connections": sum(1 for info in infos if "HTTP/2" in info),
+            "idle_connections": sum(1 for info in infos if "IDLE" in info),
+            "active_streams": self._active_streams,
+            "peak_active_streams": self._peak_active_streams,
+        }
+
+    def circuit_breaker_states(self) -> Dict[str, str]:
+        """
+        Reports the circuit breaker state of every upstream.
+
+        Returns:
+            Dict[str, str]: Maps upstream names to 'closed', 'open' or
+            'half_open'. Empty if circuit breaking is disabled.
+        """
+        return {
+            pool.name: pool.breaker.state
+            for pool in [*self._pools.values(), self._default_pool]
+            if pool.breaker is not None
+        }
+
+    def request_timings(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Reports the latency histograms of the endpoint classes.
+
+        Args:
+            top (Optional[int]): Only report this many endpoint classes, those
+                with the most total time. Defaults to all.
+
+        Returns:
+            Dict[str, Any]: Histogram stats per phase for each endpoint class,
+            slowest in total first. Empty if request timing is disabled.
+        """
+        if self._timings is None:
+            return {}
+        return self._timings.stats(top)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Collects a snapshot of the helper's in-process metrics.
+
+        Returns:
+            Dict[str, Any]: Metrics grouped by concern, suitable for returning
+            from a monitoring endpoint as JSON.
+        """
+        metrics: Dict[str, Any] = {
+            "connections": self.connection_stats(),
+            "upstreams": {
+                pool.name: pool.stats()
+                for pool in [*self._pools.values(), self._default_pool]
+            },
+        }
+        if self._coalescer is not None:
+            metrics["coalescing"] = self._coalescer.stats()
+        if self._response_cache is not None:
+            metrics["response_cache"] = self._response_cache.stats()
+        if self._hedger is not None:
+            metrics["hedging"] = self._hedger.stats()
+        if self._timings is not None:
+            metrics["timings"] = self._timings.stats()
+        return metrics
+
     async def close(self) -> None:
         """
         Closes the httpx.AsyncClient if it was initialized.
 
         This method should be called to gracefully shut down the client and
         release its resources and connections. It is typically called during
-        application shutdown (e.g., in a FastAPI `lifespan` event).
+        application shutdown (e.g., in a FastAPI `lifespan` event). When
+        recording, the cassette is written here.
         """
         if self._client:
             logger.info("Closing httpx.AsyncClient.")
             await self._client.aclose()
             self._client = None
             logger.info("httpx.AsyncClient closed successfully.")
+        if self._cassette_mode == "record" and self._cassette is not None:
+            self._cassette.save()
@@ -0,0 +1,138 @@
+"""
+Provides a shared token-bucket rate limiter for an upstream.
+
+The `TokenBucket` is consulted by every coroutine before it sends a request to
+an upstream. It serves two purposes:
+
+-   **Steady-state rate limiting:** If a request rate is configured, requests
+    are spaced out so that the upstream never sees more than `rate` requests
+    per second on average, with bursts of up to `burst` requests.
+-   **Process-wide throttling:** When the upstream answers with 429 or 503, the
+    bucket is paused for the `Retry-After` period. Every coroutine waits out
+    the pause instead of firing more requests into an upstream that has just
+    asked us to slow down. A configured rate is also halved and then recovers
+    gradually with each successful response.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket that can be paused by throttle responses.
+
+    Attributes:
+        rate (float): The current refill rate in requests per second, or 0 for
+            no steady-state limit.
+        burst (int): The bucket capacity, i.e. the largest allowed burst.
+        throttle_count (int): How many throttle responses have been recorded.
+        total_wait_seconds (float): Accumulated time coroutines spent waiting.
+    """
+
+    # Fraction of the configured rate restored per successful response after a
+    # throttle-induced cut, and the lowest fraction a cut may reach.
+    RECOVERY_FRACTION = 0.05
+    MIN_RATE_FRACTION = 0.1
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """
+        Initializes the TokenBucket.
+
+        Args:
+            rate (float): Requests per second, or 0 to only enforce throttle
+                pauses. Defaults to 0.
+            burst (int): The bucket capacity. Defaults to 1.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+            sleep (Callable[[float], Awaitable[Any]]): Sleep function,
+                injectable for testing.
+        """
+        self._configured_rate = max(0.0, rate)
+        self.rate = self._configured_rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self.throttle_count = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds until the current throttle pause ends, or 0."""
+        return max(0.0, self._paused_until - self._clock())
+
+    def _refill(self, now: float) -> None:
+        """Adds the tokens accrued since the last refill."""
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+
+    async def acquire(self) -> None:
+        """Waits until the bucket is not paused and a token is available."""
+        while True:
+            now = self._clock()
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            elif self.rate <= 0:
+                return
+            else:
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            self.total_wait_seconds += delay
+            await self._sleep(delay)
+
+    def throttle(self, retry_after: float) -> None:
+        """
+        Pauses the bucket after the upstream signalled overload.
+
+        Args:
+            retry_after (float): Seconds every caller should wait before the
+                next request, typically taken from the `Retry-After` header.
+        """
+        now = self._clock()
+        self.throttle_count += 1
+        self._paused_until = max(self._paused_until, now + max(0.0, retry_after))
+        if self._configured_rate > 0:
+            self._refill(now)
+            self.rate = max(
+                self._configured_rate * self.MIN_RATE_FRACTION, self.rate / 2
+            )
+            self._tokens = 0.0
+
+    def record_success(self) -> None:
+        """Gradually restores a rate that was cut by a throttle response."""
+        if self.rate < self._configured_rate:
+            self._refill(self._clock())
+            self.rate = min(
+                self._configured_rate,
+                self.rate + self._configured_rate * self.RECOVERY_FRACTION,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the bucket's state.
+
+        Returns:
+            Dict[str, Any]: The configured and current rate, remaining pause,
+            throttle count and accumulated wait time.
+        """
+        return {
+            "configured_rate_per_second": self._configured_rate,
+            "rate_per_second": self.rate,
+            "paused_for_seconds": round(self.paused_for, 3),
+            "throttle_count": self.throttle_count,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
@@ -0,0 +1,114 @@
+"""
+Provides single-flight coalescing of identical in-flight requests.
+
+During a sync run many coroutines often ask for the same resource at the same
+moment, for example the same assignee via `get_user_by_key` or the same parent
+page via `get_page_by_id`. The `RequestCoalescer` lets the first caller for a
+key (the "leader") perform the upstream call while every concurrent caller with
+the same key (a "follower") waits for and shares the leader's result, so the
+upstream sees a single request.
+
+Coalescing only applies to requests that overlap in time; nothing is cached
+once the leader's call has finished.
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, Type
+
+
+class RequestCoalescer:
+    """
+    Shares the result of one in-flight call among concurrent identical calls.
+
+    Every caller receives its own deep copy of a shared result, so callers
+    that mutate the decoded JSON cannot affect each other.
+
+    Attributes:
+        hits (int): Calls that joined an in-flight call instead of issuing one.
+        misses (int): Calls that had to issue the upstream call themselves.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the RequestCoalescer."""
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._followers: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def in_flight(self) -> int:
+        """The number of distinct calls currently in flight."""
+        return len(self._in_flight)
+
+    async def run(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        retry_on: Tuple[Type[BaseException], ...] = (),
+    ) -> Any:
+        """
+        Runs `fetch`, or joins an identical call that is already in flight.
+
+        If the leader's call raises, every follower receives the same
+        exception. If the leader is cancelled, or fails with one of the
+        `retry_on` exceptions (errors that concern the leader's caller rather
+        than the resource, such as its deadline), its followers do not fail
+        with it; one of them becomes the new leader and retries the call.
+
+        Args:
+            key (Hashable): Identifies calls that may share a result.
+            fetch (Callable[[], Awaitable[Any]]): Performs the actual call.
+            retry_on (Tuple[Type[BaseException], ...]): Leader exceptions
+                that followers retry instead of sharing. Defaults to none.
+
+        Returns:
+            Any: The result of the call.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.hits += 1
+            self._followers[key] = self._followers.get(key, 0) + 1
+            await asyncio.wait([future])
+            if future.cancelled() or isinstance(future.exception(), retry_on):
+                return await self.run(key, fetch, retry_on)
+            return copy.deepcopy(future.result())
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self._followers[key] = 0
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else awaits it.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+            followers = self._followers.pop(key)
+
+        future.set_result(result)
+        # Followers copy the stored result when they wake up; the leader must
+        # not hand out that same object, or its caller could mutate it first.
+        return copy.deepcopy(result) if followers else result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the coalescer's counters.
+
+        Returns:
+            Dict[str, Any]: Hit and miss counts, the hit ratio and the number
+            of calls currently in flight.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,236 @@
+"""
+Provides request hedging for idempotent GETs.
+
+Occasionally a single upstream node stalls on one request while others answer
+quickly. Because a sync run gathers many requests, one stalled request delays
+the whole run. With hedging, if a GET has not completed within the observed
+latency percentile (p95 by default) of its endpoint class, a second identical
+request is sent and whichever finishes first wins.
+
+Hedges are paid for from a budget that grows by a fixed fraction of every
+eligible request, so hedging can add at most that fraction of extra load even
+when the upstream is slow across the board.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latency samples of one endpoint class.
+
+    Attributes:
+        max_samples (int): The number of recent samples kept.
+    """
+
+    def __init__(self, max_samples: int = 200):
+        """
+        Initializes the LatencyTracker.
+
+        Args:
+            max_samples (int): The number of recent samples kept.
+                Defaults to 200.
+        """
+        self.max_samples = max_samples
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """
+        Adds a latency sample.
+
+        Args:
+            latency (float): The latency in seconds.
+        """
+        self._samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Returns a latency percentile over the recent samples.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            Optional[float]: The percentile in seconds, or None without samples.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+
+class RequestHedger:
+    """
+    Decides when to hedge a request and races the original against the hedge.
+
+    Attributes:
+        percentile (float): Latency percentile after which a hedge is sent.
+        budget_ratio (float): Hedges allowed per eligible request.
+        min_samples (int): Samples an endpoint class needs before hedging.
+        min_delay (float): The shortest delay before a hedge is sent.
+        hedges_sent (int): Hedge requests sent.
+        hedges_won (int): Hedge requests that finished before the original.
+        budget_exhausted (int): Hedges skipped because the budget was empty.
+    """
+
+    # Upper bound of the budget, so a long quiet period cannot build up
+    # enough credit for a burst of hedges.
+    MAX_BUDGET = 10.0
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_ratio: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_samples: int = 200,
+    ):
+        """
+        Initializes the RequestHedger.
+
+        Args:
+            percentile (float): Latency percentile after which a hedge is sent.
+                Defaults to 0.95.
+            budget_ratio (float): Hedges allowed per eligible request, i.e. the
+                maximum extra load. Defaults to 0.1.
+            min_samples (int): Samples an endpoint class needs before it is
+                hedged. Defaults to 20.
+            min_delay (float): The shortest delay before a hedge is sent.
+                Defaults to 0.05 seconds.
+            max_samples (int): Recent samples kept per endpoint class.
+                Defaults to 200.
+        """
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._max_samples = max_samples
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._budget = 0.0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.budget_exhausted = 0
+
+    def record_latency(self, endpoint: str, latency: float) -> None:
+        """
+        Records the latency of a completed request.
+
+        Args:
+            endpoint (str): The endpoint class of the request.
+            latency (float): The latency in seconds, from when the request
+                was issued until its response arrived.
+        """
+        tracker = self._trackers.get(endpoint)
+        if tracker is None:
+            tracker = self._trackers[endpoint] = LatencyTracker(self._max_samples)
+        tracker.record(latency)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """
+        Returns how long to wait before hedging a request to an endpoint class.
+
+        Args:
+            endpoint (str): The endpoint class of the request.
+
+        Returns:
+            Optional[float]: The delay in seconds, or None if the class has
+            too few samples to be hedged.
+        """
+        tracker = self._trackers.get(endpoint)
+        if tracker is None or len(tracker) < self.min_samples:
+            return None
+        delay = tracker.percentile(self.percentile)
+        return max(self.min_delay, delay) if delay is not None else None
+
+    def _try_spend(self) -> bool:
+        """Takes one hedge from the budget, if available."""
+        if self._budget >= 1.0:
+            self._budget -= 1.0
+            return True
+        self.budget_exhausted += 1
+        return False
+
+    async def run(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[T]],
+        send_hedge: Optional[Callable[[], Awaitable[T]]] = None,
+    ) -> T:
+        """
+        Runs `send`, hedging it with a second call if it is slow.
+
+        The hedge delay is measured from the call to `run`, so the latencies
+        recorded for the endpoint class must cover the same span, including
+        any time the request waited locally before it was sent.
+
+        The first call to complete successfully wins and the other is
+        cancelled. If both fail, the original call's exception is raised.
+
+        Args:
+            endpoint (str): The endpoint class of the request.
+            send (Callable[[], Awaitable[T]]): Sends the request. It must be
+                safe to call twice, i.e. the request must be idempotent.
+            send_hedge (Optional[Callable[[], Awaitable[T]]]): Sends the hedge,
+                e.g. without retries. Defaults to `send`.
+
+        Returns:
+            T: The result of the first successful call.
+        """
+        self._budget = min(self.MAX_BUDGET, self._budget + self.budget_ratio)
+        delay = self.hedge_delay(endpoint)
+        if delay is None:
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        hedge: Optional["asyncio.Future[T]"] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._try_spend():
+                return await primary
+
+            self.hedges_sent += 1
+            hedge = asyncio.ensure_future((send_hedge or send)())
+            pending: Set["asyncio.Future[T]"] = {primary, hedge}
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+            # Both calls failed; report the original one's error.
+            return primary.result()
+        finally:
+            for call in (primary, hedge):
+                if call is not None and not call.done():
+                    call.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hedger's counters and current hedge delays.
+
+        Returns:
+            Dict[str, Any]: Hedge counters, the remaining budget and the
+            hedge delay of every endpoint class with enough samples.
+        """
+        return {
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "budget_exhausted": self.budget_exhausted,
+            "budget": round(self._budget, 3),
+            "hedge_delay_seconds": {
+                endpoint: round(delay, 4)
+                for endpoint in sorted(self._trackers)
+                if (delay := self.hedge_delay(endpoint)) is not None
+            },
+        }
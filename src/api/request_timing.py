@@ -0,0 +1,256 @@
+"""
+Measures where the time of each upstream request goes.
+
+Every request made by the `HTTPSHelper` is split into phases:
+
+-   **queue_wait:** Waiting for the upstream's token bucket and concurrency
+    limit before the request may be sent.
+-   **connect:** Opening the TCP connection and TLS handshake, if the request
+    could not reuse a pooled connection.
+-   **ttfb:** From sending the request to receiving the response headers.
+-   **total:** From entering the helper to having the whole response body,
+    including the queue wait.
+
+The connect and TTFB phases come from httpcore's `trace` request extension,
+so they are only recorded for requests that actually go over the network.
+Samples are kept per endpoint class in fixed-bucket histograms, which use
+constant memory however many requests a run makes, and the report lists the
+endpoint classes by the total time spent in them, so the calls that dominate
+a run come first.
+"""
+
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+PHASES = ("queue_wait", "connect", "ttfb", "total")
+
+# Upper bounds of the histogram buckets in seconds; the last bucket is open.
+BUCKET_BOUNDS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+
+class LatencyHistogram:
+    """
+    A fixed-bucket histogram of durations.
+
+    Attributes:
+        count (int): The number of samples recorded.
+        sum (float): The sum of all samples in seconds.
+        max (float): The largest sample in seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty LatencyHistogram."""
+        self._buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds a sample.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        seconds = max(0.0, seconds)
+        self._buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimates a percentile as the upper bound of the bucket it falls in.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            Optional[float]: The estimate in seconds, capped at the largest
+            sample, or None without samples.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, bucket in zip(BUCKET_BOUNDS, self._buckets, strict=False):
+            seen += bucket
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the histogram's summary and bucket counts.
+
+        Returns:
+            Dict[str, Any]: Count, sum, mean, max and p50/p95/p99 estimates in
+            seconds, and the cumulative count per bucket upper bound.
+        """
+        cumulative: Dict[str, int] = {}
+        seen = 0
+        for bound, bucket in zip(
+            [*map(str, BUCKET_BOUNDS), "+Inf"], self._buckets, strict=True
+        ):
+            seen += bucket
+            cumulative[bound] = seen
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 4),
+            "mean_seconds": round(self.sum / self.count, 4) if self.count else 0.0,
+            "max_seconds": round(self.max, 4),
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "p99_seconds": self.percentile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class RequestTrace:
+    """
+    Collects the connect and TTFB phases of one request from httpcore events.
+
+    An instance is installed as the request's `trace` extension, which httpcore
+    awaits with the name of every step it starts, completes or fails.
+
+    Attributes:
+        connect (Optional[float]): Seconds spent connecting, or None if a
+            pooled connection was reused.
+        headers_received_at (Optional[float]): When the response headers
+            arrived, on the clock passed in.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes the RequestTrace.
+
+        Args:
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self._clock = clock
+        self._connect_started: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.headers_received_at: Optional[float] = None
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = self._clock()
+        step, _, stage = event_name.rpartition(".")
+        if step in _CONNECT_EVENTS:
+            if stage == "started":
+                self._connect_started = now
+            elif self._connect_started is not None:
+                self.connect = (self.connect or 0.0) + now - self._connect_started
+                self._connect_started = None
+        elif step.endswith("receive_response_headers") and stage == "complete":
+            self.headers_received_at = now
+
+
+class RequestTimings:
+    """Latency histograms of every phase, per endpoint class."""
+
+    def __init__(self) -> None:
+        """Initializes empty RequestTimings."""
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, endpoint: str, phase: str, seconds: float) -> None:
+        """
+        Records the duration of one phase of a request.
+
+        Args:
+            endpoint (str): The endpoint class of the request.
+            phase (str): One of `PHASES`.
+            seconds (float): The duration in seconds.
+        """
+        phases = self._histograms.get(endpoint)
+        if phases is None:
+            phases = self._histograms[endpoint] = {}
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_request(
+        self,
+        endpoint: str,
+        started: float,
+        sent: float,
+        finished: float,
+        trace: Optional[RequestTrace] = None,
+    ) -> None:
+        """
+        Records all phases of a completed request.
+
+        Args:
+            endpoint (str): The endpoint class of the request.
+            started (float): When the request entered the helper.
+            sent (float): When it left the queue and was sent.
+            finished (float): When its response body had been received.
+            trace (Optional[RequestTrace]): The httpcore trace of the request,
+                if it went over the network.
+        """
+        self.record(endpoint, "queue_wait", sent - started)
+        self.record(endpoint, "total", finished - started)
+        if trace is None:
+            return
+        if trace.connect is not None:
+            self.record(endpoint, "connect", trace.connect)
+        if trace.headers_received_at is not None:
+            self.record(endpoint, "ttfb", trace.headers_received_at - sent)
+
+    def endpoints(self) -> List[str]:
+        """
+        Returns the endpoint classes by total time spent, largest first.
+
+        Returns:
+            List[str]: The endpoint classes with at least one sample.
+        """
+        return sorted(
+            self._histograms,
+            key=lambda endpoint: (
+                self._histograms[endpoint]["total"].sum
+                if "total" in self._histograms[endpoint]
+                else 0.0
+            ),
+            reverse=True,
+        )
+
+    def stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns the histograms of every endpoint class.
+
+        Args:
+            top (Optional[int]): Only report this many endpoint classes, those
+                with the most total time. Defaults to all.
+
+        Returns:
+            Dict[str, Any]: Maps endpoint classes, ordered by total time
+            spent, to their histogram stats per phase.
+        """
+        endpoints = self.endpoints()
+        if top is not None:
+            endpoints = endpoints[:top]
+        return {
+            endpoint: {
+                phase: self._histograms[endpoint][phase].stats()
+                for phase in PHASES
+                if phase in self._histograms[endpoint]
+            }
+            for endpoint in endpoints
+        }
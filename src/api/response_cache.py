@@ -0,0 +1,162 @@
+"""
+Provides a conditional-GET response cache with a memory budget.
+
+Confluence and Jira return `ETag` and/or `Last-Modified` validators for many
+resources. The `ResponseCache` keeps the raw body of such responses so that a
+later GET for the same resource can be sent as a conditional request
+(`If-None-Match` / `If-Modified-Since`). If the resource has not changed the
+upstream answers `304 Not Modified` with an empty body, and the cached body is
+used instead of downloading the full (often multi-hundred-KB) payload again.
+
+Entries are evicted in least-recently-used order once the total size of the
+cached bodies exceeds the configured byte budget.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import httpx
+
+
+class CachedResponse:
+    """
+    A cached response body together with its validators.
+
+    Attributes:
+        content (bytes): The raw response body.
+        etag (Optional[str]): The `ETag` header of the response, if any.
+        last_modified (Optional[str]): The `Last-Modified` header, if any.
+    """
+
+    __slots__ = ("content", "etag", "last_modified")
+
+    def __init__(
+        self,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Returns the headers that revalidate this entry with the upstream.
+
+        Returns:
+            Dict[str, str]: `If-None-Match` and/or `If-Modified-Since`.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    An LRU cache of validated response bodies, bounded by total byte size.
+
+    Attributes:
+        max_bytes (int): The budget for the summed size of cached bodies.
+        hits (int): Revalidations answered with `304 Not Modified`.
+        misses (int): Lookups that had to download a full body.
+        evictions (int): Entries dropped to stay within the byte budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initializes the ResponseCache.
+
+        Args:
+            max_bytes (int): The maximum summed size of cached bodies in bytes.
+        """
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def size(self) -> int:
+        """The summed size of all cached bodies in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Returns the entry for a key and marks it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[CachedResponse]: The entry, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: Hashable, response: httpx.Response) -> bool:
+        """
+        Caches a response if it carries a validator and fits the budget.
+
+        Args:
+            key (Hashable): The cache key.
+            response (httpx.Response): A successful response.
+
+        Returns:
+            bool: True if the response was cached.
+        """
+        headers = response.headers
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        content = response.content
+        if not (etag or last_modified) or len(content) > self.max_bytes:
+            self.discard(key)
+            return False
+
+        self.discard(key)
+        self._entries[key] = CachedResponse(content, etag, last_modified)
+        self._size += len(content)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.content)
+            self.evictions += 1
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Removes the entry for a key, if present.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache's counters and occupancy.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counts, the hit ratio, evictions, the
+            number of entries and their total size against the budget.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
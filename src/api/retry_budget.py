@@ -0,0 +1,110 @@
+"""
+Provides a retry budget that keeps retries from amplifying an outage.
+
+Every request to an upstream may be attempted several times. While an upstream
+is healthy that is harmless, but during a brownout every concurrent request
+fails and retries at once, multiplying the load on an upstream that is already
+struggling. The `RetryBudget` caps the number of retries within a sliding time
+window to a fraction of the successful requests in the same window, plus a
+small fixed allowance so that a quiet service can still retry the occasional
+failure. Once the budget is spent, failed requests are not retried until
+enough successes (or time) have replenished it.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+
+class RetryBudget:
+    """
+    A sliding-window retry budget for one upstream.
+
+    Attributes:
+        ratio (float): Retries allowed per successful request in the window.
+        min_retries_per_second (float): Retries allowed regardless of traffic.
+        window_seconds (float): Length of the sliding window.
+        retries_allowed (int): Retries the budget has permitted.
+        retries_rejected (int): Retries refused because the budget was spent.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the RetryBudget.
+
+        Args:
+            ratio (float): Retries allowed per successful request in the
+                window, e.g. 0.2 for one retry per five successes.
+                Defaults to 0.2.
+            min_retries_per_second (float): Retries allowed on top of the
+                ratio, averaged over the window. Defaults to 1.
+            window_seconds (float): Length of the sliding window in seconds.
+                Defaults to 10.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self.ratio = max(0.0, ratio)
+        self.min_retries_per_second = max(0.0, min_retries_per_second)
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._successes: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.retries_allowed = 0
+        self.retries_rejected = 0
+
+    def _expire(self, now: float) -> None:
+        """Drops successes and retries that have left the sliding window."""
+        horizon = now - self.window_seconds
+        for events in (self._successes, self._retries):
+            while events and events[0] <= horizon:
+                events.popleft()
+
+    @property
+    def limit(self) -> float:
+        """The number of retries the current window allows."""
+        self._expire(self._clock())
+        floor = self.min_retries_per_second * self.window_seconds
+        return floor + self.ratio * len(self._successes)
+
+    def record_success(self) -> None:
+        """Records a successful request, which adds to the budget."""
+        now = self._clock()
+        self._successes.append(now)
+        self._expire(now)
+
+    def try_spend(self) -> bool:
+        """
+        Takes one retry from the budget, if available.
+
+        Returns:
+            bool: True if the retry may be made, False if the budget is spent.
+        """
+        if len(self._retries) < self.limit:
+            self._retries.append(self._clock())
+            self.retries_allowed += 1
+            return True
+        self.retries_rejected += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the budget's counters and usage over the current window.
+
+        Returns:
+            Dict[str, Any]: Successes and retries in the window, the current
+            retry limit, and the allowed/rejected counters.
+        """
+        limit = self.limit
+        return {
+            "window_successes": len(self._successes),
+            "window_retries": len(self._retries),
+            "retry_limit": round(limit, 3),
+            "retries_allowed": self.retries_allowed,
+            "retries_rejected": self.retries_rejected,
+        }
@@ -23,20 +23,53 @@ import asyncio
 import logging
 import re
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from bs4 import BeautifulSoup, Tag
 
 from src.api.error_handler_api import handle_api_errors
 from src.api.https_helper import HTTPSHelper
+from src.api.user_resolver import UserResolver
 from src.config import config
 from src.exceptions import ConfluenceApiError
-from src.models.data_models import ConfluenceTask
+from src.models.data_models import ConfluenceTask, HierarchyFilter
 from src.utils.context_extractor import get_task_context
 
 logger = logging.getLogger(__name__)
 
 
+def parse_page_id(url: str) -> Optional[str]:
+    """
+    Extracts the page ID from a long-form Confluence URL without any request.
+
+    Args:
+        url (str): The Confluence page URL.
+
+    Returns:
+        Optional[str]: The page ID from a `pageId` query parameter or a
+                       `/pages/<id>` path, or None for other URLs such as
+                       short links.
+    """
+    page_id_query_match = re.search(r"pageId=(\d+)", url)
+    if page_id_query_match:
+        return page_id_query_match.group(1)
+
+    long_url_path_match = re.search(r"/pages/(\d+)", url)
+    if long_url_path_match:
+        return long_url_path_match.group(1)
+    return None
+
+
 class SafeConfluenceAPI:
     """
     A resilient, low-level service for all Confluence operations.
@@ -52,14 +85,25 @@ class SafeConfluenceAPI:
                                    REST API calls.
         jira_macro_server_name (str): The name of the Jira server for macros.
         jira_macro_server_id (str): The ID of the Jira server for macros.
+        descendant_strategy (str): How page trees are discovered: 'auto',
+            'descendant', 'cql' or 'bfs'.
+        children_page_size (int): The page size of child listings.
+        children_concurrency (int): How many pages of a child listing are
+            requested in parallel.
     """
 
+    # Bulk discovery strategies tried, in order, by the 'auto' strategy.
+    BULK_DESCENDANT_STRATEGIES = ("descendant", "cql")
+
     def __init__(
         self,
         base_url: str,
         https_helper: HTTPSHelper,
         jira_macro_server_name: str = config.JIRA_MACRO_SERVER_NAME,
         jira_macro_server_id: str = config.JIRA_MACRO_SERVER_ID,
+        descendant_strategy: str = config.CONFLUENCE_DESCENDANT_STRATEGY,
+        children_page_size: int = config.CONFLUENCE_CHILDREN_PAGE_SIZE,
+        children_concurrency: int = config.CONFLUENCE_CHILDREN_CONCURRENCY,
     ):
         """
         Initializes the SafeConfluenceAPI.
@@ -72,6 +116,15 @@ class SafeConfluenceAPI:
                                           Defaults to a value from config.
             jira_macro_server_id (str): The ID of the Jira server for macros.
                                         Defaults to a value from config.
+            descendant_strategy (str): How page trees are discovered.
+                                       Defaults to a value from config.
+            children_page_size (int): The number of children requested per
+                                      page of a child listing. Defaults to a
+                                      value from config.
+            children_concurrency (int): The number of child listing pages
+                                        requested in parallel; 1 pages
+                                        serially. Defaults to a value from
+                                        config.
         """
         self.base_url = config.CONFLUENCE_URL.rstrip("/")
         self.CONFLUENCE_API_PATH = "/rest/api"
@@ -83,6 +136,15 @@ class SafeConfluenceAPI:
         }
         self.jira_macro_server_name = jira_macro_server_name
         self.jira_macro_server_id = jira_macro_server_id
+        self.descendant_strategy = descendant_strategy
+        self.children_page_size = children_page_size
+        self.children_concurrency = children_concurrency
+        self.user_resolver = UserResolver(
+            self.get_user_by_key,
+            ttl_seconds=config.CONFLUENCE_USER_CACHE_TTL_SECONDS,
+            max_entries=config.CONFLUENCE_USER_CACHE_MAX_ENTRIES,
+            concurrency=config.CONFLUENCE_USER_LOOKUP_CONCURRENCY,
+        )
 
     @handle_api_errors(ConfluenceApiError)
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
@@ -102,13 +164,9 @@ class SafeConfluenceAPI:
             Optional[str]: The extracted page ID, or None if it cannot be
                            resolved or found.
         """
-        page_id_query_match = re.search(r"pageId=(\d+)", url)
-        if page_id_query_match:
-            return page_id_query_match.group(1)
-
-        long_url_path_match = re.search(r"/pages/(\d+)", url)
-        if long_url_path_match:
-            return long_url_path_match.group(1)
+        page_id = parse_page_id(url)
+        if page_id:
+            return page_id
 
         logger.info(f"Attempting to resolve short URL: {url}")
 
@@ -136,13 +194,9 @@ class SafeConfluenceAPI:
             )
             return None
 
-        resolved_page_id_query_match = re.search(r"pageId=(\d+)", final_url)
-        if resolved_page_id_query_match:
-            return resolved_page_id_query_match.group(1)
-
-        resolved_long_url_path_match = re.search(r"/pages/(\d+)", final_url)
-        if resolved_long_url_path_match:
-            return resolved_long_url_path_match.group(1)
+        resolved_page_id = parse_page_id(final_url)
+        if resolved_page_id:
+            return resolved_page_id
 
         logger.error(
             f"Could not extract page ID from the final resolved URL: {final_url}"
@@ -186,76 +240,84 @@ class SafeConfluenceAPI:
 
     @handle_api_errors(ConfluenceApiError)
     async def get_children_by_type(
-        self, page_id: str, page_type: str = "page"
+        self, page_id: str, page_type: str = "page", expand: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieves child items of a specific type for a given page asynchronously.
 
         This method handles pagination automatically, fetching all child items
         (e.g., pages or attachments) of a specified type that belong to a
-        parent page.
+        parent page. After the first page, the remaining pages are requested
+        `children_concurrency` at a time; the children keep their order.
 
         Args:
             page_id (str): The ID of the parent page.
             page_type (str): The type of child to retrieve (e.g., 'page',
                              'comment', 'attachment'). Defaults to 'page'.
+            expand (Optional[str]): A comma-separated list of properties to
+                                    expand on each child. Defaults to None.
 
         Returns:
             List[Dict[str, Any]]: A list of child item objects. Returns an empty
                                   list if no children are found or an error occurs.
         """
-        all_results: List[Dict[str, Any]] = []
-        start = 0
-        limit = 50
 
-        while True:
+        async def fetch(start: int, limit: int) -> Dict[str, Any]:
             url = (
                 f"{self.base_url}{self.CONFLUENCE_API_PATH}/content/{page_id}/child/{page_type}"
                 f"?start={start}&limit={limit}"
             )
-            response_data = await self.https_helper.get(url, headers=self.headers)
-
-            current_results = response_data.get("results", [])
-            all_results.extend(current_results)
-
-            if not current_results or len(current_results) < limit:
-                break
-
-            start += len(current_results)
+            if expand:
+                url += f"&expand={expand}"
+            return await self.https_helper.get(url, headers=self.headers)
 
-        return all_results
+        return await self._paginate(
+            fetch, self.children_page_size, self.children_concurrency
+        )
 
     @handle_api_errors(ConfluenceApiError)
-    async def update_page(self, page_id: str, title: str, body: str) -> bool:
+    async def update_page(
+        self,
+        page_id: str,
+        title: str,
+        body: str,
+        current_version: Optional[int] = None,
+    ) -> bool:
         """
         Updates the content and title of a Confluence page asynchronously.
 
-        This method fetches the current version of the page to ensure the
-        update is not based on stale data, increments the version number,
-        and then sends the new title and body content.
+        Unless the caller already knows the page's current version, this
+        method fetches it to ensure the update is not based on stale data. It
+        then increments the version number and sends the new title and body
+        content. If the page has been changed since `current_version`,
+        Confluence rejects the update with a 409 conflict.
 
         Args:
             page_id (str): The ID of the page to update.
             title (str): The new title for the page.
             body (str): The new body content in Confluence storage format (HTML).
+            current_version (Optional[int]): The version the new content is
+                based on. Defaults to None, which fetches the current version.
 
         Returns:
             bool: True if the page was updated successfully, False otherwise.
         """
         url = f"{self.base_url}{self.CONFLUENCE_API_PATH}/content/{page_id}"
-        current_page = await self.get_page_by_id(page_id, expand="version")
-        if not current_page:
-            logger.error(f"Could not retrieve page '{page_id}' for update.")
-            return False
-
-        try:
-            new_version = current_page["version"]["number"] + 1
-        except KeyError:
-            logger.error(
-                f"Could not determine next version for page '{page_id}'. "
-                f"'version' key missing."
-            )
-            return False
+        if current_version is None:
+            current_page = await self.get_page_by_id(page_id, expand="version")
+            if not current_page:
+                logger.error(f"Could not retrieve page '{page_id}' for update.")
+                return False
+
+            try:
+                current_version = current_page["version"]["number"]
+            except KeyError:
+                logger.error(
+                    f"Could not determine next version for page '{page_id}'. "
+                    f"'version' key missing."
+                )
+                return False
+        new_version = current_version + 1
 
         payload = {
             "version": {"number": new_version},
@@ -264,10 +326,12 @@ class SafeConfluenceAPI:
             "body": {"storage": {"value": body, "representation": "storage"}},
         }
 
+        # The response echoes the whole page body, which is never used here.
         await self.https_helper.put(
             url,
             headers=self.headers,
             json_data=payload,
+            decode_response=False,
         )
 
         # If we reach here, the update was successful
@@ -313,6 +377,47 @@ class SafeConfluenceAPI:
             return response
         return None
 
+    @handle_api_errors(ConfluenceApiError)
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Creates or updates a content property of a page asynchronously.
+
+        Content properties are versioned separately from the page, so this
+        does not create a new page version.
+
+        Args:
+            page_id (str): The ID of the page.
+            key (str): The key of the property.
+            value (Dict[str, Any]): The JSON value to store.
+            current_version (Optional[int]): The version of the existing
+                                             property, or None to create it.
+                                             Defaults to None.
+
+        Returns:
+            bool: True if the property was stored.
+        """
+        url = f"{self.base_url}{self.CONFLUENCE_API_PATH}/content/{page_id}/property"
+        payload: Dict[str, Any] = {"key": key, "value": value}
+        if current_version is None:
+            await self.https_helper.post(
+                url, headers=self.headers, json_data=payload, decode_response=False
+            )
+        else:
+            payload["version"] = {"number": current_version + 1}
+            await self.https_helper.put(
+                f"{url}/{key}",
+                headers=self.headers,
+                json_data=payload,
+                decode_response=False,
+            )
+        return True
+
     @handle_api_errors(ConfluenceApiError)
     async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """
@@ -349,12 +454,7 @@ class SafeConfluenceAPI:
 
     async def get_all_descendants(self, page_id: str) -> List[str]:
         """
-        Recursively finds all descendant page IDs using concurrent API calls.
-
-        This method builds a complete, flat list of all child pages, their
-        children, and so on, down the entire hierarchy from the starting page ID.
-        It uses `_fetch_descendants_concurrently` to perform the fetch operations
-        in parallel for greater efficiency.
+        Finds all descendant page IDs of a page.
 
         Args:
             page_id (str): The ID of the starting parent page.
@@ -362,65 +462,405 @@ class SafeConfluenceAPI:
         Returns:
             List[str]: A flat list of all descendant page IDs.
         """
-        all_ids = set()
-        descendant_pages_data = await self._fetch_descendants_concurrently(page_id)
-        for page_data in descendant_pages_data:
-            all_ids.add(page_data["id"])
-        return list(all_ids)
+        pages = await self.get_all_descendant_pages(page_id)
+        return [page["id"] for page in pages]
 
-    async def _fetch_descendants_concurrently(
-        self, page_id: str
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Recursively fetches all descendant pages of a given page concurrently.
+        Finds all descendant pages of a page, with properties expanded.
+
+        Collects the pages yielded by `iter_descendant_pages`.
+
+        Args:
+            page_id (str): The ID of the starting parent page.
+            expand (Optional[str]): A comma-separated list of properties to
+                                    expand on each page (e.g.
+                                    'body.storage,version'). Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: The descendant page objects, each page once.
+        """
+        return [page async for page in self.iter_descendant_pages(page_id, expand)]
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the descendant pages of a page as they are discovered.
+
+        Unless the strategy is 'bfs', the whole tree is first listed in bulk,
+        through the descendant endpoint and then through a CQL ancestor
+        search, with the result pages fetched in parallel. This takes a
+        handful of requests instead of one per page. If the bulk strategies
+        fail (e.g. because the Confluence version lacks the endpoint), the
+        tree is walked breadth-first with `_iter_descendants_concurrently`.
+        A strategy that fails part way is continued by the next one, and
+        pages already yielded are not yielded again. Whatever the strategy,
+        `expand` is applied to the listings, so e.g. page bodies arrive with
+        discovery rather than one request per page.
+
+        A `hierarchy_filter` is applied while the tree is discovered, so
+        excluded subtrees are not listed at all. Excluded page IDs and
+        required labels are added to the CQL search, which is then the only
+        bulk strategy tried; a depth limit, excluded labels and title
+        patterns can only be honoured by walking the tree level by level,
+        so they skip the bulk strategies.
+
+        Args:
+            page_id (str): The ID of the starting parent page.
+            expand (Optional[str]): A comma-separated list of properties to
+                                    expand on each page (e.g.
+                                    'body.storage,version'). Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Limits the pages
+                                    discovered. Defaults to all descendants.
+
+        Yields:
+            Dict[str, Any]: Each descendant page object, once.
+        """
+        hierarchy_filter = hierarchy_filter or HierarchyFilter()
+        if hierarchy_filter.needs_labels and "metadata.labels" not in (expand or ""):
+            expand = f"{expand},metadata.labels" if expand else "metadata.labels"
+
+        listers = {
+            "descendant": self._iter_descendants_by_endpoint,
+            "cql": self._iter_descendants_by_cql,
+        }
+        if self.descendant_strategy == "auto":
+            strategies = list(self.BULK_DESCENDANT_STRATEGIES)
+        elif self.descendant_strategy in listers:
+            strategies = [self.descendant_strategy]
+        else:
+            strategies = []
+        if hierarchy_filter.needs_walk:
+            strategies = []
+        elif hierarchy_filter.exclude_page_ids or hierarchy_filter.include_labels:
+            strategies = [strategy for strategy in strategies if strategy == "cql"]
+
+        seen: Set[str] = set()
+
+        def accept(page: Dict[str, Any]) -> bool:
+            if page["id"] in seen:
+                return False
+            seen.add(page["id"])
+            return hierarchy_filter.includes(page) and not hierarchy_filter.excludes(
+                page
+            )
+
+        for strategy in strategies:
+            try:
+                async for batch in listers[strategy](page_id, expand, hierarchy_filter):
+                    for page in batch:
+                        if accept(page):
+                            yield page
+            except ConfluenceApiError as e:
+                logger.warning(
+                    f"Could not list descendants of page {page_id} with the "
+                    f"'{strategy}' strategy: {e}"
+                )
+                continue
+            logger.info(
+                f"Found {len(seen)} descendants of page {page_id} "
+                f"with the '{strategy}' strategy."
+            )
+            return
+
+        async for batch in self._iter_descendants_concurrently(
+            page_id, expand, hierarchy_filter
+        ):
+            for page in batch:
+                if accept(page):
+                    yield page
+
+    def _iter_descendants_by_endpoint(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Lists all descendant pages through the `descendant/page` endpoint.
+
+        The endpoint takes no filter, so `hierarchy_filter` is ignored here
+        and applied by the caller.
+
+        Args:
+            page_id (str): The ID of the root page.
+            expand (Optional[str]): Properties to expand on each page.
+                                    Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Unused.
+
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: The result pages of the
+                                                 listing, in order.
+        """
+        url = (
+            f"{self.base_url}{self.CONFLUENCE_API_PATH}"
+            f"/content/{page_id}/descendant/page"
+        )
+        return self._iter_all_results(url, {"expand": expand} if expand else {})
+
+    def _iter_descendants_by_cql(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Lists all descendant pages through a CQL `ancestor` search.
+
+        Excluded page IDs leave out the pages and everything below them, and
+        required labels leave out the pages without them, within the search.
+
+        Args:
+            page_id (str): The ID of the root page.
+            expand (Optional[str]): Properties to expand on each page.
+                                    Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Page IDs and labels
+                                    to push down into the search. Defaults to
+                                    None.
+
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: The result pages of the
+                                                 search, in order.
+        """
+        url = f"{self.base_url}{self.CONFLUENCE_API_PATH}/content/search"
+        cql = f"ancestor = {page_id} and type = page"
+        if hierarchy_filter and hierarchy_filter.exclude_page_ids:
+            page_ids = ", ".join(hierarchy_filter.exclude_page_ids)
+            cql += f" and id not in ({page_ids}) and ancestor not in ({page_ids})"
+        if hierarchy_filter and hierarchy_filter.include_labels:
+            labels = ", ".join(
+                '"' + label.replace('"', '\\"') + '"'
+                for label in hierarchy_filter.include_labels
+            )
+            cql += f" and label in ({labels})"
+        params = {"cql": cql}
+        if expand:
+            params["expand"] = expand
+        return self._iter_all_results(url, params)
+
+    def _iter_all_results(
+        self,
+        url: str,
+        params: Dict[str, str],
+        page_size: int = config.CONFLUENCE_DESCENDANT_PAGE_SIZE,
+        concurrency: int = config.CONFLUENCE_DESCENDANT_CONCURRENCY,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields the result pages of a paginated listing, several at a time.
+
+        Paging works as described in `_iter_paginated`.
+
+        Args:
+            url (str): The listing URL.
+            params (Dict[str, str]): Query parameters other than `start` and
+                                     `limit`.
+            page_size (int): The number of results requested per page.
+                             Defaults to a value from config.
+            concurrency (int): The number of pages requested in parallel.
+                               Defaults to a value from config.
+
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: The results of each page, in
+                                                 listing order.
+        """
+
+        async def fetch(start: int, limit: int) -> Dict[str, Any]:
+            return await self._get_results_page(
+                url, {**params, "start": str(start), "limit": str(limit)}
+            )
+
+        return self._iter_paginated(fetch, page_size, concurrency)
+
+    @handle_api_errors(ConfluenceApiError)
+    async def _get_results_page(
+        self, url: str, params: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Fetches one page of a paginated listing.
+
+        Args:
+            url (str): The listing URL.
+            params (Dict[str, str]): The query parameters, including `start`
+                                     and `limit`.
+
+        Returns:
+            Dict[str, Any]: The response, with the page's `results`.
+        """
+        return await self.https_helper.get(url, headers=self.headers, params=params)
+
+    @classmethod
+    async def _paginate(
+        cls,
+        fetch: Callable[[int, int], Awaitable[Dict[str, Any]]],
+        page_size: int,
+        concurrency: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Collects all results of a paginated listing.
+
+        Args:
+            fetch (Callable[[int, int], Awaitable[Dict[str, Any]]]): Fetches
+                the page at a start offset with a limit.
+            page_size (int): The number of results requested per page.
+            concurrency (int): The number of pages requested in parallel.
+
+        Returns:
+            List[Dict[str, Any]]: All results, in listing order.
+        """
+        return [
+            result
+            async for batch in cls._iter_paginated(fetch, page_size, concurrency)
+            for result in batch
+        ]
+
+    @staticmethod
+    async def _iter_paginated(
+        fetch: Callable[[int, int], Awaitable[Dict[str, Any]]],
+        page_size: int,
+        concurrency: int,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields the result pages of a paginated listing, several at a time.
+
+        The first page tells how many results the server returns per page
+        (it may cap the requested limit), whether there are more
+        (`_links.next`) and, if it reports `totalSize`, how many there are.
+        The remaining pages are then requested `concurrency` at a time, until
+        the total is reached or a page comes back short or without a next
+        link.
+
+        Args:
+            fetch (Callable[[int, int], Awaitable[Dict[str, Any]]]): Fetches
+                the page at a start offset with a limit.
+            page_size (int): The number of results requested per page.
+            concurrency (int): The number of pages requested in parallel.
+
+        Yields:
+            List[Dict[str, Any]]: The results of each non-empty page, in
+                                  listing order.
+        """
+
+        def is_last(page: Dict[str, Any], limit: int) -> bool:
+            links = page.get("_links")
+            page_results = page.get("results", [])
+            return len(page_results) < limit or (
+                isinstance(links, dict) and "next" not in links
+            )
+
+        first_page = await fetch(0, page_size)
+        results: List[Dict[str, Any]] = list(first_page.get("results", []))
+        if not results:
+            return
+        yield results
+        limit = min(page_size, first_page.get("limit") or page_size)
+        total = first_page.get("totalSize")
+        if is_last(first_page, limit):
+            return
+
+        start = len(results)
+        while total is None or start < total:
+            offsets = [start + i * limit for i in range(max(1, concurrency))]
+            if total is not None:
+                offsets = [offset for offset in offsets if offset < total]
+            pages = await asyncio.gather(*(fetch(offset, limit) for offset in offsets))
+            for page in pages:
+                if page_results := page.get("results", []):
+                    yield page_results
+                if is_last(page, limit):
+                    return
+            start = offsets[-1] + limit
+
+    async def _iter_descendants_concurrently(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walks the page tree breadth-first, yielding children as they are found.
 
         This is an internal helper method that performs a breadth-first traversal
         of the page tree. It fetches all direct children for a level of the
         hierarchy in parallel, significantly speeding up the discovery of all
-        descendants compared to a sequential approach.
+        descendants compared to a sequential approach. Each child listing is
+        yielded as soon as it arrives, while the walk continues.
+
+        Children excluded by `hierarchy_filter` are dropped before their own
+        children are listed, and pages at its `max_depth` are not listed, so
+        pruned subtrees cost no requests.
 
         Args:
             page_id (str): The ID of the root page for the traversal.
-
-        Returns:
-            List[Dict[str, Any]]: A list of page objects representing all
-                                  descendants.
+            expand (Optional[str]): Properties to expand on each page.
+                                    Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Prunes the walk.
+                                    Defaults to None.
+
+        Yields:
+            List[Dict[str, Any]]: The children of one page. A page with
+                                  several parents may be listed more than
+                                  once.
         """
-        all_pages = []
+        hierarchy_filter = hierarchy_filter or HierarchyFilter()
+        max_depth = hierarchy_filter.max_depth
+        if max_depth == 0:
+            return
+
         processed_page_ids = set()
-        queue: asyncio.Queue[str] = asyncio.Queue()
-        await queue.put(page_id)
+        queue: asyncio.Queue[Tuple[str, int]] = asyncio.Queue()
+        found: asyncio.Queue[Optional[List[Dict[str, Any]]]] = asyncio.Queue()
+        await queue.put((page_id, 0))
 
         async def worker() -> None:
             while True:
-                p_id = await queue.get()
+                p_id, depth = await queue.get()
                 if p_id in processed_page_ids:
                     queue.task_done()
                     continue
 
                 processed_page_ids.add(p_id)
                 try:
-                    children = await self.get_children_by_type(p_id)
-                    for child in children:
-                        all_pages.append(child)
-                        await queue.put(child["id"])
+                    children = [
+                        child
+                        for child in await self.get_children_by_type(
+                            p_id, expand=expand
+                        )
+                        if not hierarchy_filter.excludes(child)
+                    ]
+                    if children:
+                        found.put_nowait(children)
+                    if max_depth is None or depth + 1 < max_depth:
+                        for child in children:
+                            await queue.put((child["id"], depth + 1))
                 except Exception as e:
                     logger.error(f"Error fetching children for page {p_id}: {e}")
                 finally:
                     queue.task_done()
 
+        async def finish() -> None:
+            # Every listing is in `found` before the last page is done.
+            await queue.join()
+            found.put_nowait(None)
+
         # Create a pool of workers to process pages from the queue concurrently
         tasks = [
             asyncio.create_task(worker()) for _ in range(10)
         ]  # 10 concurrent workers
+        tasks.append(asyncio.create_task(finish()))
 
-        await queue.join()  # Wait for the queue to be fully processed
-
-        for task in tasks:
-            task.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        return all_pages
+        try:
+            while (children := await found.get()) is not None:
+                yield children
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def get_tasks_from_page(
         self, page_details: Dict[str, Any]
@@ -431,7 +871,9 @@ class SafeConfluenceAPI:
         This method parses the 'storage' format of the page body to find all
         task list items (`<ac:task>`). It specifically ignores tasks that are
         nested inside other tasks or located within certain macros (defined in
-        the application config) used for aggregation.
+        the application config) used for aggregation. The assignees of all
+        tasks are resolved together, so each distinct user is looked up at
+        most once.
 
         Args:
             page_details (Dict[str, Any]): The dictionary containing the full
@@ -449,6 +891,7 @@ class SafeConfluenceAPI:
 
         soup = BeautifulSoup(html_content, "html.parser")
 
+        task_elements = []
         for task_element in soup.find_all("ac:task"):
             if task_element.find_parent(
                 "ac:structured-macro",
@@ -458,13 +901,38 @@ class SafeConfluenceAPI:
             parent_task_list = task_element.find_parent("ac:task-list")
             if parent_task_list and parent_task_list.find_parent("ac:task-body"):
                 continue
-            parsed_task = await self._parse_single_task(task_element, page_details)
+            task_elements.append(task_element)
+
+        user_keys = [
+            user_key
+            for task_element in task_elements
+            if (user_key := self._assignee_key(task_element))
+        ]
+        usernames = await self.user_resolver.resolve_many(user_keys)
+
+        for task_element in task_elements:
+            parsed_task = await self._parse_single_task(
+                task_element, page_details, usernames
+            )
             if parsed_task:
                 tasks.append(parsed_task)
         return tasks
 
+    @staticmethod
+    def _assignee_key(task_element: Any) -> Optional[str]:
+        """Returns the user key of a task's first user mention, if any."""
+        user_mention = task_element.find("ri:user")
+        if isinstance(user_mention, Tag):
+            user_key = user_mention.get("ri:userkey")
+            if isinstance(user_key, str) and user_key:
+                return user_key
+        return None
+
     async def _parse_single_task(
-        self, task_element: Any, page_details: Dict[str, Any]
+        self,
+        task_element: Any,
+        page_details: Dict[str, Any],
+        usernames: Optional[Dict[str, Optional[str]]] = None,
     ) -> Optional[ConfluenceTask]:
         """
         Parses a single <ac:task> element into a ConfluenceTask object asynchronously.
@@ -478,6 +946,9 @@ class SafeConfluenceAPI:
             task_element (Any): The BeautifulSoup tag for an `<ac:task>`.
             page_details (Dict[str, Any]): The details of the parent page, used
                                            for context.
+            usernames (Optional[Dict[str, Optional[str]]]): Usernames already
+                resolved by user key. Keys missing here are resolved through
+                the user resolver. Defaults to None.
 
         Returns:
             Optional[ConfluenceTask]: A populated `ConfluenceTask` data model, or
@@ -495,11 +966,11 @@ class SafeConfluenceAPI:
             return None
 
         assignee_name: Optional[str] = None
-        if user_mention := task_element.find("ri:user"):
-            if user_key := user_mention.get("ri:userkey"):
-                user_details = await self.get_user_by_key(user_key)
-                if user_details:
-                    assignee_name = user_details.get("username")
+        if user_key := self._assignee_key(task_element):
+            if usernames is not None and user_key in usernames:
+                assignee_name = usernames[user_key]
+            else:
+                assignee_name = await self.user_resolver.resolve(user_key)
 
         due_date_tag = task_element.find("time")
         due_date: Optional[str] = None
@@ -536,28 +1007,96 @@ class SafeConfluenceAPI:
 
     @handle_api_errors(ConfluenceApiError)
     async def add_jira_links_to_page(
-        self, page_id: str, mappings: List[Dict[str, str]]
+        self,
+        page_id: str,
+        mappings: List[Dict[str, str]],
+        page: Optional[Dict[str, Any]] = None,
+        max_conflict_retries: int = config.CONFLUENCE_UPDATE_CONFLICT_RETRIES,
     ) -> bool:
         """
         Updates a Confluence page by replacing completed tasks with Jira links.
         This method scans the page for tasks that have been completed and
         replaces them with links to their corresponding Jira issues.
+
+        The update is optimistic: it is based on the body and version of
+        `page` if given, and written without fetching the page again. If the
+        page was changed in the meantime, Confluence answers 409; the page is
+        then fetched, the links are applied to the new body and the update
+        is retried.
         Args:
             page_id (str): The ID of the Confluence page to update.
             mappings (List[Dict[str, str]]): A list of dictionaries, each mapping
                                              a 'confluence_task_id' to its new
                                              'jira_key'.
+            page (Optional[Dict[str, Any]]): The page with 'body.storage' and
+                                             'version' expanded, if the caller
+                                             already holds it. Defaults to None.
+            max_conflict_retries (int): How often to retry after a version
+                                        conflict. Defaults to a value from
+                                        config.
         Returns:
             bool: True if the page was successfully updated, False otherwise.
         """
-        page = await self.get_page_by_id(page_id, expand="body.storage,version")
-        if not page:
-            logger.error(
-                f"Could not retrieve page {page_id} to update with Jira links."
+        for attempt in range(max_conflict_retries + 1):
+            if not self._has_body_and_version(page):
+                page = await self.get_page_by_id(page_id, expand="body.storage,version")
+            if not page:
+                logger.error(
+                    f"Could not retrieve page {page_id} to update with Jira links."
+                )
+                return False
+
+            new_body = self._replace_tasks_with_jira_links(
+                page["body"]["storage"]["value"], mappings
             )
-            return False
+            if new_body is None:
+                logger.warning(
+                    f"No tasks were replaced on page {page_id}. Skipping update."
+                )
+                return False  # Indicate no update was performed
+
+            try:
+                return await self.update_page(
+                    page_id,
+                    page["title"],
+                    new_body,
+                    current_version=page["version"]["number"],
+                )
+            except ConfluenceApiError as e:
+                if e.status_code != 409 or attempt == max_conflict_retries:
+                    raise
+                logger.warning(
+                    f"Page {page_id} changed since version "
+                    f"{page['version']['number']}; re-applying Jira links."
+                )
+                page = None
+        return False
+
+    @staticmethod
+    def _has_body_and_version(page: Optional[Dict[str, Any]]) -> bool:
+        """Checks whether a page object carries its body and version."""
+        return bool(
+            page
+            and "value" in page.get("body", {}).get("storage", {})
+            and "number" in page.get("version", {})
+            and "title" in page
+        )
 
-        soup = BeautifulSoup(page["body"]["storage"]["value"], "html.parser")
+    def _replace_tasks_with_jira_links(
+        self, html: str, mappings: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """
+        Replaces the mapped tasks in a page body with Jira macros.
+
+        Args:
+            html (str): The page body in storage format.
+            mappings (List[Dict[str, str]]): Maps 'confluence_task_id' to
+                                             'jira_key'.
+
+        Returns:
+            Optional[str]: The new body, or None if no task was replaced.
+        """
+        soup = BeautifulSoup(html, "html.parser")
         modified = False
         mapping_dict = {m["confluence_task_id"]: m["jira_key"] for m in mappings}
 
@@ -609,16 +1148,12 @@ class SafeConfluenceAPI:
                     f"Jira macro for '{jira_key}'."
                 )
 
-        if modified:
-            for tl in soup.find_all("ac:task-list"):
-                if not tl.find("ac:task"):  # type: ignore[union-attr]
-                    tl.decompose()
-            return await self.update_page(page_id, page["title"], str(soup))
-        else:
-            logger.warning(
-                f"No tasks were replaced on page {page_id}. Skipping update."
-            )
-            return False  # Indicate no update was performed
+        if not modified:
+            return None
+        for tl in soup.find_all("ac:task-list"):
+            if not tl.find("ac:task"):  # type: ignore[union-attr]
+                tl.decompose()
+        return str(soup)
 
     def _create_macro_html(self, jira_key: str) -> str:
         """
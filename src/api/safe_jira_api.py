@@ -224,9 +224,8 @@ class SafeJiraAPI:
                                    (e.g., "Start Progress").
 
         Returns:
-            Dict[str, Any]: An empty dictionary on success (for a 204 No Content
-                            response), or a dictionary with response data if
-                            the server provides one.
+            Dict[str, Any]: An empty dictionary on success. Any response body
+                            is not decoded.
 
         Raises:
             ValueError: If a transition with the given name cannot be found for
@@ -244,10 +243,10 @@ class SafeJiraAPI:
         url = f"{self.base_url}{self.JIRA_API_PATH}/issue/{issue_key}/transitions"
         payload = {"transition": {"id": transition_id}}
 
-        response = await self.https_helper.post(
-            url, headers=self.headers, json_data=payload
+        # Jira answers a transition with 204 No Content; nothing to decode.
+        return await self.https_helper.post(
+            url, headers=self.headers, json_data=payload, decode_response=False
         )
-        return response
 
     @handle_api_errors(JiraApiError)
     async def get_current_user(self) -> Dict[str, Any]:
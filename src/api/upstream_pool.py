@@ -0,0 +1,331 @@
+"""
+Defines the per-upstream connection pool and concurrency budget.
+
+Each upstream host that the `HTTPSHelper` talks to (Jira, Confluence, or any
+other host) is represented by an `UpstreamPool`. The pool owns the settings
+for its httpx transport (connection limits and keep-alive expiry) and a
+`ConcurrencyLimiter` that caps how many requests to that host may be in flight
+at once. Keeping these separate per host means that a slow Confluence node
+queues only Confluence calls, while Jira calls continue unhindered.
+
+The pool also owns a shared `TokenBucket` that every request to the upstream
+passes through, and it is the place where the outcome of every request is
+recorded, so that per-upstream controllers (the token bucket, the optional
+`AIMDController`, `CircuitBreaker` and `RetryBudget`) can react to it.
+Its transport negotiates the upstream's configured response compression and
+counts the bytes saved.
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.api.adaptive_concurrency import AIMDController
+from src.api.circuit_breaker import CircuitBreaker
+from src.api.compression import (
+    CompressionStats,
+    CompressionTransport,
+    resolve_accept_encoding,
+)
+from src.api.concurrency_limiter import ConcurrencyLimiter
+from src.api.rate_limiter import TokenBucket
+from src.api.retry_budget import RetryBudget
+
+
+class UpstreamPool:
+    """
+    Connection pool settings and concurrency budget for a single upstream.
+
+    Attributes:
+        name (str): A short, low-cardinality name for the upstream
+            (e.g., 'jira', 'confluence', 'default').
+        host (Optional[str]): The `host[:port]` this pool serves, or None for
+            the catch-all default pool.
+        max_connections (int): The maximum number of open connections.
+        max_keepalive_connections (int): The maximum number of idle
+            connections kept open.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        limiter (ConcurrencyLimiter): Caps the number of in-flight requests.
+        rate_limiter (TokenBucket): Spaces out requests and pauses all of them
+            while the upstream is throttling us.
+        controller (Optional[AIMDController]): Adjusts the limiter's limit at
+            runtime, if adaptive concurrency is enabled.
+        breaker (Optional[CircuitBreaker]): Rejects requests while the
+            upstream is failing, if the circuit breaker is enabled.
+        retry_budget (Optional[RetryBudget]): Caps retries to a fraction of
+            recent successful requests, if the retry budget is enabled.
+        compression (CompressionStats): The negotiated `Accept-Encoding` and
+            the wire versus decoded byte counts of responses.
+    """
+
+    # Status codes with which an upstream signals that it is overloaded.
+    OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_connections: int,
+        keepalive_expiry: float,
+        host: Optional[str] = None,
+        rate_limit_per_second: float = 0.0,
+        rate_limit_burst: int = 10,
+        accept_encoding: str = "auto",
+        max_keepalive_connections: Optional[int] = None,
+    ):
+        """
+        Initializes the UpstreamPool.
+
+        Args:
+            name (str): A short name for the upstream, used in logs and metrics.
+            max_concurrent (int): The maximum number of in-flight requests.
+            max_connections (int): The maximum number of open connections.
+            keepalive_expiry (float): Seconds an idle connection is kept open.
+            host (Optional[str]): The `host[:port]` this pool serves. Defaults
+                to None for the catch-all pool.
+            rate_limit_per_second (float): Steady-state request rate, or 0 for
+                no limit beyond throttle pauses. Defaults to 0.
+            rate_limit_burst (int): The largest burst allowed by the rate
+                limit. Defaults to 10.
+            accept_encoding (str): Response compression to negotiate: 'auto',
+                'identity' or a list of codings. Defaults to 'auto'.
+            max_keepalive_connections (Optional[int]): The maximum number of
+                idle connections kept open. Defaults to `max_connections`.
+        """
+        self.name = name
+        self.host = host
+        self.max_connections = max(1, int(max_connections))
+        if max_keepalive_connections is None:
+            max_keepalive_connections = self.max_connections
+        self.max_keepalive_connections = min(
+            self.max_connections, max(0, int(max_keepalive_connections))
+        )
+        self.keepalive_expiry = keepalive_expiry
+        self.limiter = ConcurrencyLimiter(max_concurrent)
+        self.rate_limiter = TokenBucket(rate_limit_per_second, rate_limit_burst)
+        self.controller: Optional[AIMDController] = None
+        self.breaker: Optional[CircuitBreaker] = None
+        self.retry_budget: Optional[RetryBudget] = None
+        self.compression = CompressionStats(resolve_accept_encoding(accept_encoding))
+
+    @classmethod
+    def from_settings(
+        cls,
+        name: str,
+        settings: Dict[str, float],
+        host: Optional[str] = None,
+        accept_encoding: str = "auto",
+    ) -> "UpstreamPool":
+        """
+        Creates a pool from a settings entry of `config.UPSTREAM_POOL_SETTINGS`.
+
+        Args:
+            name (str): The upstream name.
+            settings (Dict[str, float]): The pool settings for the upstream.
+            host (Optional[str]): The `host[:port]` this pool serves.
+            accept_encoding (str): Response compression to negotiate.
+                Defaults to 'auto'.
+
+        Returns:
+            UpstreamPool: The configured pool.
+        """
+        return cls(
+            name=name,
+            max_concurrent=int(settings["max_concurrent"]),
+            max_connections=int(settings["max_connections"]),
+            keepalive_expiry=float(settings["keepalive_expiry"]),
+            host=host,
+            rate_limit_per_second=float(settings.get("rate_limit_per_second", 0)),
+            rate_limit_burst=int(settings.get("rate_limit_burst", 10)),
+            accept_encoding=accept_encoding,
+            max_keepalive_connections=int(
+                settings.get("max_keepalive_connections", settings["max_connections"])
+            ),
+        )
+
+    def enable_adaptive_concurrency(
+        self,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        """
+        Lets an AIMD controller adjust this pool's concurrency limit.
+
+        Args:
+            min_limit (int): The lowest limit the controller may set.
+            max_limit (int): The highest limit the controller may set.
+            decrease_factor (float): Multiplier applied on overload.
+                Defaults to 0.5.
+            latency_tolerance (float): Ratio of recent to baseline latency
+                treated as overload. Defaults to 2.0.
+        """
+        self.controller = AIMDController(
+            self.limiter,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            decrease_factor=decrease_factor,
+            latency_tolerance=latency_tolerance,
+        )
+
+    def enable_circuit_breaker(
+        self,
+        failure_rate_threshold: float,
+        minimum_requests: int,
+        window_seconds: float,
+        open_seconds: float,
+    ) -> None:
+        """
+        Guards this upstream with a circuit breaker.
+
+        Args:
+            failure_rate_threshold (float): Failure ratio that opens the circuit.
+            minimum_requests (int): Requests needed in the window before the
+                circuit may open.
+            window_seconds (float): Length of the sliding window in seconds.
+            open_seconds (float): Seconds the circuit stays open before probing.
+        """
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=failure_rate_threshold,
+            minimum_requests=minimum_requests,
+            window_seconds=window_seconds,
+            open_seconds=open_seconds,
+        )
+
+    def enable_retry_budget(
+        self, ratio: float, min_retries_per_second: float, window_seconds: float
+    ) -> None:
+        """
+        Limits retries to this upstream with a retry budget.
+
+        Args:
+            ratio (float): Retries allowed per successful request in the window.
+            min_retries_per_second (float): Retries allowed regardless of
+                traffic, averaged over the window.
+            window_seconds (float): Length of the sliding window in seconds.
+        """
+        self.retry_budget = RetryBudget(
+            ratio=ratio,
+            min_retries_per_second=min_retries_per_second,
+            window_seconds=window_seconds,
+        )
+
+    def allow_retry(self) -> bool:
+        """
+        Takes a retry from the retry budget.
+
+        Returns:
+            bool: False if the budget is spent, True otherwise.
+        """
+        return self.retry_budget is None or self.retry_budget.try_spend()
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether the circuit breaker lets a request through.
+
+        Returns:
+            bool: False if the circuit is open, True otherwise.
+        """
+        return self.breaker is None or self.breaker.allow_request()
+
+    def record_response(self, status_code: int, latency: float) -> None:
+        """
+        Records the outcome of a request that received a response.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            latency (float): Seconds from sending the request to receiving
+                the response.
+        """
+        if status_code < 400:
+            self.rate_limiter.record_success()
+            if self.retry_budget is not None:
+                self.retry_budget.record_success()
+        if self.breaker is not None:
+            # 4xx responses (including 429) come from a working upstream.
+            if status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        if self.controller is None:
+            return
+        if status_code in self.OVERLOAD_STATUS_CODES:
+            self.controller.record_overload()
+        elif status_code < 500:
+            self.controller.record_success(latency)
+
+    def record_throttle(self, retry_after: float) -> None:
+        """
+        Pauses every request to this upstream after a 429/503 response.
+
+        Args:
+            retry_after (float): Seconds to wait before the next request.
+        """
+        self.rate_limiter.throttle(retry_after)
+
+    def record_timeout(self) -> None:
+        """Records a request that timed out, which is treated as overload."""
+        if self.controller is not None:
+            self.controller.record_overload()
+        self.record_error()
+
+    def record_error(self) -> None:
+        """Records a request that failed without a response from the upstream."""
+        if self.breaker is not None:
+            self.breaker.record_failure()
+
+    @property
+    def mount_pattern(self) -> Optional[str]:
+        """The httpx mount pattern routing this host to its own transport."""
+        return f"all://{self.host}" if self.host else None
+
+    def build_transport(self, verify: bool, http2: bool) -> httpx.AsyncHTTPTransport:
+        """
+        Creates the httpx transport (and thus connection pool) for this upstream.
+
+        Args:
+            verify (bool): Whether to verify SSL certificates.
+            http2 (bool): Whether to negotiate HTTP/2.
+
+        Returns:
+            httpx.AsyncHTTPTransport: A transport with this pool's limits that
+            negotiates and measures response compression.
+        """
+        return CompressionTransport(
+            name=self.name,
+            compression=self.compression,
+            verify=verify,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool's configuration and queueing state.
+
+        Returns:
+            Dict[str, Any]: Pool settings plus the limiter's limit, in-flight
+            count and queue depth, and the AIMD controller's, circuit
+            breaker's and retry budget's state if enabled.
+        """
+        stats: Dict[str, Any] = {
+            "host": self.host,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            **self.limiter.stats(),
+            "rate_limit": self.rate_limiter.stats(),
+            "compression": self.compression.stats(),
+        }
+        if self.controller is not None:
+            stats["adaptive_concurrency"] = self.controller.stats()
+        if self.breaker is not None:
+            stats["circuit_breaker"] = self.breaker.stats()
+        if self.retry_budget is not None:
+            stats["retry_budget"] = self.retry_budget.stats()
+        return stats
@@ -0,0 +1,175 @@
+"""
+Resolves Confluence user keys to usernames, with a TTL cache.
+
+Task assignees are stored in the page body as `<ri:user ri:userkey="...">`
+mentions, and the key has to be looked up to learn the username that Jira
+expects. Pages typically mention the same few people over and over, so the
+`UserResolver` collects the keys of a whole page, looks each distinct key up
+only once, and remembers the answer for later pages and later requests.
+
+-   **De-duplication:** A key that is already being looked up (for example
+    by a page parsed concurrently) is awaited rather than requested again.
+-   **Concurrency:** Distinct keys are looked up concurrently, bounded by a
+    semaphore. Confluence Server/Data Center has no bulk endpoint for users
+    by key, so this is the cheapest way to resolve many keys at once.
+-   **Expiry:** Answers, including "no such user", are kept for a fixed time
+    and the oldest are dropped once the cache is full.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+UserLookup = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class UserResolver:
+    """
+    Maps user keys to usernames, caching the answers for a while.
+
+    Attributes:
+        ttl_seconds (float): How long an answer is kept.
+        max_entries (int): The most answers kept at once.
+        hits (int): Keys answered from the cache or an in-flight lookup.
+        misses (int): Keys that had to be looked up.
+    """
+
+    def __init__(
+        self,
+        lookup: UserLookup,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 10000,
+        concurrency: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the UserResolver.
+
+        Args:
+            lookup (UserLookup): Fetches a user's details by key, returning
+                None if the user does not exist.
+            ttl_seconds (float): How long an answer is kept. Defaults to an
+                hour.
+            max_entries (int): The most answers kept at once. Defaults to
+                10000.
+            concurrency (int): The most lookups in flight at once. Defaults
+                to 8.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self._lookup = lookup
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(0, max_entries)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._in_flight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, user_key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns the cached username of a key, if it has not expired.
+
+        Args:
+            user_key (str): The user key.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the key is cached, and its
+            username (None for a user that was not found).
+        """
+        entry = self._entries.get(user_key)
+        if entry is None:
+            return False, None
+        username, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[user_key]
+            return False, None
+        return True, username
+
+    async def resolve(self, user_key: str) -> Optional[str]:
+        """
+        Resolves a single user key.
+
+        Args:
+            user_key (str): The user key.
+
+        Returns:
+            Optional[str]: The username, or None if the user has none.
+        """
+        return (await self.resolve_many([user_key]))[user_key]
+
+    async def resolve_many(self, user_keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolves user keys, looking each distinct unknown key up once.
+
+        Args:
+            user_keys (Iterable[str]): The user keys, possibly repeated.
+
+        Returns:
+            Dict[str, Optional[str]]: Maps every distinct key to its username,
+            or to None if the user does not exist or has no username.
+
+        Raises:
+            Exception: Whatever the lookup raised; failed lookups are not
+                cached.
+        """
+        usernames: Dict[str, Optional[str]] = {}
+        pending: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        for user_key in dict.fromkeys(user_keys):
+            found, username = self.cached(user_key)
+            if found:
+                self.hits += 1
+                usernames[user_key] = username
+            elif user_key in self._in_flight:
+                self.hits += 1
+                pending[user_key] = self._in_flight[user_key]
+            else:
+                self.misses += 1
+                future = asyncio.ensure_future(self._fetch(user_key))
+                self._in_flight[user_key] = pending[user_key] = future
+
+        if pending:
+            results = await asyncio.gather(*pending.values(), return_exceptions=True)
+            for user_key, result in zip(pending, results, strict=True):
+                if isinstance(result, BaseException):
+                    raise result
+                usernames[user_key] = result
+        return usernames
+
+    async def _fetch(self, user_key: str) -> Optional[str]:
+        """Looks a key up and caches the answer."""
+        try:
+            async with self._semaphore:
+                details = await self._lookup(user_key)
+            username = details.get("username") if details else None
+            self._store(user_key, username)
+            return username
+        finally:
+            self._in_flight.pop(user_key, None)
+
+    def _store(self, user_key: str, username: Optional[str]) -> None:
+        """Caches an answer, dropping the oldest ones beyond the limit."""
+        if self.max_entries == 0:
+            return
+        self._entries.pop(user_key, None)
+        self._entries[user_key] = (username, self._clock() + self.ttl_seconds)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the resolver's counters.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counts, the hit ratio and the number of
+            cached keys.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._entries),
+        }
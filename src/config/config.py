@@ -80,6 +80,254 @@ JIRA_TARGET_STATUSES: Dict[str, str] = {
 FUZZY_MATCH_THRESHOLD: float = float(os.getenv("FUZZY_MATCH_THRESHOLD", 0.7))
 MAX_CONCURRENT_API_CALLS: int = int(os.getenv("MAX_CONCURRENT_API_CALLS", 50))
 API_REQUEST_TIMEOUT: int = int(os.getenv("API_REQUEST_TIMEOUT", 60))
+# Upper bound in seconds on the duration of a whole /sync_task, /sync_project or
+# /undo_sync_task request (0 = no deadline). Requests may set a shorter one.
+# Per-call timeouts are capped by the time left and retries that cannot finish
+# in time are skipped.
+REQUEST_DEADLINE_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", 0))
+
+# --- HTTP Client Configuration ---
+# HTTP/2 multiplexes many concurrent requests over a few connections per
+# upstream. Requires the optional `h2` package (`pip install httpx[http2]`).
+HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# Record/replay of upstream traffic for offline profiling and benchmarks:
+# "record" writes every request/response pair to HTTP_CASSETTE_PATH on
+# shutdown, "replay" answers all requests from that file instead of the
+# network, sleeping for the recorded latency times HTTP_CASSETTE_TIMING_SCALE
+# (0 = no delay). Empty = normal operation.
+HTTP_CASSETTE_MODE: str = os.getenv("HTTP_CASSETTE_MODE", "").lower()
+HTTP_CASSETTE_PATH: str = os.getenv("HTTP_CASSETTE_PATH", "cassette.jsonl.gz")
+HTTP_CASSETTE_TIMING_SCALE: float = float(os.getenv("HTTP_CASSETTE_TIMING_SCALE", 1.0))
+
+# Optional connection pre-warming: at startup, WARMUP_CONNECTIONS connections
+# are opened to each upstream and per-service caches (current user, issue
+# types) are primed. /ready reports 503 until this finishes or
+# WARMUP_TIMEOUT_SECONDS pass. Raise the *_KEEPALIVE_EXPIRY settings so warmed
+# connections survive until the first request.
+WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+WARMUP_CONNECTIONS: int = int(os.getenv("WARMUP_CONNECTIONS", 4))
+WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", 30.0))
+
+# Response compression negotiated with each upstream: "auto" accepts every
+# coding that can be decoded here (br and zstd need `pip install
+# .[compression]`), "identity" disables compression, or list codings
+# explicitly, e.g. "zstd, gzip".
+UPSTREAM_ACCEPT_ENCODING: Dict[str, str] = {
+    "jira": os.getenv("JIRA_ACCEPT_ENCODING", "auto"),
+    "confluence": os.getenv("CONFLUENCE_ACCEPT_ENCODING", "auto"),
+    "default": "auto",
+}
+
+# Jira and Confluence each get their own connection pool, keep-alive policy,
+# concurrency limit and request rate limit (0 = unlimited), so a slow upstream
+# cannot starve calls to the other one. Other hosts share the "default" entry.
+# Up to max_keepalive_connections idle connections (default: max_connections)
+# are kept open for keepalive_expiry seconds.
+UPSTREAM_POOL_SETTINGS: Dict[str, Dict[str, float]] = {
+    "jira": {
+        "max_concurrent": int(
+            os.getenv("JIRA_MAX_CONCURRENT_API_CALLS", MAX_CONCURRENT_API_CALLS)
+        ),
+        "max_connections": int(
+            os.getenv("JIRA_MAX_CONNECTIONS", MAX_CONCURRENT_API_CALLS)
+        ),
+        "max_keepalive_connections": int(
+            os.getenv(
+                "JIRA_MAX_KEEPALIVE_CONNECTIONS",
+                os.getenv("JIRA_MAX_CONNECTIONS", MAX_CONCURRENT_API_CALLS),
+            )
+        ),
+        "keepalive_expiry": float(os.getenv("JIRA_KEEPALIVE_EXPIRY", 5.0)),
+        "rate_limit_per_second": float(os.getenv("JIRA_RATE_LIMIT_PER_SECOND", 0)),
+        "rate_limit_burst": int(os.getenv("JIRA_RATE_LIMIT_BURST", 10)),
+    },
+    "confluence": {
+        "max_concurrent": int(
+            os.getenv("CONFLUENCE_MAX_CONCURRENT_API_CALLS", MAX_CONCURRENT_API_CALLS)
+        ),
+        "max_connections": int(
+            os.getenv("CONFLUENCE_MAX_CONNECTIONS", MAX_CONCURRENT_API_CALLS)
+        ),
+        "max_keepalive_connections": int(
+            os.getenv(
+                "CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS",
+                os.getenv("CONFLUENCE_MAX_CONNECTIONS", MAX_CONCURRENT_API_CALLS),
+            )
+        ),
+        "keepalive_expiry": float(os.getenv("CONFLUENCE_KEEPALIVE_EXPIRY", 5.0)),
+        "rate_limit_per_second": float(
+            os.getenv("CONFLUENCE_RATE_LIMIT_PER_SECOND", 0)
+        ),
+        "rate_limit_burst": int(os.getenv("CONFLUENCE_RATE_LIMIT_BURST", 10)),
+    },
+    "default": {
+        "max_concurrent": MAX_CONCURRENT_API_CALLS,
+        "max_connections": MAX_CONCURRENT_API_CALLS,
+        "keepalive_expiry": 5.0,
+        "rate_limit_per_second": 0,
+        "rate_limit_burst": 10,
+    },
+}
+
+# 429/503 responses are treated as throttling: the upstream's shared token
+# bucket is paused for the Retry-After period (or the default backoff if the
+# header is missing) and the request is retried after that delay.
+THROTTLE_DEFAULT_BACKOFF_SECONDS: float = float(
+    os.getenv("THROTTLE_DEFAULT_BACKOFF_SECONDS", 1.0)
+)
+THROTTLE_MAX_RETRY_AFTER_SECONDS: float = float(
+    os.getenv("THROTTLE_MAX_RETRY_AFTER_SECONDS", 60.0)
+)
+
+# Concurrent identical GET requests (same URL, params and credentials) share a
+# single upstream call instead of each issuing their own.
+REQUEST_COALESCING_ENABLED: bool = (
+    os.getenv("REQUEST_COALESCING_ENABLED", "true").lower() == "true"
+)
+
+# JSON decoder for response bodies: "auto" uses orjson if it is installed
+# (`pip install .[fast-json]`), "orjson" or "json" force a choice.
+JSON_DECODER: str = os.getenv("JSON_DECODER", "auto").lower()
+
+# Optional request hedging for GETs: if a GET is slower than the recent
+# HEDGING_PERCENTILE latency of its endpoint class, a second identical request
+# is sent and the first response wins. HEDGING_BUDGET_RATIO caps the extra
+# load (0.1 = at most one hedge per ten GETs).
+HEDGING_ENABLED: bool = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+HEDGING_PERCENTILE: float = float(os.getenv("HEDGING_PERCENTILE", 0.95))
+HEDGING_BUDGET_RATIO: float = float(os.getenv("HEDGING_BUDGET_RATIO", 0.1))
+HEDGING_MIN_SAMPLES: int = int(os.getenv("HEDGING_MIN_SAMPLES", 20))
+HEDGING_MIN_DELAY_SECONDS: float = float(os.getenv("HEDGING_MIN_DELAY_SECONDS", 0.05))
+
+# How page trees are discovered: 'descendant' lists all descendants through
+# content/{id}/descendant/page, 'cql' through an `ancestor = {id}` search, and
+# 'bfs' walks the tree one child listing per page. 'auto' tries them in that
+# order; the bulk strategies always fall back to 'bfs' if they fail. Bulk
+# results are fetched in pages of CONFLUENCE_DESCENDANT_PAGE_SIZE, up to
+# CONFLUENCE_DESCENDANT_CONCURRENCY pages at a time.
+CONFLUENCE_DESCENDANT_STRATEGY: str = os.getenv(
+    "CONFLUENCE_DESCENDANT_STRATEGY", "auto"
+).lower()
+CONFLUENCE_DESCENDANT_PAGE_SIZE: int = int(
+    os.getenv("CONFLUENCE_DESCENDANT_PAGE_SIZE", 200)
+)
+CONFLUENCE_DESCENDANT_CONCURRENCY: int = int(
+    os.getenv("CONFLUENCE_DESCENDANT_CONCURRENCY", 8)
+)
+
+# Child listings are requested CONFLUENCE_CHILDREN_PAGE_SIZE children at a
+# time; after the first page, CONFLUENCE_CHILDREN_CONCURRENCY pages are
+# requested in parallel (1 pages serially).
+CONFLUENCE_CHILDREN_PAGE_SIZE: int = int(os.getenv("CONFLUENCE_CHILDREN_PAGE_SIZE", 50))
+CONFLUENCE_CHILDREN_CONCURRENCY: int = int(
+    os.getenv("CONFLUENCE_CHILDREN_CONCURRENCY", 8)
+)
+
+# Usernames of task assignees, looked up by user key, are cached for
+# CONFLUENCE_USER_CACHE_TTL_SECONDS across requests. At most
+# CONFLUENCE_USER_LOOKUP_CONCURRENCY lookups run at once.
+CONFLUENCE_USER_CACHE_TTL_SECONDS: float = float(
+    os.getenv("CONFLUENCE_USER_CACHE_TTL_SECONDS", 3600)
+)
+CONFLUENCE_USER_CACHE_MAX_ENTRIES: int = int(
+    os.getenv("CONFLUENCE_USER_CACHE_MAX_ENTRIES", 10000)
+)
+CONFLUENCE_USER_LOOKUP_CONCURRENCY: int = int(
+    os.getenv("CONFLUENCE_USER_LOOKUP_CONCURRENCY", 8)
+)
+
+# How often a page update is retried after a 409 version conflict, i.e. when
+# the page was changed between reading it and writing it back.
+CONFLUENCE_UPDATE_CONFLICT_RETRIES: int = int(
+    os.getenv("CONFLUENCE_UPDATE_CONFLICT_RETRIES", 3)
+)
+
+# Pages synchronized by /sync_task get a content property named
+# CONFLUENCE_SYNC_WATERMARK_KEY with the version that was synchronized. Pages
+# still at that version are neither fetched nor parsed by later runs.
+# Off by default: each page that did change costs a property write on top of
+# its body fetch, which only pays off when most pages are left unedited.
+CONFLUENCE_SYNC_WATERMARKS_ENABLED: bool = (
+    os.getenv("CONFLUENCE_SYNC_WATERMARKS_ENABLED", "false").lower() == "true"
+)
+CONFLUENCE_SYNC_WATERMARK_KEY: str = os.getenv(
+    "CONFLUENCE_SYNC_WATERMARK_KEY", "jira-sync-watermark"
+)
+
+# Version-keyed cache of Confluence page bodies shared by all services. A
+# page's latest version is trusted for PAGE_CACHE_VERSION_TTL_SECONDS before it
+# is checked again with a request that fetches only the version number.
+PAGE_CACHE_ENABLED: bool = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_MAX_BYTES: int = int(os.getenv("PAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+PAGE_CACHE_VERSION_TTL_SECONDS: float = float(
+    os.getenv("PAGE_CACHE_VERSION_TTL_SECONDS", 30)
+)
+
+# Per-request timing (queue wait, connect, time to first byte and total) kept
+# in histograms per endpoint class and reported in /metrics.
+REQUEST_TIMING_ENABLED: bool = (
+    os.getenv("REQUEST_TIMING_ENABLED", "true").lower() == "true"
+)
+
+# Optional conditional-GET cache: responses carrying an ETag or Last-Modified
+# header are kept (LRU, within the byte budget) and revalidated with
+# If-None-Match / If-Modified-Since, so unchanged resources return 304.
+RESPONSE_CACHE_ENABLED: bool = (
+    os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+)
+RESPONSE_CACHE_MAX_BYTES: int = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
+
+# Per-upstream circuit breaker: once at least CIRCUIT_BREAKER_MINIMUM_REQUESTS
+# requests in the sliding window have a failure rate (5xx, timeouts, connection
+# errors) at or above the threshold, requests fail fast for
+# CIRCUIT_BREAKER_OPEN_SECONDS before a probe request is let through.
+CIRCUIT_BREAKER_ENABLED: bool = (
+    os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+)
+CIRCUIT_BREAKER_FAILURE_RATE: float = float(
+    os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+)
+CIRCUIT_BREAKER_MINIMUM_REQUESTS: int = int(
+    os.getenv("CIRCUIT_BREAKER_MINIMUM_REQUESTS", 20)
+)
+CIRCUIT_BREAKER_WINDOW_SECONDS: float = float(
+    os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", 30.0)
+)
+CIRCUIT_BREAKER_OPEN_SECONDS: float = float(
+    os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", 30.0)
+)
+
+# Per-upstream retry budget: within a sliding RETRY_BUDGET_WINDOW_SECONDS
+# window, retries are limited to RETRY_BUDGET_RATIO of the successful requests
+# plus RETRY_BUDGET_MIN_PER_SECOND, so an outage is not amplified by retries.
+RETRY_BUDGET_ENABLED: bool = os.getenv("RETRY_BUDGET_ENABLED", "true").lower() == "true"
+RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", 0.2))
+RETRY_BUDGET_MIN_PER_SECOND: float = float(
+    os.getenv("RETRY_BUDGET_MIN_PER_SECOND", 1.0)
+)
+RETRY_BUDGET_WINDOW_SECONDS: float = float(
+    os.getenv("RETRY_BUDGET_WINDOW_SECONDS", 10.0)
+)
+
+# Adaptive (AIMD) concurrency: each upstream's limit starts at its configured
+# max_concurrent and then grows while latency stays near baseline, and is cut
+# on 429/503 responses, timeouts or rising latency.
+ADAPTIVE_CONCURRENCY_ENABLED: bool = (
+    os.getenv("ADAPTIVE_CONCURRENCY_ENABLED", "false").lower() == "true"
+)
+ADAPTIVE_CONCURRENCY_MIN: int = int(os.getenv("ADAPTIVE_CONCURRENCY_MIN", 2))
+ADAPTIVE_CONCURRENCY_MAX: int = int(
+    os.getenv("ADAPTIVE_CONCURRENCY_MAX", MAX_CONCURRENT_API_CALLS * 2)
+)
+ADAPTIVE_CONCURRENCY_DECREASE_FACTOR: float = float(
+    os.getenv("ADAPTIVE_CONCURRENCY_DECREASE_FACTOR", 0.5)
+)
+ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE: float = float(
+    os.getenv("ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE", 2.0)
+)
 
 JIRA_SUMMARY_MAX_CHARS: int = int(os.getenv("JIRA_SUMMARY_MAX_CHARS", 255))
 JIRA_DESCRIPTION_MAX_CHARS: int = int(os.getenv("JIRA_DESCRIPTION_MAX_CHARS", 2000))
@@ -121,3 +369,14 @@ DEFAULT_DUE_DATE_FOR_TREE_GENERATION: date = date.today() + timedelta(days=14)
 REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
 UNDO_EXPIRATION_SECONDS: int = int(os.getenv("UNDO_EXPIRATION_SECONDS", 86400))
+
+# Page IDs that short links resolve to are cached for PAGE_ID_CACHE_TTL_SECONDS,
+# in memory and, if PAGE_ID_CACHE_REDIS_ENABLED, in Redis as well.
+PAGE_ID_CACHE_ENABLED: bool = (
+    os.getenv("PAGE_ID_CACHE_ENABLED", "true").lower() == "true"
+)
+PAGE_ID_CACHE_TTL_SECONDS: float = float(os.getenv("PAGE_ID_CACHE_TTL_SECONDS", 86400))
+PAGE_ID_CACHE_MAX_ENTRIES: int = int(os.getenv("PAGE_ID_CACHE_MAX_ENTRIES", 10000))
+PAGE_ID_CACHE_REDIS_ENABLED: bool = (
+    os.getenv("PAGE_ID_CACHE_REDIS_ENABLED", "false").lower() == "true"
+)
@@ -12,6 +12,7 @@ wired together here, promoting loose coupling throughout the application.
 import logging
 import secrets
 from functools import lru_cache
+from typing import Optional
 
 import redis.asyncio as redis
 from fastapi import Depends, HTTPException, Security, status
@@ -27,6 +28,8 @@ from src.interfaces.issue_finder_interface import IFindIssue
 from src.interfaces.jira_interface import IJiraService
 from src.services.adaptors.confluence_service import ConfluenceService
 from src.services.adaptors.jira_service import JiraService
+from src.services.adaptors.page_cache import PageCache
+from src.services.adaptors.page_id_cache import PageIdCache
 from src.services.business.issue_finder import IssueFinder
 from src.services.business.redis_service import RedisService
 from src.services.orchestration.sync_project import (
@@ -122,12 +125,36 @@ def get_jira_service(
     return JiraService(safe_jira_api)
 
 
+_page_cache_instance = (
+    PageCache(
+        config.PAGE_CACHE_MAX_BYTES,
+        version_ttl_seconds=config.PAGE_CACHE_VERSION_TTL_SECONDS,
+    )
+    if config.PAGE_CACHE_ENABLED
+    else None
+)
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Provides the shared Confluence page cache.
+
+    Returns:
+        Optional[PageCache]: The page cache, or None if it is disabled.
+    """
+    return _page_cache_instance
+
+
 @lru_cache(maxsize=None)
 def get_confluence_service(
     safe_confluence_api: SafeConfluenceAPI = Depends(get_safe_confluence_api),
 ) -> IConfluenceService:
     """Provides a singleton instance of the ConfluenceService."""
-    return ConfluenceService(safe_confluence_api)
+    return ConfluenceService(
+        safe_confluence_api,
+        page_cache=get_page_cache(),
+        page_id_cache=get_page_id_cache(),
+    )
 
 
 @lru_cache(maxsize=None)
@@ -156,6 +183,29 @@ def get_redis_client() -> redis.Redis:
     )
 
 
+_page_id_cache_instance = (
+    PageIdCache(
+        config.PAGE_ID_CACHE_MAX_ENTRIES,
+        ttl_seconds=config.PAGE_ID_CACHE_TTL_SECONDS,
+        redis_client=(
+            get_redis_client() if config.PAGE_ID_CACHE_REDIS_ENABLED else None
+        ),
+    )
+    if config.PAGE_ID_CACHE_ENABLED
+    else None
+)
+
+
+def get_page_id_cache() -> Optional[PageIdCache]:
+    """
+    Provides the shared cache of resolved Confluence URLs.
+
+    Returns:
+        Optional[PageIdCache]: The page ID cache, or None if it is disabled.
+    """
+    return _page_id_cache_instance
+
+
 @lru_cache(maxsize=None)
 def get_history_service(
     redis_client: redis.Redis = Depends(get_redis_client),
@@ -8,9 +8,9 @@ promoting loose coupling and easier testing.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from src.models.data_models import ConfluenceTask
+from src.models.data_models import ConfluenceTask, HierarchyFilter
 
 
 class IConfluenceService(ABC):
@@ -35,6 +35,23 @@ class IConfluenceService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Retrieves the Confluence page IDs of many URLs asynchronously.
+
+        Args:
+            urls (List[str]): The URLs of the Confluence pages. Repeated URLs
+                              are resolved once.
+
+        Returns:
+            Dict[str, Optional[str]]: Maps each distinct URL to its page ID, or
+                                      to None if it cannot be resolved. URLs
+                                      whose resolution failed with an error
+                                      are left out.
+        """
+        pass
+
     @abstractmethod
     async def get_page_by_id(
         self, page_id: str, **kwargs: Any
@@ -70,6 +87,80 @@ class IConfluenceService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieves all descendant pages of a given Confluence page ID.
+
+        Unlike `get_all_descendants`, this returns the page objects, with the
+        requested properties expanded in the same listing requests, so callers
+        that need page content do not have to fetch every page again.
+
+        Args:
+            page_id (str): The ID of the parent Confluence page.
+            expand (Optional[str]): A comma-separated list of properties to
+                                    expand on each page (e.g.
+                                    'body.storage,version'). Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A flat list of all descendant page objects.
+        """
+        pass
+
+    @abstractmethod
+    def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the descendant pages of a Confluence page as they are found.
+
+        Unlike `get_all_descendant_pages`, callers can start working on the
+        first pages while the rest of the tree is still being discovered.
+
+        Args:
+            page_id (str): The ID of the parent Confluence page.
+            expand (Optional[str]): A comma-separated list of properties to
+                                    expand on each page (e.g.
+                                    'body.storage,version'). Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Limits the pages
+                                    discovered, pruning excluded subtrees.
+                                    Defaults to all descendants.
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: The descendant page objects, each
+                                           page once.
+        """
+        pass
+
+    @abstractmethod
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Creates or updates a content property of a Confluence page.
+
+        Args:
+            page_id (str): The ID of the page.
+            key (str): The key of the property.
+            value (Dict[str, Any]): The JSON value to store.
+            current_version (Optional[int]): The version of the existing
+                                             property, or None to create it.
+                                             Defaults to None.
+
+        Returns:
+            bool: True if the property was stored.
+        """
+        pass
+
     @abstractmethod
     async def get_tasks_from_page(
         self, page_details: Dict[str, Any]
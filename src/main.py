@@ -2,22 +2,27 @@
 Main entry point for the Jira-Confluence Automation FastAPI application.
 """
 
+import asyncio
 import logging
 import uuid
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Callable, Dict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
-import httpx
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from src.api.https_helper import HTTPSHelper
+from src.api.safe_jira_api import SafeJiraAPI
+from src.config import config
 from src.dependencies import (
     get_api_key,
     get_confluence_service,
     get_history_service,
     get_https_helper,
     get_jira_service,
+    get_page_cache,
+    get_safe_jira_api,
     get_sync_project,
     get_sync_task,
     get_undo_sync_task,
@@ -25,7 +30,6 @@ from src.dependencies import (
 from src.error_handler_app import register_exception_handlers
 from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.history_service_interface import IHistoryService
-from src.interfaces.jira_interface import IJiraService
 from src.models.api_models import (
     SyncProjectRequest,
     SyncProjectResponse,
@@ -34,14 +38,54 @@ from src.models.api_models import (
     UndoSyncTaskRequest,
     UndoSyncTaskResponse,
 )
+from src.services.adaptors.page_cache import PageCache
 from src.services.orchestration.sync_project import SyncProjectService
 from src.services.orchestration.sync_task import SyncTaskService
 from src.services.orchestration.undo_sync_task import UndoSyncService
+from src.utils.deadline import DEADLINE_EXCEEDED_STATUS
 from src.utils.logging_config import endpoint_var, request_id_var, setup_logging
 
 logger = logging.getLogger(__name__)
 
 
+async def warm_up(http_helper: HTTPSHelper) -> None:
+    """
+    Opens upstream connections and primes caches before traffic arrives.
+
+    Failures are logged and otherwise ignored: a cold start is slower, not
+    broken. The whole step is bounded by config.WARMUP_TIMEOUT_SECONDS.
+    """
+    try:
+        async with asyncio.timeout(config.WARMUP_TIMEOUT_SECONDS):
+            await http_helper.warm_up(config.WARMUP_CONNECTIONS)
+            # Called with the same arguments FastAPI uses, so the cached
+            # singleton that serves requests is the one being primed.
+            jira_service = get_jira_service(
+                safe_jira_api=get_safe_jira_api(https_helper=http_helper)
+            )
+            issue_type_ids = {
+                config.TASK_ISSUE_TYPE_ID,
+                config.JIRA_PROJECT_ISSUE_TYPE_ID,
+                config.JIRA_PHASE_ISSUE_TYPE_ID,
+                config.JIRA_WORK_CONTAINER_ISSUE_TYPE_ID,
+                config.JIRA_WORK_PACKAGE_ISSUE_TYPE_ID,
+            }
+            await asyncio.gather(
+                jira_service.get_user_display_name(),
+                *(
+                    jira_service.get_issue_type_name(type_id)
+                    for type_id in sorted(filter(None, issue_type_ids))
+                ),
+            )
+        logger.info("Warm-up complete.")
+    except TimeoutError:
+        logger.warning(
+            f"Warm-up did not finish within {config.WARMUP_TIMEOUT_SECONDS}s."
+        )
+    except Exception:
+        logger.exception("Warm-up failed.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Manages the application's lifespan events for resource management."""
@@ -49,22 +93,25 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Application starting up...")
     http_helper = get_https_helper()
     try:
-        http_helper.client = httpx.AsyncClient(
-            verify=getattr(http_helper, "_verify_ssl", True),
-            cookies=httpx.Cookies(),
+        http_helper.client = http_helper.build_client()
+        logger.info(
+            f"HTTP client created (HTTP/2 enabled: {http_helper.http2_enabled})."
         )
     except Exception:
         logger.exception("Error creating httpx client during app startup.")
 
+    # Warm-up runs in the background so /health answers right away; /ready
+    # reports 503 until it is done.
+    app.state.warm_up_task = (
+        asyncio.create_task(warm_up(http_helper)) if config.WARMUP_ENABLED else None
+    )
+
     yield
 
     logger.info("Application shutting down...")
-    if (
-        hasattr(http_helper, "client")
-        and http_helper.client
-        and hasattr(http_helper.client, "aclose")
-    ):
-        await http_helper.client.aclose()
+    if app.state.warm_up_task is not None:
+        app.state.warm_up_task.cancel()
+    await http_helper.close()
     logger.info("Application shutdown complete.")
 
 
@@ -144,6 +191,7 @@ async def sync_task(
 )
 async def undo_sync_task_by_id(
     request_id: str,
+    deadline_seconds: Optional[float] = None,
     undo_orchestrator: UndoSyncService = Depends(get_undo_sync_task),
     history_service: IHistoryService = Depends(get_history_service),
 ) -> UndoSyncTaskResponse:
@@ -166,7 +214,9 @@ async def undo_sync_task_by_id(
     undo_requests = [UndoSyncTaskRequest(**item) for item in results_to_undo]
 
     # Call the existing undo orchestrator with the retrieved data
-    response = await undo_orchestrator.run(undo_requests, request_id=request_id)
+    response = await undo_orchestrator.run(
+        undo_requests, request_id=request_id, deadline_seconds=deadline_seconds
+    )
 
     # Delete the results after a successful undo to prevent re-running it
     if "Success" in response.overall_status:
@@ -196,6 +246,8 @@ async def sync_project(
     updated_pages = await confluence_updater.sync_project(
         project_page_url=request.project_page_url,
         project_key=request.project_key,
+        deadline_seconds=request.deadline_seconds,
+        hierarchy_filter=request.hierarchy_filter,
     )
 
     if updated_pages:
@@ -205,7 +257,13 @@ async def sync_project(
 
     request_id = request_id_var.get()
     assert request_id is not None
-    return SyncProjectResponse(request_id=request_id, results=updated_pages)
+    return SyncProjectResponse(
+        request_id=request_id,
+        results=updated_pages,
+        deadline_exceeded=any(
+            page.status == DEADLINE_EXCEEDED_STATUS for page in updated_pages
+        ),
+    )
 
 
 @app.get("/", include_in_schema=False)
@@ -225,13 +283,62 @@ async def health_check() -> Dict[str, str]:
 
 @app.get("/ready", status_code=status.HTTP_200_OK)
 async def readiness_check(
-    jira_service: IJiraService = Depends(get_jira_service),
+    request: Request,
+    jira_api: SafeJiraAPI = Depends(get_safe_jira_api),
     confluence_service: IConfluenceService = Depends(get_confluence_service),
-) -> Dict[str, str]:
+    https_helper: HTTPSHelper = Depends(get_https_helper),
+) -> Dict[str, Any]:
     """Provides a readiness probe endpoint."""
     logger.info("Performing readiness check...")
-    await jira_service.get_user_display_name()
+    warm_up_task = getattr(request.app.state, "warm_up_task", None)
+    if warm_up_task is not None and not warm_up_task.done():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Warming up upstream connections.",
+        )
+    circuit_breakers = https_helper.circuit_breaker_states()
+    open_upstreams = [
+        name for name, state in circuit_breakers.items() if state == "open"
+    ]
+    if open_upstreams:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Circuit breaker open for: {', '.join(sorted(open_upstreams))}",
+        )
+    # The API is called directly: the service caches the current user, so
+    # it would not tell whether Jira is still reachable.
+    await jira_api.get_current_user()
     logger.info("Jira service is reachable and authenticated.")
     await confluence_service.health_check()
     logger.info("Confluence service is reachable and authenticated.")
-    return {"status": "ready", "detail": "Application and dependencies are ready."}
+    return {
+        "status": "ready",
+        "detail": "Application and dependencies are ready.",
+        "circuit_breakers": circuit_breakers,
+    }
+
+
+@app.get("/metrics", dependencies=[Depends(get_api_key)])
+async def metrics(
+    https_helper: HTTPSHelper = Depends(get_https_helper),
+    page_cache: Optional[PageCache] = Depends(get_page_cache),
+) -> Dict[str, Any]:
+    """Exposes in-process metrics of the outbound HTTP client and caches."""
+    metrics: Dict[str, Any] = {"http": https_helper.get_metrics()}
+    if page_cache is not None:
+        metrics["page_cache"] = page_cache.stats()
+    return metrics
+
+
+@app.get("/metrics/timings", dependencies=[Depends(get_api_key)])
+async def metrics_timings(
+    top: Optional[int] = None,
+    https_helper: HTTPSHelper = Depends(get_https_helper),
+) -> Dict[str, Any]:
+    """
+    Exposes upstream latency histograms per endpoint class, slowest first.
+
+    The optional `top` query parameter limits the response to the endpoint
+    classes that took the most total time.
+    """
+    return {"timings": https_helper.request_timings(top)}
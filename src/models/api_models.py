@@ -9,7 +9,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from src.models.data_models import ConfluenceTask
+from src.models.data_models import ConfluenceTask, HierarchyFilter
 
 # ---API Request Models---#
 
@@ -27,10 +27,18 @@ class SyncTaskContext(BaseModel):
         request_user (Optional[str]): The user who initiated the request.
         days_to_due_date (Optional[int]): The default number of days to set
             for a task's due date if not specified.
+        deadline_seconds (Optional[float]): Upper bound on the duration of the
+            whole request. Defaults to config.REQUEST_DEADLINE_SECONDS.
+        hierarchy_filter (HierarchyFilter): Limits which pages below each
+            root page are scanned for tasks. Defaults to all of them.
     """
 
     request_user: Optional[str] = "unknown_user"
     days_to_due_date: Optional[int] = 14
+    deadline_seconds: Optional[float] = Field(
+        default=None, gt=0, json_schema_extra={"example": 120}
+    )
+    hierarchy_filter: HierarchyFilter = Field(default_factory=HierarchyFilter)
 
 
 class SyncTaskRequest(BaseModel):
@@ -82,6 +90,10 @@ class SyncProjectRequest(BaseModel):
             project.
         project_key (str): The key of the top-level Jira project issue.
         request_user (Optional[str]): The user initiating the update.
+        deadline_seconds (Optional[float]): Upper bound on the duration of the
+            whole request. Defaults to config.REQUEST_DEADLINE_SECONDS.
+        hierarchy_filter (HierarchyFilter): Limits which pages below the root
+            page are updated. Defaults to all of them.
     """
 
     project_page_url: str = Field(
@@ -94,6 +106,10 @@ class SyncProjectRequest(BaseModel):
     request_user: Optional[str] = Field(
         ..., json_schema_extra={"example": "your.username"}
     )
+    deadline_seconds: Optional[float] = Field(
+        default=None, gt=0, json_schema_extra={"example": 300}
+    )
+    hierarchy_filter: HierarchyFilter = Field(default_factory=HierarchyFilter)
 
 
 # ---Internal Orchestrator Result (not direct API response model for /sync_task)---#
@@ -185,6 +201,10 @@ class SyncTaskResponse(BaseModel):
         ...,
         description="Overall status of both Jira & Confluence update",
     )
+    deadline_exceeded: bool = Field(
+        False,
+        description="Whether some work was skipped because the deadline passed.",
+    )
 
 
 class UndoActionResult(BaseModel):
@@ -222,6 +242,10 @@ class UndoSyncTaskResponse(BaseModel):
         description="""Overall status of the undo operation
         (Success, Partial Success, Failed).""",
     )
+    deadline_exceeded: bool = Field(
+        False,
+        description="Whether some work was skipped because the deadline passed.",
+    )
 
 
 class SinglePageResult(BaseModel):
@@ -261,7 +285,10 @@ class SyncProjectResponse(BaseModel):
         request_id (str): A unique identifier for the project sync request.
         results (List[SinglePageResult]): A list of details for each page
             that was updated.
+        deadline_exceeded (bool): Whether some pages were skipped because the
+            deadline passed.
     """
 
     request_id: str
     results: List[SinglePageResult]
+    deadline_exceeded: bool = False
@@ -5,9 +5,10 @@ Using Pydantic models ensures robust data validation, serialization,
 and clear, self-documenting code. The models cover entities from Confluence and Jira
 """
 
-from typing import Optional
+import re
+from typing import Any, Dict, List, Optional, Set
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 # ---Confluence related data model--- #
 
@@ -52,6 +53,131 @@ class ConfluenceTask(BaseModel):
     context: Optional[str] = None
 
 
+class HierarchyFilter(BaseModel):
+    """
+    Limits which pages below a root page are discovered and scanned.
+
+    Exclusions and the depth limit prune whole subtrees: the pages below an
+    excluded page or beyond `max_depth` are never listed. Inclusion by label
+    only decides which of the discovered pages are scanned; the pages without
+    the label are still walked through to reach their children. The root
+    page itself is always scanned.
+
+    Attributes:
+        max_depth (Optional[int]): How many levels below the root are
+            scanned; 1 means the root's children only. Unlimited if None.
+        exclude_page_ids (List[str]): Pages skipped with their subtrees.
+        exclude_labels (List[str]): Pages carrying any of these labels are
+            skipped with their subtrees.
+        exclude_title_patterns (List[str]): Regular expressions; pages whose
+            title matches any of them are skipped with their subtrees.
+        include_labels (List[str]): If given, only pages carrying one of
+            these labels are scanned.
+    """
+
+    max_depth: Optional[int] = Field(
+        default=None, ge=0, json_schema_extra={"example": 3}
+    )
+    exclude_page_ids: List[str] = Field(
+        default_factory=list, json_schema_extra={"example": ["123456"]}
+    )
+    exclude_labels: List[str] = Field(
+        default_factory=list, json_schema_extra={"example": ["archive"]}
+    )
+    exclude_title_patterns: List[str] = Field(
+        default_factory=list, json_schema_extra={"example": ["^Archive"]}
+    )
+    include_labels: List[str] = Field(default_factory=list)
+
+    @field_validator("exclude_page_ids")
+    @classmethod
+    def _check_page_ids(cls, page_ids: List[str]) -> List[str]:
+        for page_id in page_ids:
+            if not page_id.isdigit():
+                raise ValueError(f"'{page_id}' is not a Confluence page ID.")
+        return page_ids
+
+    @field_validator("exclude_title_patterns")
+    @classmethod
+    def _check_title_patterns(cls, patterns: List[str]) -> List[str]:
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid title pattern '{pattern}': {e}") from e
+        return patterns
+
+    @property
+    def needs_labels(self) -> bool:
+        """Whether pages must be listed with their labels to be filtered."""
+        return bool(self.exclude_labels or self.include_labels)
+
+    @property
+    def needs_walk(self) -> bool:
+        """
+        Whether the tree must be walked level by level to honour the filter.
+
+        Bulk listings return the whole tree at once, so they cannot stop at
+        a depth or below a page that is only recognised by its title or
+        labels.
+        """
+        return bool(
+            self.max_depth is not None
+            or self.exclude_labels
+            or self.exclude_title_patterns
+        )
+
+    def excludes(self, page: Dict[str, Any]) -> bool:
+        """
+        Checks whether a page is skipped together with its subtree.
+
+        Args:
+            page (Dict[str, Any]): A page object, with `metadata.labels`
+                expanded if labels are filtered on.
+
+        Returns:
+            bool: True if the page is excluded by ID, label or title.
+        """
+        if page.get("id") in self.exclude_page_ids:
+            return True
+        if self.exclude_labels and not page_labels(page).isdisjoint(
+            self.exclude_labels
+        ):
+            return True
+        title = page.get("title") or ""
+        return any(re.search(pattern, title) for pattern in self.exclude_title_patterns)
+
+    def includes(self, page: Dict[str, Any]) -> bool:
+        """
+        Checks whether a discovered page is scanned.
+
+        Args:
+            page (Dict[str, Any]): A page object, with `metadata.labels`
+                expanded if labels are filtered on.
+
+        Returns:
+            bool: True if no labels are required or the page carries one.
+        """
+        if not self.include_labels:
+            return True
+        return not page_labels(page).isdisjoint(self.include_labels)
+
+
+def page_labels(page: Dict[str, Any]) -> Set[str]:
+    """
+    Returns the label names of a page listed with `metadata.labels`.
+
+    Args:
+        page (Dict[str, Any]): A page object.
+
+    Returns:
+        Set[str]: The page's label names; empty if labels were not
+            expanded.
+    """
+    labels = page.get("metadata", {}).get("labels", {}).get("results", [])
+    return {label["name"] for label in labels if "name" in label}
+
+
 # ---Jira related data model--- #
 
 
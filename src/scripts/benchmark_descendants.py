@@ -0,0 +1,128 @@
+# Benchmark for the page-tree discovery strategies of SafeConfluenceAPI.
+#
+# Serves a generated page tree from an in-process mock Confluence that adds a
+# fixed latency to every request, then times `get_all_descendants` with each
+# strategy and checks that they all find the same pages.
+#
+# Usage:
+#   python -m src.scripts.benchmark_descendants [--pages 2000] [--fan-out 8]
+#       [--latency 0.05]
+
+import argparse
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, List
+
+import httpx
+
+from src.api.https_helper import HTTPSHelper
+from src.api.safe_confluence_api import SafeConfluenceAPI
+
+# Set up basic logging for the benchmark script itself
+logging.basicConfig(level=logging.INFO)
+# Every mock request would otherwise be logged between the results.
+logging.getLogger("src.api").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+_CHILDREN_PATH = re.compile(r"/content/(\d+)/child/page$")
+_DESCENDANTS_PATH = re.compile(r"/content/(\d+)/descendant/page$")
+_ANCESTOR_CQL = re.compile(r"ancestor = (\d+)")
+
+
+def build_tree(pages: int, fan_out: int) -> Dict[str, List[str]]:
+    """Builds a tree of `pages` pages below page 0, `fan_out` children each."""
+    children: Dict[str, List[str]] = {"0": []}
+    for page in range(1, pages + 1):
+        parent = str((page - 1) // fan_out)
+        children[parent].append(str(page))
+        children[str(page)] = []
+    return children
+
+
+def descendants_of(children: Dict[str, List[str]], page_id: str) -> List[str]:
+    """Returns the descendants of a page in breadth-first order."""
+    found: List[str] = []
+    queue = list(children[page_id])
+    while queue:
+        page = queue.pop(0)
+        found.append(page)
+        queue.extend(children[page])
+    return found
+
+
+def mock_confluence(
+    children: Dict[str, List[str]], latency: float
+) -> httpx.MockTransport:
+    """Returns a transport answering child, descendant and CQL listings."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        path = request.url.path
+        start = int(request.url.params.get("start", 0))
+        limit = int(request.url.params.get("limit", 25))
+        if match := _CHILDREN_PATH.search(path):
+            ids = children[match.group(1)]
+        elif match := _DESCENDANTS_PATH.search(path):
+            ids = descendants_of(children, match.group(1))
+        elif path.endswith("/content/search"):
+            cql = _ANCESTOR_CQL.search(request.url.params["cql"])
+            ids = descendants_of(children, cql.group(1)) if cql else []
+        else:
+            return httpx.Response(404)
+        window = ids[start : start + limit]
+        return httpx.Response(
+            200,
+            json={
+                "results": [{"id": page, "type": "page"} for page in window],
+                "start": start,
+                "limit": limit,
+                "size": len(window),
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+async def run(pages: int, fan_out: int, latency: float) -> None:
+    children = build_tree(pages, fan_out)
+    expected = set(descendants_of(children, "0"))
+    logger.info(
+        f"{pages} pages, fan-out {fan_out}, {latency * 1000:.0f} ms per request"
+    )
+
+    for strategy in ("bfs", "descendant", "cql"):
+        helper = HTTPSHelper(upstream_urls={"confluence": "https://confluence.test"})
+        helper.client = httpx.AsyncClient(transport=mock_confluence(children, latency))
+        api = SafeConfluenceAPI(
+            "https://confluence.test", helper, descendant_strategy=strategy
+        )
+        # The API reads its base URL from config; point it at the mock.
+        api.base_url = "https://confluence.test"
+        started = time.perf_counter()
+        found = await api.get_all_descendants("0")
+        elapsed = time.perf_counter() - started
+        requests = sum(
+            endpoint["total"]["count"] for endpoint in helper.request_timings().values()
+        )
+        status = "ok" if set(found) == expected else "MISMATCH"
+        logger.info(
+            f"  {strategy:<10} {elapsed:8.2f} s  {requests:6d} requests  "
+            f"{len(found):6d} pages  {status}"
+        )
+        await helper.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fan-out", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.fan_out, args.latency))
+
+
+if __name__ == "__main__":
+    main()
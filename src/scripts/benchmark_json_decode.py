@@ -0,0 +1,96 @@
+# Microbenchmark for the JSON decoders available to HTTPSHelper.
+#
+# Builds realistic Confluence REST payloads around a real storage-format page
+# body and times how long each decoder takes to turn the raw response bytes
+# into Python objects.
+#
+# Usage:
+#   python -m src.scripts.benchmark_json_decode [--pages 50] [--repeat 200]
+
+import argparse
+import json
+import logging
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from src.api.https_helper import get_json_decoder
+
+# Set up basic logging for the benchmark script itself
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_HTML = (
+    Path(__file__).resolve().parents[2]
+    / "tests"
+    / "utils"
+    / "test_data"
+    / "real_confluence_page.html"
+)
+
+
+def build_page(page_id: int, body: str) -> Dict[str, Any]:
+    """Builds a page object shaped like GET /rest/api/content/{id}."""
+    return {
+        "id": str(page_id),
+        "type": "page",
+        "status": "current",
+        "title": f"Benchmark page {page_id}",
+        "version": {
+            "by": {"username": "benchmark", "displayName": "Benchmark User"},
+            "when": "2024-01-01T00:00:00.000Z",
+            "number": 42,
+        },
+        "ancestors": [{"id": str(i), "title": f"Ancestor {i}"} for i in range(5)],
+        "body": {"storage": {"value": body, "representation": "storage"}},
+        "_links": {"webui": f"/pages/viewpage.action?pageId={page_id}"},
+    }
+
+
+def build_payloads(pages: int) -> Dict[str, bytes]:
+    """Encodes a single page and a search result of many pages."""
+    body = PAGE_HTML.read_text(encoding="utf-8")
+    single = build_page(1, body)
+    listing = {
+        "results": [build_page(i, body) for i in range(pages)],
+        "start": 0,
+        "limit": pages,
+        "size": pages,
+    }
+    return {
+        "single page": json.dumps(single).encode("utf-8"),
+        f"{pages} pages": json.dumps(listing).encode("utf-8"),
+    }
+
+
+def time_decoder(decode: Callable[[bytes], Any], payload: bytes, repeat: int) -> float:
+    """Returns the best per-call time in microseconds over 5 runs."""
+    runs: List[float] = timeit.repeat(lambda: decode(payload), number=repeat, repeat=5)
+    return min(runs) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    decoders = {"json": get_json_decoder("json")}
+    fast = get_json_decoder("orjson")
+    if fast is not decoders["json"]:
+        decoders["orjson"] = fast
+
+    for name, payload in build_payloads(args.pages).items():
+        logger.info(f"{name} ({len(payload) / 1024:.1f} KiB)")
+        baseline = None
+        for decoder_name, decode in decoders.items():
+            micros = time_decoder(decode, payload, args.repeat)
+            baseline = baseline or micros
+            logger.info(
+                f"  {decoder_name:<8} {micros:10.1f} us/call"
+                f"  ({baseline / micros:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
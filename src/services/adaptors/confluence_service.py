@@ -8,15 +8,20 @@ services.
 
 The primary role of this class is to delegate Confluence-specific operations
 to the underlying `SafeConfluenceAPI`, providing a clean and simple interface
-for the rest of the application.
+for the rest of the application. Page bodies are optionally served from a
+version-keyed `PageCache`, so each page version is downloaded at most once,
+and resolved short links from a `PageIdCache`.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from src.api.safe_confluence_api import SafeConfluenceAPI
+from src.api.safe_confluence_api import SafeConfluenceAPI, parse_page_id
 from src.interfaces.confluence_interface import IConfluenceService
-from src.models.data_models import ConfluenceTask
+from src.models.data_models import ConfluenceTask, HierarchyFilter
+from src.services.adaptors.page_cache import PageCache, parse_expand
+from src.services.adaptors.page_id_cache import PageIdCache
 
 logger = logging.getLogger(__name__)
 
@@ -31,27 +36,76 @@ class ConfluenceService(IConfluenceService):
     code.
     """
 
-    def __init__(self, safe_confluence_api: SafeConfluenceAPI):
+    def __init__(
+        self,
+        safe_confluence_api: SafeConfluenceAPI,
+        page_cache: Optional[PageCache] = None,
+        page_id_cache: Optional[PageIdCache] = None,
+    ):
         """
         Initializes the ConfluenceService.
 
         Args:
             safe_confluence_api (SafeConfluenceAPI): An instance of the safe,
                 low-level Confluence API wrapper.
+            page_cache (Optional[PageCache]): A cache for page bodies, shared
+                by everything that uses this service. Defaults to None, in
+                which case every read goes to the API.
+            page_id_cache (Optional[PageIdCache]): A cache for the page IDs
+                that short links resolve to. Defaults to None, in which case
+                every short link is resolved again.
         """
         self._api = safe_confluence_api
+        self._page_cache = page_cache
+        self._page_id_cache = page_id_cache
 
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
         """
         Delegates extracting a page ID from a URL to the API layer.
 
+        URLs that need a request to resolve, such as short links, are answered
+        from the page ID cache when they were resolved before.
+
         Args:
             url (str): The Confluence page URL.
 
         Returns:
             Optional[str]: The extracted page ID, or None if not found.
         """
-        return await self._api.get_page_id_from_url(url)
+        if self._page_id_cache is None or parse_page_id(url):
+            return await self._api.get_page_id_from_url(url)
+
+        page_id = await self._page_id_cache.get(url)
+        if page_id is None:
+            page_id = await self._api.get_page_id_from_url(url)
+            if page_id is not None:
+                await self._page_id_cache.set(url, page_id)
+        return page_id
+
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolves many URLs to page IDs concurrently, each distinct URL once.
+
+        Args:
+            urls (List[str]): The Confluence page URLs, possibly repeated.
+
+        Returns:
+            Dict[str, Optional[str]]: Maps each distinct URL to its page ID, or
+            to None if it has none. URLs whose resolution failed with an
+            error are left out.
+        """
+        distinct_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *(self.get_page_id_from_url(url) for url in distinct_urls),
+            return_exceptions=True,
+        )
+        page_ids: Dict[str, Optional[str]] = {}
+        for url, result in zip(distinct_urls, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Could not resolve page ID of '{url}': {result}")
+                continue
+            page_ids[url] = result
+        return page_ids
 
     async def get_all_descendants(self, page_id: str) -> List[str]:
         """
@@ -65,20 +119,152 @@ class ConfluenceService(IConfluenceService):
         """
         return await self._api.get_all_descendants(page_id)
 
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Delegates fetching all descendant pages to the API layer.
+
+        Pages listed with their bodies and versions are added to the page
+        cache, so later reads of the same pages need no download.
+
+        Args:
+            page_id (str): The ID of the parent page.
+            expand (Optional[str]): Properties to expand on each page.
+                Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of descendant page objects.
+        """
+        pages = await self._api.get_all_descendant_pages(page_id, expand=expand)
+        for page in pages:
+            self._cache_listed_page(page, expand)
+        return pages
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Delegates streaming the descendant pages to the API layer.
+
+        Like with `get_all_descendant_pages`, pages listed with their bodies
+        and versions are added to the page cache.
+
+        Args:
+            page_id (str): The ID of the parent page.
+            expand (Optional[str]): Properties to expand on each page.
+                Defaults to None.
+            hierarchy_filter (Optional[HierarchyFilter]): Limits the pages
+                discovered. Defaults to all descendants.
+
+        Yields:
+            Dict[str, Any]: Each descendant page object, once.
+        """
+        async for page in self._api.iter_descendant_pages(
+            page_id, expand=expand, hierarchy_filter=hierarchy_filter
+        ):
+            self._cache_listed_page(page, expand)
+            yield page
+
+    def _cache_listed_page(self, page: Dict[str, Any], expand: Optional[str]) -> None:
+        """
+        Caches a listed page if it came with its body and version.
+
+        A page listed with only its version still confirms that version as
+        the latest, so fetching its body afterwards needs no version check.
+        """
+        expansions = parse_expand(expand)
+        if self._page_cache is None or "version" not in expansions:
+            return
+        if "body.storage" in expansions:
+            self._page_cache.store(page, expansions)
+            return
+        version = page.get("version", {}).get("number")
+        if page.get("id") is not None and isinstance(version, int):
+            self._page_cache.confirm_latest(page["id"], version)
+
     async def get_page_by_id(
         self, page_id: str, **kwargs: Any
     ) -> Optional[Dict[str, Any]]:
         """
         Delegates fetching a page by its ID to the API layer.
 
+        Requests for page bodies are answered from the page cache when the
+        requested (or latest) version is cached with all requested
+        properties. The latest version is taken from the cache if it was
+        confirmed recently, and otherwise looked up with a request that
+        fetches only the version number.
+
         Args:
             page_id (str): The ID of the page.
-            **kwargs: Additional arguments like 'expand'.
+            **kwargs: Additional arguments like 'expand' and 'version'.
 
         Returns:
             Optional[Dict[str, Any]]: The page data, or None.
         """
-        return await self._api.get_page_by_id(page_id, **kwargs)
+        expansions = parse_expand(kwargs.get("expand"))
+        if (
+            self._page_cache is None
+            or "body.storage" not in expansions
+            or set(kwargs) - {"expand", "version"}
+        ):
+            return await self._api.get_page_by_id(page_id, **kwargs)
+
+        cache = self._page_cache
+        expansions |= {"version"}
+        version = kwargs.get("version")
+        is_latest = version is None
+        if version is None:
+            version = cache.latest_version(page_id)
+            if version is None:
+                cache.version_checks += 1
+                current = await self._api.get_page_by_id(page_id, expand="version")
+                if not current:
+                    return current
+                version = current["version"]["number"]
+                cache.confirm_latest(page_id, version)
+
+        page = cache.get(page_id, version, expansions)
+        if page is not None:
+            return page
+
+        # Expand whatever the cached copy already had too, so that the new
+        # entry can serve every caller the old one could.
+        expansions |= cache.expansions_of(page_id, version)
+        fetch_kwargs: Dict[str, Any] = {"expand": ",".join(sorted(expansions))}
+        if not is_latest:
+            fetch_kwargs["version"] = version
+        page = await self._api.get_page_by_id(page_id, **fetch_kwargs)
+        if page:
+            cache.store(page, expansions, latest=is_latest)
+        return page
+
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        """
+        Delegates storing a content property to the API layer.
+
+        Args:
+            page_id (str): The ID of the page.
+            key (str): The key of the property.
+            value (Dict[str, Any]): The JSON value to store.
+            current_version (Optional[int]): The version of the existing
+                property, or None to create it. Defaults to None.
+
+        Returns:
+            bool: True if the property was stored.
+        """
+        return await self._api.set_content_property(
+            page_id, key, value, current_version=current_version
+        )
 
     async def update_page_content(
         self, page_id: str, new_title: str, new_body: str
@@ -94,7 +280,10 @@ class ConfluenceService(IConfluenceService):
         Returns:
             bool: True if the update was successful, False otherwise.
         """
-        return await self._api.update_page(page_id, new_title, new_body)
+        try:
+            return await self._api.update_page(page_id, new_title, new_body)
+        finally:
+            self._invalidate(page_id)
 
     async def get_tasks_from_page(
         self, page_details: Dict[str, Any]
@@ -116,13 +305,29 @@ class ConfluenceService(IConfluenceService):
         """
         Delegates updating a page with Jira links to the API layer.
 
+        The page is read through the page cache, which usually already holds
+        it from task collection, so the update is a single request. Should
+        the cached version be outdated, the API layer re-reads the page when
+        Confluence rejects the update with a version conflict.
+
         Args:
             page_id (str): The ID of the page to update.
             mappings (List[Dict]): A list mapping Confluence task IDs to Jira keys.
         Returns:
             bool: True if the update was successful, False otherwise.
         """
-        return await self._api.add_jira_links_to_page(page_id, mappings)
+        try:
+            page = None
+            if self._page_cache is not None:
+                page = await self.get_page_by_id(page_id, expand="body.storage,version")
+            return await self._api.add_jira_links_to_page(page_id, mappings, page=page)
+        finally:
+            self._invalidate(page_id)
+
+    def _invalidate(self, page_id: str) -> None:
+        """Forgets a page's latest version once the page has been written."""
+        if self._page_cache is not None:
+            self._page_cache.invalidate(page_id)
 
     async def create_page(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
         """
@@ -47,6 +47,8 @@ class JiraService(IJiraService):
                 Jira API wrapper.
         """
         self._api = safe_jira_api
+        self._display_name: Optional[str] = None
+        self._issue_type_names: Dict[str, str] = {}
 
     async def get_issue(
         self, issue_key: str, fields: str = "*all"
@@ -122,9 +124,12 @@ class JiraService(IJiraService):
         Returns:
             str: The user's display name, or 'Unknown User' as a fallback.
         """
+        if self._display_name is not None:
+            return self._display_name
         user_details = await self._api.get_current_user()
         if user_details and "displayName" in user_details:
-            return user_details["displayName"]
+            self._display_name = user_details["displayName"]
+            return self._display_name
         else:
             return "Unknown User"
 
@@ -258,14 +263,22 @@ class JiraService(IJiraService):
         """
         Retrieves the name of a Jira issue type by its ID asynchronously.
 
+        Names that were found are cached for the lifetime of the service, as
+        issue types are effectively static.
+
         Args:
             type_id (str): The ID of the issue type.
 
         Returns:
             Optional[str]: The name of the issue type, or None if not found.
         """
+        if type_id in self._issue_type_names:
+            return self._issue_type_names[type_id]
         issue_type_details = await self._api.get_issue_type_by_id(type_id)
-        return issue_type_details.get("name") if issue_type_details else None
+        name = issue_type_details.get("name") if issue_type_details else None
+        if name is not None:
+            self._issue_type_names[type_id] = name
+        return name
 
     async def get_issue_status(self, issue_key: str) -> Optional[JiraIssueStatus]:
         """
@@ -0,0 +1,255 @@
+"""
+Provides a cache of Confluence page content keyed by page version.
+
+During one sync run the same page is read several times: when its tasks are
+collected, by the issue finder for every task on the page and for every page
+below it, and again before it is written. A page version never changes once
+it is published, so its content can be cached under `(page_id, version)`
+without any risk of serving stale data. The only question is which version is
+the latest, and that is answered either from memory (if it was confirmed
+recently) or by a cheap request that fetches just the version number.
+
+Entries are evicted in least-recently-used order once the total size of the
+cached page bodies exceeds the configured byte budget. The record of each
+page's latest version is dropped with the page's entry, and is kept for at
+most as many pages as the budget could hold, so it cannot outgrow the cache
+either (pages listed without their bodies have a latest version but no entry).
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+PageKey = Tuple[str, int]
+
+# Rough size of a page object's metadata, added to the size of its body.
+_PAGE_OVERHEAD_BYTES = 1024
+
+
+def parse_expand(expand: Optional[str]) -> FrozenSet[str]:
+    """
+    Splits an `expand` parameter into its properties.
+
+    Args:
+        expand (Optional[str]): A comma-separated list of properties.
+
+    Returns:
+        FrozenSet[str]: The properties, without blanks.
+    """
+    if not expand:
+        return frozenset()
+    return frozenset(item.strip() for item in expand.split(",") if item.strip())
+
+
+class CachedPage:
+    """
+    A cached page object together with the properties it was expanded with.
+
+    Attributes:
+        page (Dict[str, Any]): The page object as returned by the API.
+        expansions (FrozenSet[str]): The properties expanded on the page.
+        size (int): The estimated size of the page in bytes.
+    """
+
+    __slots__ = ("page", "expansions", "size")
+
+    def __init__(self, page: Dict[str, Any], expansions: FrozenSet[str]):
+        self.page = page
+        self.expansions = expansions
+        body = page.get("body", {}).get("storage", {}).get("value") or ""
+        self.size = len(body) + _PAGE_OVERHEAD_BYTES
+
+
+class PageCache:
+    """
+    An LRU cache of page versions, bounded by total byte size.
+
+    Attributes:
+        max_bytes (int): The budget for the summed size of cached pages.
+        version_ttl_seconds (float): How long a page's latest version is
+            trusted without asking Confluence again.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to download the page.
+        version_checks (int): Cheap requests made to learn a latest version.
+        evictions (int): Entries dropped to stay within the byte budget.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        version_ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the PageCache.
+
+        Args:
+            max_bytes (int): The maximum summed size of cached pages in bytes.
+            version_ttl_seconds (float): How long a confirmed latest version is
+                trusted. Defaults to 30 seconds.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self.max_bytes = max(0, int(max_bytes))
+        self.version_ttl_seconds = version_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[PageKey, CachedPage]" = OrderedDict()
+        self._latest: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._max_latest = max(1, self.max_bytes // _PAGE_OVERHEAD_BYTES)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def latest_version(self, page_id: str) -> Optional[int]:
+        """
+        Returns the latest version of a page, if it was confirmed recently.
+
+        Args:
+            page_id (str): The page ID.
+
+        Returns:
+            Optional[int]: The version number, or None if it is unknown or was
+            confirmed longer than `version_ttl_seconds` ago.
+        """
+        latest = self._latest.get(page_id)
+        if latest is None:
+            return None
+        version, confirmed_at = latest
+        if self._clock() - confirmed_at > self.version_ttl_seconds:
+            del self._latest[page_id]
+            return None
+        return version
+
+    def confirm_latest(self, page_id: str, version: int) -> None:
+        """
+        Records that a version is the latest version of a page.
+
+        The least recently confirmed records are dropped once there are more
+        than the byte budget could hold pages.
+
+        Args:
+            page_id (str): The page ID.
+            version (int): The page's latest version number.
+        """
+        self._latest[page_id] = (version, self._clock())
+        self._latest.move_to_end(page_id)
+        while len(self._latest) > self._max_latest:
+            self._latest.popitem(last=False)
+
+    def invalidate(self, page_id: str) -> None:
+        """
+        Forgets a page's latest version, e.g. after the page was written.
+
+        The cached versions themselves stay valid and are kept.
+
+        Args:
+            page_id (str): The page ID.
+        """
+        self._latest.pop(page_id, None)
+
+    def expansions_of(self, page_id: str, version: int) -> FrozenSet[str]:
+        """
+        Returns the properties a cached page version was expanded with.
+
+        Args:
+            page_id (str): The page ID.
+            version (int): The page version.
+
+        Returns:
+            FrozenSet[str]: The expanded properties, empty if not cached.
+        """
+        entry = self._entries.get((page_id, version))
+        return entry.expansions if entry is not None else frozenset()
+
+    def get(
+        self, page_id: str, version: int, expansions: FrozenSet[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of a cached page version and marks it recently used.
+
+        Args:
+            page_id (str): The page ID.
+            version (int): The page version.
+            expansions (FrozenSet[str]): The properties the caller needs.
+
+        Returns:
+            Optional[Dict[str, Any]]: The page, or None if that version is not
+            cached with all of the requested properties.
+        """
+        entry = self._entries.get((page_id, version))
+        if entry is None or not expansions <= entry.expansions:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((page_id, version))
+        self.hits += 1
+        return copy.deepcopy(entry.page)
+
+    def store(
+        self, page: Dict[str, Any], expansions: FrozenSet[str], latest: bool = True
+    ) -> bool:
+        """
+        Caches a page version if it fits the budget.
+
+        Args:
+            page (Dict[str, Any]): The page object, with `id` and
+                `version.number`.
+            expansions (FrozenSet[str]): The properties expanded on the page.
+            latest (bool): Whether the page is known to be the latest version.
+                Defaults to True.
+
+        Returns:
+            bool: True if the page was cached.
+        """
+        page_id = page.get("id")
+        version = page.get("version", {}).get("number")
+        if page_id is None or not isinstance(version, int):
+            return False
+        if latest:
+            self.confirm_latest(page_id, version)
+
+        key = (page_id, version)
+        entry = CachedPage(copy.deepcopy(page), expansions)
+        self._discard(key)
+        if entry.size > self.max_bytes:
+            return False
+        self._entries[key] = entry
+        self._size += entry.size
+        while self._size > self.max_bytes:
+            (evicted_id, evicted_version), evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.evictions += 1
+            if self._latest.get(evicted_id, (None,))[0] == evicted_version:
+                del self._latest[evicted_id]
+        return True
+
+    def _discard(self, key: PageKey) -> None:
+        """Removes a cached page version, if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache's counters and occupancy.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counts, the hit ratio, version checks,
+            evictions, the number of entries and their size against the budget.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "version_checks": self.version_checks,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,148 @@
+"""
+Provides a cache of the page IDs that Confluence URLs resolve to.
+
+Short links (`/x/...`) and display URLs carry no page ID, so resolving them
+takes a `HEAD` request that follows the redirects. Users submit the same
+links over and over, and the page a link points to does not change, so the
+answers are kept in memory for a while, in least-recently-used order up to a
+maximum number of entries.
+
+If a Redis client is given, answers are also written to Redis, so they are
+shared between workers and survive restarts. Redis is only an optimization
+here: if it cannot be reached, the cache logs a warning and carries on with
+its in-memory entries.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "confluence:page_id:"
+
+
+class PageIdCache:
+    """
+    A TTL cache mapping Confluence URLs to page IDs.
+
+    Attributes:
+        max_entries (int): The most URLs kept in memory.
+        ttl_seconds (float): How long a resolved URL is kept.
+        hits (int): Lookups answered from memory or Redis.
+        misses (int): Lookups that found nothing.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float = 86400.0,
+        redis_client: Optional[redis.Redis] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the PageIdCache.
+
+        Args:
+            max_entries (int): The most URLs kept in memory.
+            ttl_seconds (float): How long a resolved URL is kept. Defaults to
+                a day.
+            redis_client (Optional[redis.Redis]): Shares the entries through
+                Redis if given. Defaults to None.
+            clock (Callable[[], float]): Monotonic time source, injectable for
+                testing.
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, url: str) -> Optional[str]:
+        """
+        Returns the page ID a URL was resolved to, if it is still cached.
+
+        Args:
+            url (str): The Confluence URL.
+
+        Returns:
+            Optional[str]: The page ID, or None if the URL is not cached.
+        """
+        entry = self._entries.get(url)
+        if entry is not None:
+            page_id, expires_at = entry
+            if self._clock() < expires_at:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return page_id
+            del self._entries[url]
+
+        shared_page_id = await self._redis_get(url)
+        if shared_page_id is not None:
+            self._remember(url, shared_page_id)
+            self.hits += 1
+            return shared_page_id
+        self.misses += 1
+        return None
+
+    async def set(self, url: str, page_id: str) -> None:
+        """
+        Caches the page ID a URL resolves to.
+
+        Args:
+            url (str): The Confluence URL.
+            page_id (str): The page ID it resolves to.
+        """
+        self._remember(url, page_id)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                REDIS_KEY_PREFIX + url, page_id, ex=max(1, int(self.ttl_seconds))
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Could not store page ID for '{url}' in Redis: {e}")
+
+    async def _redis_get(self, url: str) -> Optional[str]:
+        """Reads a URL's page ID from Redis, if Redis is used and reachable."""
+        if self._redis is None:
+            return None
+        try:
+            page_id = await self._redis.get(REDIS_KEY_PREFIX + url)
+        except redis.RedisError as e:
+            logger.warning(f"Could not read page ID for '{url}' from Redis: {e}")
+            return None
+        if isinstance(page_id, bytes):
+            page_id = page_id.decode()
+        return page_id
+
+    def _remember(self, url: str, page_id: str) -> None:
+        """Keeps an entry in memory, dropping the least recently used ones."""
+        if self.max_entries == 0:
+            return
+        self._entries.pop(url, None)
+        self._entries[url] = (page_id, self._clock() + self.ttl_seconds)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counts, the hit ratio, the number of
+            entries in memory and whether Redis is used.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._entries),
+            "redis": self._redis is not None,
+        }
@@ -0,0 +1,107 @@
+"""
+Provides the watermark that records when a page was last synchronized.
+
+After a page has been scanned and all of its tasks were turned into Jira
+issues, a small content property is stored on the page. It holds the page
+version that was scanned (or written by the sync itself) and the IDs of the
+tasks found on it. Content properties are versioned separately from the page,
+so storing one does not create a new page version.
+
+Discovery lists the property together with each page's version. A page whose
+version still matches its watermark has not been edited since it was synced,
+so its body is neither fetched nor parsed again.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def watermark_expand(key: str) -> str:
+    """
+    Returns the `expand` parameter that lists pages with their watermark.
+
+    Args:
+        key (str): The key of the watermark content property.
+
+    Returns:
+        str: The page version and the content property.
+    """
+    return f"version,metadata.properties.{key}"
+
+
+class SyncWatermark:
+    """
+    The last synchronized state of a page.
+
+    Attributes:
+        page_version (int): The page version the watermark is valid for.
+        task_ids (List[str]): The IDs of the tasks found on the page.
+        property_version (Optional[int]): The version of the stored content
+            property, or None if the page has none yet.
+    """
+
+    __slots__ = ("page_version", "task_ids", "property_version")
+
+    def __init__(
+        self,
+        page_version: int,
+        task_ids: Optional[List[str]] = None,
+        property_version: Optional[int] = None,
+    ):
+        self.page_version = page_version
+        self.task_ids = task_ids or []
+        self.property_version = property_version
+
+    @classmethod
+    def from_page(cls, page: Dict[str, Any], key: str) -> Optional["SyncWatermark"]:
+        """
+        Reads the watermark from a page listed with its content property.
+
+        Args:
+            page (Dict[str, Any]): A page object, with
+                `metadata.properties.<key>` expanded.
+            key (str): The key of the watermark content property.
+
+        Returns:
+            Optional[SyncWatermark]: The stored watermark, or None if the page
+            has none. A malformed property is treated as missing, but its
+            version is kept so that it can be overwritten.
+        """
+        prop = page.get("metadata", {}).get("properties", {}).get(key)
+        if not isinstance(prop, dict):
+            return None
+        property_version = prop.get("version", {}).get("number")
+        value = prop.get("value")
+        if not isinstance(value, dict) or not isinstance(value.get("version"), int):
+            logger.warning(
+                f"Ignoring malformed sync watermark on page {page.get('id')}."
+            )
+            return cls(-1, property_version=property_version)
+        return cls(
+            value["version"],
+            [str(task_id) for task_id in value.get("taskIds", [])],
+            property_version,
+        )
+
+    def is_current(self, page: Dict[str, Any]) -> bool:
+        """
+        Checks whether a page is still at the synchronized version.
+
+        Args:
+            page (Dict[str, Any]): A page object with `version` expanded.
+
+        Returns:
+            bool: True if the page has not changed since it was synchronized.
+        """
+        return page.get("version", {}).get("number") == self.page_version
+
+    def to_value(self) -> Dict[str, Any]:
+        """
+        Returns the watermark as the value of its content property.
+
+        Returns:
+            Dict[str, Any]: The page version and the task IDs.
+        """
+        return {"version": self.page_version, "taskIds": self.task_ids}
@@ -17,6 +17,12 @@ from src.exceptions import ConfluenceApiError, InvalidInputError
 from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.jira_interface import IJiraService
 from src.models.api_models import SinglePageResult
+from src.models.data_models import HierarchyFilter
+from src.utils.deadline import (
+    DEADLINE_EXCEEDED_STATUS,
+    deadline_exceeded,
+    deadline_scope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,9 @@ class SyncProjectService:
     A service to update Confluence pages by replacing embedded Jira issue macros.
     """
 
+    # Page properties needed to replace macros and write the page back.
+    PAGE_EXPAND = "body.storage,version"
+
     def __init__(
         self,
         confluence_api: IConfluenceService,
@@ -40,13 +49,32 @@ class SyncProjectService:
         self,
         project_page_url: str,
         project_key: str,
+        deadline_seconds: Optional[float] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
     ) -> List[SinglePageResult]:
         """
         Updates Jira issue macros on a Confluence page hierarchy concurrently.
+
+        The run is bounded by `deadline_seconds`, or by
+        config.REQUEST_DEADLINE_SECONDS if not given. Pages that could not be
+        processed in time get a "deadline exceeded" status. Descendant pages
+        outside `hierarchy_filter` are neither listed nor updated.
         """
         logger.info(
             f"Starting Confluence update for hierarchy from: {project_page_url}"
         )
+        with deadline_scope(deadline_seconds or config.REQUEST_DEADLINE_SECONDS):
+            return await self._sync_project(
+                project_page_url, project_key, hierarchy_filter
+            )
+
+    async def _sync_project(
+        self,
+        project_page_url: str,
+        project_key: str,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ) -> List[SinglePageResult]:
+        """Runs the project sync within the deadline set by `sync_project`."""
 
         root_page_id = await self.confluence_api.get_page_id_from_url(project_page_url)
         if not root_page_id:
@@ -54,19 +82,57 @@ class SyncProjectService:
                 f"Could not find page ID for URL: {project_page_url}. Aborting."
             )
 
-        all_page_ids = [root_page_id] + await self.confluence_api.get_all_descendants(
-            root_page_id
-        )
-        logger.info(f"Found {len(all_page_ids)} total page(s) to scan.")
-
         target_ids_raw = {
             config.JIRA_PHASE_ISSUE_TYPE_ID,
             config.JIRA_WORK_PACKAGE_ISSUE_TYPE_ID,
             config.JIRA_WORK_CONTAINER_ISSUE_TYPE_ID,
         }
         target_ids = {t_id for t_id in target_ids_raw if t_id is not None}
-        candidate_issues = await self._get_project_issues(project_key, target_ids)
+        # The Jira search runs while the page tree is listed, and each page is
+        # processed as soon as it is discovered and the candidates are known.
+        issues_task = asyncio.ensure_future(
+            self._get_project_issues(project_key, target_ids)
+        )
+
+        async def process(
+            page_id: str, page_details: Optional[Dict[str, Any]] = None
+        ) -> Optional[SinglePageResult]:
+            candidate_issues = await issues_task
+            if not candidate_issues:
+                return None
+            return await self._process_page(
+                page_id,
+                candidate_issues,
+                target_ids,
+                project_key,
+                page_details=page_details,
+            )
 
+        # Page bodies come with the listing, so descendants need no second
+        # request each; only the root page is fetched on its own.
+        page_tasks = [asyncio.ensure_future(process(root_page_id))]
+        try:
+            async for page in self.confluence_api.iter_descendant_pages(
+                root_page_id,
+                expand=self.PAGE_EXPAND,
+                hierarchy_filter=hierarchy_filter,
+            ):
+                has_body = "value" in page.get("body", {}).get("storage", {})
+                page_tasks.append(
+                    asyncio.ensure_future(
+                        process(page["id"], page if has_body else None)
+                    )
+                )
+            logger.info(f"Found {len(page_tasks)} total page(s) to scan.")
+            candidate_issues = await issues_task
+        except BaseException:
+            issues_task.cancel()
+            for page_task in page_tasks:
+                page_task.cancel()
+            await asyncio.gather(issues_task, *page_tasks, return_exceptions=True)
+            raise
+
+        results = await asyncio.gather(*page_tasks, return_exceptions=True)
         if not candidate_issues:
             logger.warning(
                 f"No suitable candidate issues found under '{project_key}'. "
@@ -74,11 +140,6 @@ class SyncProjectService:
             )
             return []
 
-        tasks = [
-            self._process_page(page_id, candidate_issues, target_ids, project_key)
-            for page_id in all_page_ids
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
         updated_summary: List[SinglePageResult] = []
         for res in results:
             if isinstance(res, SinglePageResult):
@@ -95,14 +156,21 @@ class SyncProjectService:
         candidate_new_issues: List[Dict[str, Any]],
         target_issue_type_ids: Set[str],
         project_key: str,
+        page_details: Optional[Dict[str, Any]] = None,
     ) -> SinglePageResult:
         """
         Processes a single Confluence page to find and replace Jira macros.
+
+        The page is fetched unless its details (with body and version) are
+        passed in, e.g. from the discovery listing.
         """
+        if deadline_exceeded():
+            return self._deadline_exceeded_result(page_id, project_key)
         try:
-            page_details = await self.confluence_api.get_page_by_id(
-                page_id, expand="body.storage,version"
-            )
+            if page_details is None:
+                page_details = await self.confluence_api.get_page_by_id(
+                    page_id, expand=self.PAGE_EXPAND
+                )
             if not page_details or not page_details.get("body", {}).get(
                 "storage", {}
             ).get("value"):
@@ -163,6 +231,8 @@ class SyncProjectService:
                     project_linked=project_key,
                 )
         except ConfluenceApiError as e:
+            if deadline_exceeded():
+                return self._deadline_exceeded_result(page_id, project_key)
             # Catch the API error from the update call, can be due to permission
             logger.error(
                 f"An API error occurred while processing page '{page_id}': {e}",
@@ -190,6 +260,18 @@ class SyncProjectService:
                 project_linked=project_key,
             )
 
+    @staticmethod
+    def _deadline_exceeded_result(page_id: str, project_key: str) -> SinglePageResult:
+        """Builds the result for a page that was not processed in time."""
+        logger.warning(f"Deadline exceeded; page '{page_id}' was not processed.")
+        return SinglePageResult(
+            page_id=page_id,
+            page_title=f"Page with ID: {page_id}",
+            status=DEADLINE_EXCEEDED_STATUS,
+            new_jira_keys=[],
+            project_linked=project_key,
+        )
+
     async def _get_project_issues(
         self, root_key: str, target_issue_type_ids: Set[str]
     ) -> List[Dict[str, Any]]:
@@ -18,6 +18,12 @@ from src.models.api_models import (
     SyncTaskResponse,
 )
 from src.models.data_models import ConfluenceTask
+from src.services.business.sync_watermark import SyncWatermark, watermark_expand
+from src.utils.deadline import (
+    DEADLINE_EXCEEDED_STATUS,
+    deadline_exceeded,
+    deadline_scope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,17 +33,25 @@ class SyncTaskService:
     Orchestrates the automation by coordinating service layer interactions.
     """
 
+    # Page properties scanned for tasks. Ancestors are included because the
+    # issue finder walks them up from each task's page.
+    PAGE_EXPAND = "body.storage,version,ancestors"
+
     def __init__(
         self,
         confluence_service: IConfluenceService,
         jira_service: IJiraService,
         issue_finder: IFindIssue,
         history_service: IHistoryService,
+        use_watermarks: bool = config.CONFLUENCE_SYNC_WATERMARKS_ENABLED,
+        watermark_key: str = config.CONFLUENCE_SYNC_WATERMARK_KEY,
     ):
         self.confluence_service = confluence_service
         self.jira_service = jira_service
         self.issue_finder = issue_finder
         self.history_service = history_service
+        self.use_watermarks = use_watermarks
+        self.watermark_key = watermark_key
         self.request_user: Optional[str] = None
 
     async def run(
@@ -48,6 +62,11 @@ class SyncTaskService:
     ) -> SyncTaskResponse:
         """
         Main entry point for the automation workflow.
+
+        The run is bounded by `context.deadline_seconds`, or by
+        config.REQUEST_DEADLINE_SECONDS if the request does not set one. Work
+        that could not be done in time is reported with a "deadline exceeded"
+        status instead of being attempted.
         """
         logging.info("--- Starting Jira/Confluence Automation Script ---")
 
@@ -55,13 +74,25 @@ class SyncTaskService:
             raise InvalidInputError("No 'confluence_page_urls' provided.")
 
         page_urls = json_input["confluence_page_urls"]
-        hierarchy_tasks = [
-            self.process_page_hierarchy(url, context) for url in page_urls
-        ]
-        results: List[
-            Tuple[List[JiraTaskCreationResult], List[ConfluencePageUpdateResult]]
-            | BaseException
-        ] = await asyncio.gather(*hierarchy_tasks, return_exceptions=True)
+        deadline_seconds = context.deadline_seconds or config.REQUEST_DEADLINE_SECONDS
+        with deadline_scope(deadline_seconds):
+            # Resolve all URLs up front, so repeated and cached short links
+            # cost no request. A URL that failed here is resolved again by its
+            # hierarchy, which then reports the error.
+            page_ids = await self.confluence_service.get_page_ids_from_urls(page_urls)
+            hierarchy_tasks = []
+            for url in page_urls:
+                if url in page_ids and page_ids[url] is None:
+                    logger.error(f"Could not find page ID for URL: {url}. Skipping.")
+                    continue
+                hierarchy_tasks.append(
+                    self.process_page_hierarchy(url, context, page_ids.get(url))
+                )
+            results: List[
+                Tuple[List[JiraTaskCreationResult], List[ConfluencePageUpdateResult]]
+                | BaseException
+            ] = await asyncio.gather(*hierarchy_tasks, return_exceptions=True)
+            timed_out = deadline_exceeded()
 
         all_jira_results: List[JiraTaskCreationResult] = []
         all_confluence_results: List[ConfluencePageUpdateResult] = []
@@ -96,6 +127,8 @@ class SyncTaskService:
         overall_status = self._get_final_status(jira_status, confluence_status)
         if any_processing_errors and overall_status == "Success":
             overall_status = "Partial Success - some URLs cannot be processed"
+        if timed_out:
+            logger.warning("Deadline exceeded; some work was not done.")
 
         logging.info("\n--- Script Finished ---")
         return SyncTaskResponse(
@@ -105,51 +138,174 @@ class SyncTaskService:
             overall_jira_task_creation_status=jira_status,
             overall_confluence_page_update_status=confluence_status,
             overall_status=overall_status,
+            deadline_exceeded=timed_out,
         )
 
     async def process_page_hierarchy(
-        self, root_page_url: str, context: SyncTaskContext
+        self,
+        root_page_url: str,
+        context: SyncTaskContext,
+        root_page_id: Optional[str] = None,
     ) -> Tuple[List[JiraTaskCreationResult], List[ConfluencePageUpdateResult]]:
         """
         Processes a root Confluence page and all its descendants.
+
+        The root page's ID is resolved from its URL unless it is given. Only
+        the descendants allowed by `context.hierarchy_filter` are scanned.
+
+        With watermarks enabled, pages are listed with their version and sync
+        watermark instead of their body. Pages unchanged since their last
+        sync are skipped, the others are fetched one by one, and pages whose
+        tasks were all synchronized get a new watermark afterwards.
         """
         logging.info(f"\nProcessing hierarchy starting from: {root_page_url}")
-        root_page_id = await self.confluence_service.get_page_id_from_url(root_page_url)
+        if root_page_id is None:
+            root_page_id = await self.confluence_service.get_page_id_from_url(
+                root_page_url
+            )
         if not root_page_id:
             logger.error(f"Could not find page ID for URL: {root_page_url}. Skipping.")
             return [], []
 
-        all_page_ids = [
-            root_page_id
-        ] + await self.confluence_service.get_all_descendants(root_page_id)
-        logging.info(f"Found {len(all_page_ids)} total page(s) to scan.")
-
-        all_tasks = await self._collect_tasks(all_page_ids)
+        # Without watermarks, page bodies come with the listing, so
+        # descendants need no second request each; only the root page is
+        # fetched on its own. Each page's tasks are collected as soon as the
+        # page is discovered, while the rest of the tree is still being listed.
+        watermarks: Optional[Dict[str, SyncWatermark]] = None
+        listing_expand = self.PAGE_EXPAND
+        if self.use_watermarks:
+            watermarks = {}
+            listing_expand = watermark_expand(self.watermark_key)
+        page_tasks = [
+            asyncio.ensure_future(
+                self._collect_page_tasks(root_page_id, watermarks=watermarks)
+            )
+        ]
+        try:
+            async for page in self.confluence_service.iter_descendant_pages(
+                root_page_id,
+                expand=listing_expand,
+                hierarchy_filter=context.hierarchy_filter,
+            ):
+                page_tasks.append(
+                    asyncio.ensure_future(
+                        self._collect_page_tasks(page["id"], page, watermarks)
+                    )
+                )
+            logging.info(f"Found {len(page_tasks)} total page(s) to scan.")
+            task_lists = await asyncio.gather(*page_tasks)
+        except BaseException:
+            for page_task in page_tasks:
+                page_task.cancel()
+            await asyncio.gather(*page_tasks, return_exceptions=True)
+            raise
+        all_tasks = [task for tasks in task_lists for task in tasks]
         if not all_tasks:
             logging.info("No incomplete tasks found across all pages.")
+            await self._save_watermarks(watermarks, [], [])
             return [], []
 
         logging.info(f"Discovered {len(all_tasks)} incomplete tasks. Now processing...")
-        return await self._process_tasks(all_tasks, context)
+        jira_results, confluence_results = await self._process_tasks(all_tasks, context)
+        await self._save_watermarks(watermarks, jira_results, confluence_results)
+        return jira_results, confluence_results
 
-    async def _collect_tasks(self, page_ids: List[str]) -> List[ConfluenceTask]:
-        """Collects all tasks from a list of Confluence page IDs concurrently."""
-        page_detail_coroutines = [
-            self.confluence_service.get_page_by_id(
-                page_id, expand="body.storage,version"
-            )
-            for page_id in page_ids
-        ]
-        all_page_details = await asyncio.gather(*page_detail_coroutines)
+    @staticmethod
+    def _has_body(page: Dict[str, Any]) -> bool:
+        """Checks whether a listed page came with its storage-format body."""
+        return "value" in page.get("body", {}).get("storage", {})
+
+    async def _collect_page_tasks(
+        self,
+        page_id: str,
+        page_details: Optional[Dict[str, Any]] = None,
+        watermarks: Optional[Dict[str, SyncWatermark]] = None,
+    ) -> List[ConfluenceTask]:
+        """
+        Collects the tasks of one page.
 
-        tasks: List[ConfluenceTask] = []
-        for page_details in all_page_details:
-            if page_details:
-                tasks.extend(
-                    await self.confluence_service.get_tasks_from_page(page_details)
+        The page is fetched unless its details (with body) are passed in, e.g.
+        from the discovery listing. If `watermarks` is given, a page still at
+        the version of its sync watermark is skipped before its body is
+        fetched, and the version of every page scanned is recorded in it.
+        """
+        previous: Optional[SyncWatermark] = None
+        if watermarks is not None:
+            if page_details is None:
+                page_details = await self.confluence_service.get_page_by_id(
+                    page_id, expand=watermark_expand(self.watermark_key)
                 )
+                if not page_details:
+                    return []
+            previous = SyncWatermark.from_page(page_details, self.watermark_key)
+            if previous is not None and previous.is_current(page_details):
+                logger.info(f"Page {page_id} is unchanged since its last sync.")
+                return []
+
+        if page_details is None or not self._has_body(page_details):
+            page_details = await self.confluence_service.get_page_by_id(
+                page_id, expand=self.PAGE_EXPAND
+            )
+        if not page_details:
+            return []
+        tasks = await self.confluence_service.get_tasks_from_page(page_details)
+
+        version = page_details.get("version", {}).get("number")
+        if watermarks is not None and isinstance(version, int):
+            watermarks[page_id] = SyncWatermark(
+                version,
+                [task.confluence_task_id for task in tasks],
+                previous.property_version if previous is not None else None,
+            )
         return tasks
 
+    async def _save_watermarks(
+        self,
+        watermarks: Optional[Dict[str, SyncWatermark]],
+        jira_results: List[JiraTaskCreationResult],
+        confluence_results: List[ConfluencePageUpdateResult],
+    ) -> None:
+        """
+        Stores a sync watermark on each scanned page that is fully synced.
+
+        A page is fully synced if none of its tasks failed and, if any Jira
+        issues were created for it, the links were written to the page. That
+        write is the page's next version, so the watermark records it; if the
+        write had to be retried after a conflict, the page has moved on and
+        is simply scanned again next time. Failing to store a watermark only
+        costs that rescan, so errors are logged and ignored.
+        """
+        if not watermarks or deadline_exceeded():
+            return
+        unfinished = {
+            r.confluence_page_id
+            for r in jira_results
+            if not r.success and not r.creation_status_text.startswith("Skipped")
+        }
+        linked = {r.confluence_page_id for r in jira_results if r.success}
+        updated = {r.page_id for r in confluence_results if r.updated}
+
+        saves = []
+        for page_id, watermark in watermarks.items():
+            if page_id in unfinished or (page_id in linked and page_id not in updated):
+                continue
+            if page_id in linked:
+                watermark.page_version += 1
+            saves.append(self._save_watermark(page_id, watermark))
+        await asyncio.gather(*saves)
+
+    async def _save_watermark(self, page_id: str, watermark: SyncWatermark) -> None:
+        """Stores one page's sync watermark, logging any failure."""
+        try:
+            await self.confluence_service.set_content_property(
+                page_id,
+                self.watermark_key,
+                watermark.to_value(),
+                current_version=watermark.property_version,
+            )
+        except Exception as e:
+            logger.warning(f"Could not store sync watermark on page {page_id}: {e}")
+
     async def _process_tasks(
         self, tasks: List[ConfluenceTask], context: SyncTaskContext
     ) -> Tuple[List[JiraTaskCreationResult], List[ConfluencePageUpdateResult]]:
@@ -161,6 +317,7 @@ class SyncTaskService:
 
         jira_results: List[JiraTaskCreationResult] = []
         tasks_to_update: Dict[str, List[Dict[str, Any]]] = {}
+        page_titles: Dict[str, str] = {}
 
         for result in internal_results:
             jira_results.append(
@@ -181,6 +338,9 @@ class SyncTaskService:
                 )
             )
             if result.status_text.startswith("Success") and result.new_jira_task_key:
+                page_titles[result.task_data.confluence_page_id] = (
+                    result.task_data.confluence_page_title
+                )
                 tasks_to_update.setdefault(
                     result.task_data.confluence_page_id, []
                 ).append(
@@ -193,7 +353,7 @@ class SyncTaskService:
         if tasks_to_update:
             logging.info("\nAll Jira tasks processed. Now updating Confluence pages...")
             update_coroutines = [
-                self._update_confluence_page(pid, mappings)
+                self._update_confluence_page(pid, mappings, page_titles[pid])
                 for pid, mappings in tasks_to_update.items()
             ]
             confluence_results = await asyncio.gather(*update_coroutines)
@@ -204,16 +364,22 @@ class SyncTaskService:
         return jira_results, confluence_results
 
     async def _update_confluence_page(
-        self, page_id: str, mappings: List[Dict[str, Any]]
+        self, page_id: str, mappings: List[Dict[str, Any]], page_title: str = "N/A"
     ) -> ConfluencePageUpdateResult:
-        """Updates a single Confluence page and returns its result."""
-        page_title = "N/A"
-        try:
-            page_details = await self.confluence_service.get_page_by_id(page_id)
-            if not page_details:
-                raise ConfluenceApiError(f"Could not find page {page_id} for update.")
-            page_title = page_details.get("title", page_title)
+        """
+        Updates a single Confluence page and returns its result.
 
+        The title is taken from the collected tasks, so the page is not read
+        again just to report it.
+        """
+        if deadline_exceeded():
+            return ConfluencePageUpdateResult(
+                page_id=page_id,
+                page_title=page_title,
+                updated=False,
+                error_message=DEADLINE_EXCEEDED_STATUS,
+            )
+        try:
             success = await self.confluence_service.add_jira_links_to_page(
                 page_id, mappings
             )
@@ -234,7 +400,9 @@ class SyncTaskService:
                 page_id=page_id,
                 page_title=page_title,
                 updated=False,
-                error_message=str(e),
+                error_message=(
+                    DEADLINE_EXCEEDED_STATUS if deadline_exceeded() else str(e)
+                ),
             )
 
     async def _process_single_task(
@@ -253,6 +421,12 @@ class SyncTaskService:
                 status_text="Skipped - Empty Task",
                 request_user=context.request_user,
             )
+        if deadline_exceeded():
+            return SingleTaskResult(
+                task_data=task,
+                status_text=DEADLINE_EXCEEDED_STATUS,
+                request_user=context.request_user,
+            )
 
         parent_wp = await self.issue_finder.find_issue_on_page(
             task.confluence_page_id,
@@ -278,6 +452,8 @@ class SyncTaskService:
                 f"Jira API error for '{task.task_summary}': {e}", exc_info=True
             )
             new_key, status_text = None, f"Failed - JiraApiError: {str(e)}"
+            if deadline_exceeded():
+                status_text = DEADLINE_EXCEEDED_STATUS
 
         return SingleTaskResult(
             task_data=task,
@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Any, Callable, Coroutine, Dict, List, Set, Tuple
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
 
 from src.config import config
 from src.exceptions import InvalidInputError
@@ -14,6 +14,11 @@ from src.models.api_models import (
     UndoSyncTaskRequest,
     UndoSyncTaskResponse,
 )
+from src.utils.deadline import (
+    DEADLINE_EXCEEDED_STATUS,
+    deadline_exceeded,
+    deadline_scope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +39,17 @@ class UndoSyncService:
         self.issue_finder = issue_finder
 
     async def run(
-        self, undo_requests: List[UndoSyncTaskRequest], request_id: str
+        self,
+        undo_requests: List[UndoSyncTaskRequest],
+        request_id: str,
+        deadline_seconds: Optional[float] = None,
     ) -> UndoSyncTaskResponse:
         """
         Main entry point for the undo workflow.
+
+        The run is bounded by `deadline_seconds`, or by
+        config.REQUEST_DEADLINE_SECONDS if not given. Actions that could not be
+        done in time are reported with a "deadline exceeded" error.
         """
         logging.info("\n--- Starting Concurrent Undo Automation Script ---")
 
@@ -50,9 +62,10 @@ class UndoSyncService:
         if not action_coroutines:
             raise InvalidInputError("No valid undo actions could be parsed.")
 
-        gathered_results = await asyncio.gather(
-            *action_coroutines, return_exceptions=True
-        )
+        with deadline_scope(deadline_seconds or config.REQUEST_DEADLINE_SECONDS):
+            gathered_results = await asyncio.gather(
+                *action_coroutines, return_exceptions=True
+            )
         processed_results = self._process_undo_results(gathered_results)
 
         overall_status = self._determine_overall_status(
@@ -64,6 +77,9 @@ class UndoSyncService:
             request_id=request_id,
             overall_status=overall_status,
             results=processed_results,
+            deadline_exceeded=any(
+                r.error_message == DEADLINE_EXCEEDED_STATUS for r in processed_results
+            ),
         )
 
     def _prepare_undo_actions(
@@ -99,6 +115,8 @@ class UndoSyncService:
     async def _transition_jira_task(self, jira_key: str) -> UndoActionResult:
         """Transitions a single Jira task back to the 'undo' status."""
         target_status = config.JIRA_TARGET_STATUSES["undo"]
+        if deadline_exceeded():
+            return self._deadline_exceeded_result("jira_transition", jira_key)
         try:
             logging.info(f"Transitioning '{jira_key}' to '{target_status}'.")
             success = await self.jira_service.transition_issue(jira_key, target_status)
@@ -114,6 +132,8 @@ class UndoSyncService:
                     f"API returned failure for transition to {target_status}"
                 )
         except Exception as e:
+            if deadline_exceeded():
+                return self._deadline_exceeded_result("jira_transition", jira_key)
             error_msg = f"Exception transitioning Jira issue {jira_key}: {e}"
             logger.error(error_msg, exc_info=True)
             return UndoActionResult(
@@ -130,6 +150,8 @@ class UndoSyncService:
         """Rolls back a single Confluence page to a specific version."""
         logging.info(f"Rolling back page {page_id} to version {version}.")
         page_title = "N/A"
+        if deadline_exceeded():
+            return self._deadline_exceeded_result("confluence_rollback", page_id)
         try:
             page = await self.confluence_service.get_page_by_id(
                 page_id, version=version, expand="body.storage"
@@ -155,6 +177,8 @@ class UndoSyncService:
             else:
                 raise Exception("API returned failure for page update.")
         except Exception as e:
+            if deadline_exceeded():
+                return self._deadline_exceeded_result("confluence_rollback", page_id)
             error_msg = f"Exception rolling back page '{page_title}' ({page_id}): {e}"
             logger.error(error_msg, exc_info=True)
             return UndoActionResult(
@@ -165,6 +189,18 @@ class UndoSyncService:
                 error_message=str(e),
             )
 
+    @staticmethod
+    def _deadline_exceeded_result(action_type: str, target_id: str) -> UndoActionResult:
+        """Builds the result for an undo action that was not done in time."""
+        logger.warning(f"Deadline exceeded; {action_type} of {target_id} skipped.")
+        return UndoActionResult(
+            action_type=action_type,
+            target_id=target_id,
+            success=False,
+            status_message="The undo action could not be completed in time.",
+            error_message=DEADLINE_EXCEEDED_STATUS,
+        )
+
     def _parse_undo_requests(
         self, requests_data: List[UndoSyncTaskRequest]
     ) -> Tuple[Set[str], Dict[str, int]]:
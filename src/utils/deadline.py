@@ -0,0 +1,73 @@
+"""
+Carries a request-level deadline through a context variable.
+
+An API request sets a deadline once, at its entry point, with `deadline_scope`.
+Because asyncio tasks copy the current context, every coroutine started for
+that request (including those fanned out with `asyncio.gather`) sees the same
+deadline without it being passed through each call. The `HTTPSHelper` uses it
+to cap per-call timeouts and to stop retrying when a retry could not finish in
+time, and the orchestrators use it to stop starting new work.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Absolute deadline on the time.monotonic() clock, or None for no deadline.
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Status text used in results for work that was not done because time ran out.
+DEADLINE_EXCEEDED_STATUS = "Failed - Deadline exceeded"
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Sets a deadline for the code running inside the `with` block.
+
+    A nested scope can only shorten the deadline of the enclosing scope,
+    never extend it.
+
+    Args:
+        seconds (Optional[float]): Seconds from now until the deadline. None or
+            a non-positive value keeps the enclosing deadline, if any.
+
+    Yields:
+        Optional[float]: The effective absolute deadline.
+    """
+    current = deadline_var.get()
+    deadline = current
+    if seconds is not None and seconds > 0:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if current is None else min(current, candidate)
+    token = deadline_var.set(deadline)
+    try:
+        yield deadline
+    finally:
+        deadline_var.reset(token)
+
+
+def time_remaining() -> Optional[float]:
+    """
+    Returns the seconds left until the current deadline.
+
+    Returns:
+        Optional[float]: The remaining time (negative once it has passed), or
+        None if no deadline is set.
+    """
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_exceeded() -> bool:
+    """
+    Checks whether the current deadline has passed.
+
+    Returns:
+        bool: True if a deadline is set and has passed.
+    """
+    remaining = time_remaining()
+    return remaining is not None and remaining <= 0
@@ -0,0 +1,90 @@
+from src.api.adaptive_concurrency import AIMDController
+from src.api.concurrency_limiter import ConcurrencyLimiter
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_controller(limit: int = 4, **kwargs) -> AIMDController:
+    clock = kwargs.pop("clock", FakeClock())
+    return AIMDController(
+        ConcurrencyLimiter(limit), min_limit=2, max_limit=8, clock=clock, **kwargs
+    )
+
+
+def test_limit_grows_additively_while_latency_is_healthy() -> None:
+    """Tests that the limit grows by one per window of healthy responses."""
+    controller = make_controller(limit=4)
+
+    for _ in range(4):
+        controller.record_success(0.1)
+    assert controller.limiter.limit == 5
+
+    for _ in range(5):
+        controller.record_success(0.1)
+    assert controller.limiter.limit == 6
+    assert controller.increases == 2
+
+
+def test_limit_never_exceeds_max() -> None:
+    """Tests that additive increase stops at the configured maximum."""
+    controller = make_controller(limit=8)
+
+    for _ in range(100):
+        controller.record_success(0.1)
+
+    assert controller.limiter.limit == 8
+
+
+def test_overload_cuts_limit_multiplicatively() -> None:
+    """Tests that a 429/503 signal halves the limit, bounded by the minimum."""
+    clock = FakeClock()
+    controller = make_controller(limit=8, clock=clock)
+
+    controller.record_overload()
+    assert controller.limiter.limit == 4
+
+    clock.now += 5
+    controller.record_overload()
+    clock.now += 5
+    controller.record_overload()
+    assert controller.limiter.limit == 2
+    assert controller.decreases == 2
+
+
+def test_overload_burst_is_rate_limited_by_cooldown() -> None:
+    """Tests that many overload signals within the cooldown cut only once."""
+    controller = make_controller(limit=8, cooldown_seconds=1.0)
+
+    for _ in range(10):
+        controller.record_overload()
+
+    assert controller.limiter.limit == 4
+
+
+def test_rising_latency_cuts_limit() -> None:
+    """Tests that latency well above the baseline is treated as overload."""
+    controller = make_controller(limit=8)
+    controller.record_success(0.1)
+
+    for _ in range(10):
+        controller.record_success(1.0)
+
+    assert controller.limiter.limit < 8
+    assert controller.decreases >= 1
+
+
+def test_initial_limit_is_clamped_into_bounds() -> None:
+    """Tests that the starting limit respects the configured bounds."""
+    controller = make_controller(limit=50)
+
+    assert controller.limiter.limit == 8
+    assert controller.stats()["current_limit"] == 8
+    assert controller.stats()["max_limit"] == 8
@@ -0,0 +1,165 @@
+import gzip
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.api.cassette import (
+    Cassette,
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+from src.api.https_helper import HTTPSHelper
+from src.config import config
+
+
+class FakeUpstream(httpx.AsyncBaseTransport):
+    """A fake upstream that answers with a per-call counter and an unread body."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        body = json.dumps({"path": request.url.path, "call": self.calls}).encode()
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/json", "Set-Cookie": "secret=1"},
+            stream=httpx.ByteStream(body),
+        )
+
+
+async def record(path: str, *requests) -> Cassette:
+    cassette = Cassette(path)
+    transport = RecordingTransport(FakeUpstream(), cassette)
+    async with httpx.AsyncClient(transport=transport) as client:
+        for method, url, body in requests:
+            response = await client.request(method, url, json=body)
+            assert response.status_code == 200
+    cassette.save()
+    return cassette
+
+
+@pytest.mark.asyncio
+async def test_records_exchanges_without_credentials(tmp_path) -> None:
+    """Tests that a recorded cassette holds responses but no secrets."""
+    path = str(tmp_path / "run.jsonl.gz")
+    await record(path, ("GET", "https://jira.test/rest/api/2/issue/A-1", None))
+
+    with gzip.open(path, "rt") as file:
+        raw = file.read()
+    interaction = json.loads(raw)
+    assert interaction["method"] == "GET"
+    assert interaction["url"] == "https://jira.test/rest/api/2/issue/A-1"
+    assert interaction["status"] == 200
+    assert "secret" not in raw
+    assert interaction["elapsed"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_replays_responses_in_recorded_order(tmp_path) -> None:
+    """Tests that repeated requests get their recorded answers in order."""
+    path = str(tmp_path / "run.jsonl.gz")
+    url = "https://wiki.test/rest/api/content/1"
+    await record(path, ("GET", url, None), ("GET", url, None))
+
+    transport = ReplayTransport(Cassette.load(path), timing_scale=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        calls = [(await client.get(url)).json()["call"] for _ in range(3)]
+
+    # Once the recorded answers are used up, the last one is repeated.
+    assert calls == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_replay_matches_on_request_body(tmp_path) -> None:
+    """Tests that requests with different bodies are told apart."""
+    path = str(tmp_path / "run.jsonl.gz")
+    url = "https://jira.test/rest/api/2/issue"
+    await record(path, ("POST", url, {"a": 1}), ("POST", url, {"a": 2}))
+
+    transport = ReplayTransport(Cassette.load(path), timing_scale=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        second = await client.post(url, json={"a": 2})
+        with pytest.raises(CassetteMissError):
+            await client.post(url, json={"a": 3})
+
+    assert second.json()["call"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_scales_recorded_latency(tmp_path) -> None:
+    """Tests that replay sleeps for the recorded latency times the scale."""
+    path = str(tmp_path / "run.jsonl.gz")
+    cassette = await record(path, ("GET", "https://jira.test/x", None))
+    cassette = Cassette.load(path)
+    cassette.interactions[0]["elapsed"] = 0.5
+
+    with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        async with httpx.AsyncClient(
+            transport=ReplayTransport(cassette, timing_scale=2)
+        ) as client:
+            await client.get("https://jira.test/x")
+
+    mock_sleep.assert_awaited_once_with(1.0)
+
+
+@pytest.mark.asyncio
+async def test_https_helper_replays_cassette(tmp_path, monkeypatch) -> None:
+    """Tests a full GET through the helper served from a cassette."""
+    path = str(tmp_path / "run.jsonl.gz")
+    url = f"{config.JIRA_URL}/rest/api/2/issue/A-1"
+    await record(path, ("GET", url, None))
+    monkeypatch.setattr(config, "HTTP_CASSETTE_MODE", "replay")
+    monkeypatch.setattr(config, "HTTP_CASSETTE_PATH", path)
+    monkeypatch.setattr(config, "HTTP_CASSETTE_TIMING_SCALE", 0.0)
+
+    helper = HTTPSHelper()
+    helper.client = helper.build_client()
+    try:
+        result = await helper.get(url)
+        assert result["call"] == 1
+        assert result["path"].endswith("/rest/api/2/issue/A-1")
+    finally:
+        await helper.close()
+
+
+@pytest.mark.asyncio
+async def test_https_helper_saves_recording_on_close(tmp_path, monkeypatch) -> None:
+    """Tests that recording mode wraps the transports and saves on close."""
+    path = tmp_path / "run.jsonl.gz"
+    monkeypatch.setattr(config, "HTTP_CASSETTE_MODE", "record")
+    monkeypatch.setattr(config, "HTTP_CASSETTE_PATH", str(path))
+
+    helper = HTTPSHelper()
+    client = helper.build_client()
+    assert isinstance(client._transport, RecordingTransport)
+    helper.client = client
+    await helper.close()
+
+    assert path.exists()
+
+
+@pytest.mark.asyncio
+async def test_records_bodies_decoded_by_inner_transport(tmp_path) -> None:
+    """Tests that an already decoded body is stored without its coding."""
+
+    class DecodingUpstream(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            return httpx.Response(
+                200,
+                headers={"Content-Encoding": "gzip"},
+                content=gzip.compress(b'{"id": "1"}'),
+            )
+
+    cassette = Cassette(str(tmp_path / "run.jsonl.gz"))
+    transport = RecordingTransport(DecodingUpstream(), cassette)
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("https://wiki.test/x")).json() == {"id": "1"}
+    cassette.save()
+
+    replay = ReplayTransport(Cassette.load(cassette.path), timing_scale=0)
+    async with httpx.AsyncClient(transport=replay) as client:
+        assert (await client.get("https://wiki.test/x")).json() == {"id": "1"}
@@ -0,0 +1,108 @@
+from src.api.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    settings = {
+        "failure_rate_threshold": 0.5,
+        "minimum_requests": 4,
+        "window_seconds": 10.0,
+        "open_seconds": 5.0,
+    }
+    settings.update(kwargs)
+    return CircuitBreaker(clock=clock, **settings)
+
+
+def test_stays_closed_below_minimum_requests() -> None:
+    """Tests that a few failures do not open the circuit on their own."""
+    breaker = make_breaker(FakeClock())
+
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_opens_when_failure_rate_reaches_threshold() -> None:
+    """Tests that the circuit opens once the window's error rate is too high."""
+    breaker = make_breaker(FakeClock())
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.times_opened == 1
+
+
+def test_old_outcomes_leave_the_window() -> None:
+    """Tests that failures older than the window no longer count."""
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 20.0
+    for _ in range(3):
+        breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_requests"] == 4
+
+
+def test_half_open_probe_success_closes_circuit() -> None:
+    """Tests that a successful probe after the open period closes the circuit."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, minimum_requests=1)
+    breaker.record_failure()
+    assert breaker.stats()["retry_in_seconds"] == 5.0
+
+    clock.now = 5.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False  # only one probe at a time
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_half_open_probe_failure_reopens_circuit() -> None:
+    """Tests that a failed probe re-opens the circuit for another period."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, minimum_requests=1)
+    breaker.record_failure()
+
+    clock.now = 5.0
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    clock.now = 9.0
+    assert breaker.allow_request() is False
+
+
+def test_lost_probe_does_not_block_half_open_forever() -> None:
+    """Tests that a probe that never reports back is eventually replaced."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, minimum_requests=1)
+    breaker.record_failure()
+    clock.now = 5.0
+    assert breaker.allow_request() is True
+
+    clock.now = 10.0
+    assert breaker.allow_request() is True
@@ -0,0 +1,97 @@
+import gzip
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.api.compression import (
+    CompressionStats,
+    CompressionTransport,
+    resolve_accept_encoding,
+)
+
+BODY = json.dumps({"body": {"storage": {"value": "<p>text</p>" * 2000}}}).encode()
+
+
+def upstream_response(request: httpx.Request, compress: bool) -> httpx.Response:
+    """Builds an unread response like the network transport returns."""
+    headers = {"Content-Type": "application/json"}
+    content = BODY
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        content = gzip.compress(BODY)
+    return httpx.Response(
+        200, headers=headers, stream=httpx.ByteStream(content), request=request
+    )
+
+
+async def fetch(transport: CompressionTransport, compress: bool) -> httpx.Response:
+    sent = []
+
+    async def handle(self, request):
+        sent.append(request)
+        return upstream_response(request, compress)
+
+    with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", handle):
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://wiki.example.com/rest/api/content/1")
+    response.sent_accept_encoding = sent[0].headers["Accept-Encoding"]
+    return response
+
+
+def test_resolve_accept_encoding() -> None:
+    """Tests that settings resolve to codings that can be decoded here."""
+    with patch(
+        "src.api.compression.available_encodings",
+        return_value=["br", "gzip", "deflate"],
+    ):
+        assert resolve_accept_encoding("auto") == "br, gzip, deflate"
+        assert resolve_accept_encoding(" ZSTD, gzip ") == "gzip"
+        assert resolve_accept_encoding("identity") == "identity"
+        assert resolve_accept_encoding("") == "identity"
+        assert resolve_accept_encoding("zstd") == "identity"
+
+
+@pytest.mark.asyncio
+async def test_transport_negotiates_and_measures_compression() -> None:
+    """Tests that compressed responses are decoded and their sizes counted."""
+    stats = CompressionStats("gzip")
+    transport = CompressionTransport(name="confluence", compression=stats)
+
+    response = await fetch(transport, compress=True)
+
+    assert response.sent_accept_encoding == "gzip"
+    assert response.content == BODY
+    snapshot = stats.stats()
+    assert snapshot["by_encoding"]["gzip"]["responses"] == 1
+    assert snapshot["decoded_bytes"] == len(BODY)
+    assert snapshot["wire_bytes"] == len(gzip.compress(BODY))
+    assert snapshot["saved_ratio"] > 0.9
+
+
+@pytest.mark.asyncio
+async def test_transport_warns_once_about_uncompressed_responses() -> None:
+    """Tests that a large uncompressed response is flagged once."""
+    stats = CompressionStats("gzip, deflate")
+    transport = CompressionTransport(name="confluence", compression=stats)
+
+    with patch("src.api.compression.logger") as mock_logger:
+        await fetch(transport, compress=False)
+        await fetch(transport, compress=False)
+
+    mock_logger.warning.assert_called_once()
+    snapshot = stats.stats()
+    assert snapshot["by_encoding"]["identity"]["responses"] == 2
+    assert snapshot["saved_ratio"] == 0.0
+
+
+def test_stats_without_responses() -> None:
+    """Tests the stats of an upstream that has not answered yet."""
+    assert CompressionStats("identity").stats() == {
+        "accept_encoding": "identity",
+        "by_encoding": {},
+        "wire_bytes": 0,
+        "decoded_bytes": 0,
+        "saved_ratio": 0.0,
+    }
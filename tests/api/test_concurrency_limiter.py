@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.api.concurrency_limiter import ConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrent_holders() -> None:
+    """Tests that no more than `limit` coroutines hold a slot at once."""
+    limiter = ConcurrencyLimiter(2)
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_reports_queue_depth() -> None:
+    """Tests that waiting coroutines are visible as queue depth."""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+
+    waiters = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    assert limiter.stats() == {"limit": 1, "in_flight": 1, "queue_depth": 3}
+
+    limiter.release()
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 2
+
+    for task in waiters:
+        task.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    limiter.release()
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_raising_limit_wakes_waiters() -> None:
+    """Tests that increasing the limit immediately admits queued coroutines."""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.set_limit(2)
+    await asyncio.wait_for(waiter, timeout=1)
+
+    assert limiter.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot() -> None:
+    """Tests that cancelling a waiter keeps the in-flight count consistent."""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release()  # hands the slot to the waiter
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert limiter.in_flight in (0, 1)
+    if waiter.cancelled():
+        assert limiter.in_flight == 0
+
+
+def test_limit_is_at_least_one() -> None:
+    """Tests that a non-positive limit is clamped to one."""
+    assert ConcurrencyLimiter(0).limit == 1
@@ -0,0 +1,78 @@
+import pytest
+
+from src.api.endpoint_classifier import classify_endpoint
+
+
+@pytest.mark.parametrize(
+    "method, url, expected",
+    [
+        (
+            "get",
+            "https://confluence.example.com/rest/api/content/12345?expand=body.storage",
+            "GET content/{id}",
+        ),
+        (
+            "GET",
+            "https://confluence.example.com/wiki/rest/api/content/1/child/page",
+            "GET content/{id}/child/page",
+        ),
+        (
+            "POST",
+            "https://jira.example.com/rest/api/2/issue/PROJ-12/transitions",
+            "POST issue/{key}/transitions",
+        ),
+        ("GET", "https://jira.example.com/rest/api/latest/myself", "GET myself"),
+        ("GET", "https://confluence.example.com/rest/api/user?key=abc", "GET user"),
+    ],
+)
+def test_classify_endpoint(method: str, url: str, expected: str) -> None:
+    """Tests that identifiers are replaced and REST prefixes are dropped."""
+    assert classify_endpoint(method, url) == expected
+
+
+@pytest.mark.parametrize(
+    "method, url, expected",
+    [
+        ("HEAD", "https://confluence.example.com/x/AbC123", "HEAD x/{code}"),
+        ("HEAD", "https://confluence.example.com/wiki/x/Zz9", "HEAD x/{code}"),
+        (
+            "GET",
+            "https://confluence.example.com/display/DEV/Release+Plan",
+            "GET display/{space}/{title}",
+        ),
+        (
+            "GET",
+            "https://confluence.example.com/display/OPS",
+            "GET display/{space}",
+        ),
+        (
+            "GET",
+            "https://example.atlassian.net/wiki/spaces/DEV/pages/123/Release+Plan",
+            "GET spaces/{space}/pages/{id}",
+        ),
+        (
+            "GET",
+            "https://confluence.example.com/pages/viewpage.action?pageId=123",
+            "GET pages/viewpage.action",
+        ),
+        ("GET", "https://confluence.example.com/some/other/path", "GET {page}"),
+    ],
+)
+def test_classify_endpoint_collapses_page_links(
+    method: str, url: str, expected: str
+) -> None:
+    """Tests that paths outside the REST API map to fixed classes."""
+    assert classify_endpoint(method, url) == expected
+
+
+def test_classify_endpoint_bounds_page_link_classes() -> None:
+    """Tests that distinct short links and titles share one class each."""
+    classes = {
+        classify_endpoint("HEAD", f"https://confluence.example.com/x/code{i}")
+        for i in range(100)
+    } | {
+        classify_endpoint("GET", f"https://confluence.example.com/display/S{i}/T{i}")
+        for i in range(100)
+    }
+
+    assert classes == {"HEAD x/{code}", "GET display/{space}/{title}"}
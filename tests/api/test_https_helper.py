@@ -1,3 +1,5 @@
+import asyncio
+import importlib.util
 import logging
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -7,10 +9,17 @@ import pytest
 from src.config import config
 from src.api.https_helper import (
     HTTPSHelper,
+    HTTPXCircuitOpenError,
+    HTTPXDeadlineExceededError,
     HTTPXClientError,
+    HTTPXRateLimitError,
     HTTPXServerError,
     HTTPXCustomError,
+    get_json_decoder,
+    parse_retry_after,
+    stop_before_deadline,
 )
+from src.utils.deadline import deadline_scope
 
 # Configure logging to capture messages during tests
 logging.basicConfig(level=logging.INFO)
@@ -137,9 +146,7 @@ async def test_get_method(https_helper_instance: HTTPSHelper) -> None:
     with patch.object(
         https_helper_instance, "_make_request", new_callable=AsyncMock
     ) as mock_make_request:
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": "test"}
+        mock_response = httpx.Response(200, json={"data": "test"})
         mock_make_request.return_value = mock_response
 
         result = await https_helper_instance.get("http://test.com")
@@ -157,9 +164,7 @@ async def test_post_method(https_helper_instance: HTTPSHelper) -> None:
     with patch.object(
         https_helper_instance, "_make_request", new_callable=AsyncMock
     ) as mock_make_request:
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"id": "123"}
+        mock_response = httpx.Response(201, json={"id": "123"})
         mock_make_request.return_value = mock_response
 
         result = await https_helper_instance.post(
@@ -323,9 +328,7 @@ async def test_get_method_with_headers_and_params(
     with patch.object(
         https_helper_instance, "_make_request", new_callable=AsyncMock
     ) as mock_make_request:
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": "more_test"}
+        mock_response = httpx.Response(200, json={"data": "more_test"})
         mock_make_request.return_value = mock_response
 
         headers = {"X-Custom-Header": "abc"}
@@ -349,9 +352,7 @@ async def test_post_method_with_headers_and_params(
     with patch.object(
         https_helper_instance, "_make_request", new_callable=AsyncMock
     ) as mock_make_request:
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"status": "created"}
+        mock_response = httpx.Response(201, json={"status": "created"})
         mock_make_request.return_value = mock_response
 
         headers = {"Content-Type": "application/json"}
@@ -516,9 +517,7 @@ async def test_put_method_with_200_ok_and_body(https_helper_instance: HTTPSHelpe
     with patch.object(
         https_helper_instance, "_make_request", new_callable=AsyncMock
     ) as mock_make_request:
-        mock_response = AsyncMock(spec=httpx.Response)
-        mock_response.status_code = 200  # Not 204
-        mock_response.json.return_value = {"status": "updated", "id": "123"}
+        mock_response = httpx.Response(200, json={"status": "updated", "id": "123"})
         mock_make_request.return_value = mock_response
 
         result = await https_helper_instance.put("http://test.com/123", json_data={"key": "value"})
@@ -526,3 +525,645 @@ async def test_put_method_with_200_ok_and_body(https_helper_instance: HTTPSHelpe
         # The result should be the JSON body, not an empty dict
         assert result == {"status": "updated", "id": "123"}
         mock_make_request.assert_awaited_once()
+
+
+def test_build_client_uses_http2_when_enabled() -> None:
+    """Tests that build_client passes the HTTP/2 flag through to httpx."""
+    with patch("src.api.https_helper.is_http2_available", return_value=True):
+        helper = HTTPSHelper(verify_ssl=False, http2=True)
+
+    with patch("httpx.AsyncClient") as mock_async_client:
+        helper.build_client()
+
+    assert helper.http2_enabled is True
+    mock_async_client.assert_called_once()
+    assert mock_async_client.call_args.kwargs["http2"] is True
+    assert mock_async_client.call_args.kwargs["verify"] is False
+
+
+def test_http2_falls_back_when_h2_missing() -> None:
+    """Tests that HTTP/2 is disabled with a warning if 'h2' is not installed."""
+    with patch(
+        "src.api.https_helper.is_http2_available", return_value=False
+    ), patch("src.api.https_helper.logger") as mock_logger:
+        helper = HTTPSHelper(http2=True)
+
+    assert helper.http2_enabled is False
+    mock_logger.warning.assert_called_once()
+
+
+def test_connection_stats_counts_pool_connections(
+    https_helper_instance: HTTPSHelper,
+) -> None:
+    """Tests that connection_stats summarises the connections held in the pool."""
+    http2_conn = Mock()
+    http2_conn.info.return_value = "'https://jira', HTTP/2, ACTIVE, Request Count: 7"
+    idle_conn = Mock()
+    idle_conn.info.return_value = "'https://wiki', HTTP/1.1, IDLE, Request Count: 1"
+    client = Mock()
+    client._transport._pool.connections = [http2_conn, idle_conn]
+    client._mounts = {}
+    https_helper_instance._client = client
+
+    stats = https_helper_instance.connection_stats()
+
+    assert stats["connections"] == 2
+    assert stats["http2_connections"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["active_streams"] == 0
+
+
+def test_connection_stats_without_client() -> None:
+    """Tests that connection_stats works before any client has been created."""
+    helper = HTTPSHelper()
+    helper._client = None
+
+    stats = helper.get_metrics()["connections"]
+
+    assert stats["connections"] == 0
+    assert stats["peak_active_streams"] == 0
+
+
+@pytest.mark.asyncio
+async def test_make_request_tracks_peak_streams(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that in-flight requests are counted as active streams."""
+    observed = []
+
+    async def send(request):
+        observed.append(https_helper_instance.connection_stats()["active_streams"])
+        response = Mock(spec=httpx.Response)
+        response.status_code = 200
+        return response
+
+    mock_httpx_client.send.side_effect = send
+    mock_httpx_client.build_request.return_value = httpx.Request("GET", "http://test.com")
+
+    await https_helper_instance._make_request("GET", "http://test.com")
+
+    assert observed == [1]
+    assert https_helper_instance._active_streams == 0
+    assert https_helper_instance._peak_active_streams == 1
+
+
+def test_pool_for_routes_by_host() -> None:
+    """Tests that each upstream host gets its own pool and limiter."""
+    helper = HTTPSHelper(
+        upstream_urls={
+            "jira": "https://jira.example.com/",
+            "confluence": "https://wiki.example.com:8443/",
+        }
+    )
+
+    jira_pool = helper.pool_for("https://jira.example.com/rest/api/2/issue")
+    confluence_pool = helper.pool_for("https://WIKI.example.com:8443/rest/api")
+    other_pool = helper.pool_for("https://elsewhere.example.com/")
+
+    assert jira_pool.name == "jira"
+    assert confluence_pool.name == "confluence"
+    assert other_pool.name == "default"
+    assert jira_pool.limiter is not confluence_pool.limiter
+
+
+def test_build_client_mounts_transport_per_upstream() -> None:
+    """Tests that the client routes each upstream to a dedicated transport."""
+    helper = HTTPSHelper(upstream_urls={"jira": "https://jira.example.com"})
+
+    with patch("httpx.AsyncClient") as mock_async_client:
+        helper.build_client()
+
+    mounts = mock_async_client.call_args.kwargs["mounts"]
+    assert list(mounts) == ["all://jira.example.com"]
+    assert isinstance(mounts["all://jira.example.com"], httpx.AsyncHTTPTransport)
+
+
+@pytest.mark.asyncio
+async def test_slow_upstream_does_not_block_other_upstream(
+    mock_httpx_client: AsyncMock,
+) -> None:
+    """Tests that a saturated upstream does not consume another upstream's slots."""
+    helper = HTTPSHelper(
+        upstream_urls={
+            "jira": "https://jira.example.com",
+            "confluence": "https://wiki.example.com",
+        }
+    )
+    helper._client = mock_httpx_client
+    helper.pool_for("https://wiki.example.com").limiter.set_limit(1)
+    release_confluence = asyncio.Event()
+
+    async def send(request):
+        if "wiki" in str(request.url):
+            await release_confluence.wait()
+        response = Mock(spec=httpx.Response)
+        response.status_code = 200
+        return response
+
+    mock_httpx_client.send.side_effect = send
+    mock_httpx_client.build_request.side_effect = lambda **kw: httpx.Request(
+        kw["method"], kw["url"]
+    )
+
+    slow = [
+        asyncio.create_task(helper._make_request("GET", "https://wiki.example.com/a"))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    jira_response = await asyncio.wait_for(
+        helper._make_request("GET", "https://jira.example.com/myself"), timeout=1
+    )
+
+    metrics = helper.get_metrics()["upstreams"]
+    assert jira_response.status_code == 200
+    assert metrics["confluence"]["in_flight"] == 1
+    assert metrics["confluence"]["queue_depth"] == 1
+    assert metrics["jira"]["in_flight"] == 0
+
+    release_confluence.set()
+    await asyncio.gather(*slow)
+
+
+def test_adaptive_concurrency_enabled_from_config() -> None:
+    """Tests that every upstream pool gets an AIMD controller when enabled."""
+    with patch.object(config, "ADAPTIVE_CONCURRENCY_ENABLED", True):
+        helper = HTTPSHelper(upstream_urls={"jira": "https://jira.example.com"})
+
+    upstreams = helper.get_metrics()["upstreams"]
+    assert "adaptive_concurrency" in upstreams["jira"]
+    assert "adaptive_concurrency" in upstreams["default"]
+
+
+def test_parse_retry_after_seconds_and_date() -> None:
+    """Tests parsing of both Retry-After formats."""
+    seconds = httpx.Response(429, headers={"Retry-After": "7"})
+    http_date = httpx.Response(
+        429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+    garbage = httpx.Response(429, headers={"Retry-After": "soon"})
+
+    assert parse_retry_after(seconds) == 7.0
+    assert parse_retry_after(http_date) == 0.0  # in the past
+    assert parse_retry_after(garbage) is None
+    assert parse_retry_after(httpx.Response(429)) is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_make_request_retries_429_after_retry_after(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that a 429 is retried and pauses the upstream's token bucket."""
+    request = httpx.Request("GET", "http://test.com")
+    throttled = httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+    ok = httpx.Response(200, json={"ok": True}, request=request)
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.side_effect = [throttled, ok]
+
+    response = await https_helper_instance._make_request("GET", "http://test.com")
+
+    assert response.status_code == 200
+    assert mock_httpx_client.send.await_count == 2
+    pool = https_helper_instance.pool_for("http://test.com")
+    assert pool.rate_limiter.throttle_count == 1
+
+
+@pytest.mark.asyncio
+async def test_make_request_caps_oversized_retry_after(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that one huge Retry-After cannot pause the upstream for long."""
+    request = httpx.Request("GET", "http://test.com")
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.return_value = httpx.Response(
+        503, headers={"Retry-After": "3600"}, request=request
+    )
+
+    # The deadline is shorter than the capped wait, so the call is not retried.
+    with deadline_scope(5), pytest.raises(HTTPXServerError):
+        await https_helper_instance._make_request("GET", "http://test.com")
+
+    pool = https_helper_instance.pool_for("http://test.com")
+    assert 0 < pool.rate_limiter.paused_for <= config.THROTTLE_MAX_RETRY_AFTER_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_make_request_raises_rate_limit_error_when_exhausted(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that persistent throttling surfaces as HTTPXRateLimitError."""
+    request = httpx.Request("GET", "http://test.com")
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.return_value = httpx.Response(
+        429, headers={"Retry-After": "0"}, request=request
+    )
+
+    with pytest.raises(HTTPXRateLimitError) as exc_info:
+        await https_helper_instance._make_request("GET", "http://test.com")
+
+    assert isinstance(exc_info.value, HTTPXClientError)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after == 0.0
+    assert mock_httpx_client.send.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_get_coalesces_identical_concurrent_requests(
+    https_helper_instance: HTTPSHelper,
+) -> None:
+    """Tests that identical concurrent GETs share a single upstream request."""
+    release = asyncio.Event()
+    mock_response = httpx.Response(200, json={"key": "JIRA-1"})
+
+    async def slow_request(*args, **kwargs):
+        await release.wait()
+        return mock_response
+
+    with patch.object(
+        https_helper_instance, "_make_request", side_effect=slow_request
+    ) as mock_make_request:
+        headers = {"Authorization": "Bearer token"}
+        tasks = [
+            asyncio.create_task(
+                https_helper_instance.get(
+                    "http://test.com/issue", headers=headers, params={"a": "1"}
+                )
+            )
+            for _ in range(3)
+        ]
+        other_scope = asyncio.create_task(
+            https_helper_instance.get(
+                "http://test.com/issue",
+                headers={"Authorization": "Bearer other"},
+                params={"a": "1"},
+            )
+        )
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, other_scope)
+
+    assert mock_make_request.await_count == 2
+    assert all(result == {"key": "JIRA-1"} for result in results)
+    assert https_helper_instance.get_metrics()["coalescing"]["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_follower_outlives_leader_deadline(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that a coalesced GET is not failed by the leader's shorter deadline."""
+
+    async def send(request, **kwargs):
+        # Behaves like httpx: the call times out after the request's timeout.
+        timeout = request.extensions["test_timeout"]
+        await asyncio.sleep(min(timeout, 0.05))
+        if timeout < 0.05:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"key": "JIRA-1"}, request=request)
+
+    mock_httpx_client.build_request.side_effect = lambda **kwargs: httpx.Request(
+        kwargs["method"],
+        kwargs["url"],
+        extensions={"test_timeout": kwargs["timeout"]},
+    )
+    mock_httpx_client.send.side_effect = send
+
+    async def short_deadline_get():
+        with deadline_scope(0.01):
+            return await https_helper_instance.get("http://test.com/issue")
+
+    leader = asyncio.create_task(short_deadline_get())
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(https_helper_instance.get("http://test.com/issue"))
+
+    with pytest.raises(HTTPXDeadlineExceededError):
+        await leader
+    assert await follower == {"key": "JIRA-1"}
+
+
+@pytest.mark.asyncio
+async def test_get_revalidates_cached_response(monkeypatch) -> None:
+    """Tests that a cached GET is revalidated and served from cache on 304."""
+    monkeypatch.setattr(config, "RESPONSE_CACHE_ENABLED", True)
+    helper = HTTPSHelper()
+    url = "http://test.com/rest/api/content/1"
+    first = httpx.Response(200, json={"id": "1"}, headers={"ETag": '"v1"'})
+    not_modified = httpx.Response(304)
+
+    with patch.object(
+        helper, "_make_request", new_callable=AsyncMock
+    ) as mock_make_request:
+        mock_make_request.side_effect = [first, not_modified]
+        assert await helper.get(url, headers={"Accept": "application/json"}) == {
+            "id": "1"
+        }
+        assert await helper.get(url, headers={"Accept": "application/json"}) == {
+            "id": "1"
+        }
+
+    second_headers = mock_make_request.await_args_list[1].kwargs["headers"]
+    assert second_headers == {"Accept": "application/json", "If-None-Match": '"v1"'}
+    stats = helper.get_metrics()["response_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_get_json_decoder_selection(monkeypatch) -> None:
+    """Tests choosing the JSON decoder, with a fallback if orjson is missing."""
+    import json
+    import sys
+
+    assert get_json_decoder("json") is json.loads
+    if importlib.util.find_spec("orjson") is not None:
+        import orjson
+
+        assert get_json_decoder("auto") is orjson.loads
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert get_json_decoder("auto") is json.loads
+    assert get_json_decoder("orjson") is json.loads
+
+
+def test_decode_json_uses_configured_decoder(
+    https_helper_instance: HTTPSHelper,
+) -> None:
+    """Tests that UTF-8 bodies go through the configured decoder."""
+    decoder = Mock(return_value={"id": "1"})
+    https_helper_instance._json_loads = decoder
+    response = httpx.Response(200, content=b'{"id": "1"}')
+
+    assert https_helper_instance.decode_json(response) == {"id": "1"}
+    decoder.assert_called_once_with(b'{"id": "1"}')
+
+
+def test_decode_json_leaves_other_charsets_to_httpx(
+    https_helper_instance: HTTPSHelper,
+) -> None:
+    """Tests that non-UTF-8 bodies are decoded using their declared charset."""
+    decoder = Mock()
+    https_helper_instance._json_loads = decoder
+    response = httpx.Response(
+        200,
+        content='{"name": "Müller"}'.encode("latin-1"),
+        headers={"Content-Type": "application/json; charset=latin-1"},
+    )
+
+    assert https_helper_instance.decode_json(response) == {"name": "Müller"}
+    decoder.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_put_can_skip_decoding_response(
+    https_helper_instance: HTTPSHelper,
+) -> None:
+    """Tests that decode_response=False returns without reading the body."""
+    with patch.object(
+        https_helper_instance, "_make_request", new_callable=AsyncMock
+    ) as mock_make_request:
+        mock_response = AsyncMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_make_request.return_value = mock_response
+
+        result = await https_helper_instance.put(
+            "http://test.com", json_data={"a": 1}, decode_response=False
+        )
+
+    assert result == {}
+    mock_response.json.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_retrying(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that an open circuit rejects requests without sending them."""
+    pool = https_helper_instance.pool_for(config.CONFLUENCE_URL)
+    pool.enable_circuit_breaker(
+        failure_rate_threshold=0.5,
+        minimum_requests=1,
+        window_seconds=30,
+        open_seconds=30,
+    )
+    pool.record_error()
+
+    with pytest.raises(HTTPXCircuitOpenError):
+        await https_helper_instance._make_request(
+            "GET", f"{config.CONFLUENCE_URL}/rest/api/content/1"
+        )
+
+    mock_httpx_client.send.assert_not_awaited()
+    assert pool.breaker.rejected == 1
+    assert https_helper_instance.circuit_breaker_states()["confluence"] == "open"
+
+
+def test_circuit_breakers_enabled_from_config(monkeypatch) -> None:
+    """Tests that every upstream gets a breaker when enabled in config."""
+    monkeypatch.setattr(config, "CIRCUIT_BREAKER_ENABLED", True)
+    helper = HTTPSHelper()
+
+    assert helper.circuit_breaker_states() == {
+        "jira": "closed",
+        "confluence": "closed",
+        "default": "closed",
+    }
+
+    monkeypatch.setattr(config, "CIRCUIT_BREAKER_ENABLED", False)
+    assert HTTPSHelper().circuit_breaker_states() == {}
+
+
+@pytest.mark.asyncio
+async def test_get_hedges_slow_requests_when_enabled(monkeypatch) -> None:
+    """Tests that a GET slower than its endpoint's p95 is hedged."""
+    monkeypatch.setattr(config, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(config, "HEDGING_MIN_SAMPLES", 1)
+    monkeypatch.setattr(config, "HEDGING_BUDGET_RATIO", 1.0)
+    monkeypatch.setattr(config, "HEDGING_MIN_DELAY_SECONDS", 0.0)
+    helper = HTTPSHelper()
+    url = f"{config.CONFLUENCE_URL}/rest/api/content/42"
+    endpoint = helper.endpoint_class("GET", url)
+    assert endpoint == "confluence GET content/{id}"
+    helper._hedger.record_latency(endpoint, 0.01)
+
+    calls = 0
+
+    async def make_request(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"id": "42"})
+
+    with patch.object(helper, "_send_once", side_effect=make_request):
+        assert await helper.get(url) == {"id": "42"}
+
+    assert calls == 2
+    assert helper.get_metrics()["hedging"]["hedges_won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_hedge_is_a_single_attempt(monkeypatch) -> None:
+    """Tests that a failing hedge is not retried and the original still wins."""
+    monkeypatch.setattr(config, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(config, "HEDGING_MIN_SAMPLES", 1)
+    monkeypatch.setattr(config, "HEDGING_BUDGET_RATIO", 1.0)
+    monkeypatch.setattr(config, "HEDGING_MIN_DELAY_SECONDS", 0.0)
+    helper = HTTPSHelper()
+    url = f"{config.CONFLUENCE_URL}/rest/api/content/42"
+    helper._hedger.record_latency(helper.endpoint_class("GET", url), 0.01)
+
+    async def slow_original(*args, **kwargs):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"id": "42"})
+
+    failing_hedge = AsyncMock(
+        side_effect=HTTPXServerError(
+            "Server error", request=httpx.Request("GET", url)
+        )
+    )
+
+    with patch.object(
+        helper, "_make_request", side_effect=slow_original
+    ), patch.object(helper, "_send_once", failing_hedge):
+        assert await helper.get(url) == {"id": "42"}
+
+    failing_hedge.assert_awaited_once()
+    assert helper.get_metrics()["hedging"]["hedges_sent"] == 1
+    assert helper.get_metrics()["hedging"]["hedges_won"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_latency_includes_local_queue_wait(monkeypatch) -> None:
+    """Tests that hedge delays are based on latency including the queue wait."""
+    monkeypatch.setattr(config, "HEDGING_ENABLED", True)
+    helper = HTTPSHelper()
+    url = f"{config.CONFLUENCE_URL}/rest/api/content/42"
+    request = httpx.Request("GET", url)
+    client = AsyncMock()
+    client.build_request = Mock(return_value=request)
+    client.send.return_value = httpx.Response(200, request=request)
+    helper.client = client
+    # The request waits for the paused token bucket before it is sent.
+    helper.pool_for(url).rate_limiter.throttle(0.05)
+    await helper._make_request("GET", url)
+
+    tracker = helper._hedger._trackers[helper.endpoint_class("GET", url)]
+    assert tracker.percentile(0.5) >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_make_request_caps_timeout_by_deadline(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that the per-call timeout never outlives the request deadline."""
+    request = httpx.Request("GET", "http://test.com")
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.return_value = httpx.Response(200, request=request)
+
+    with deadline_scope(2):
+        await https_helper_instance._make_request("GET", "http://test.com", timeout=30)
+
+    timeout = mock_httpx_client.build_request.call_args.kwargs["timeout"]
+    assert 0 < timeout <= 2
+
+
+@pytest.mark.asyncio
+async def test_make_request_not_sent_after_deadline(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that no request is sent, or retried, once the deadline passed."""
+    with deadline_scope(0.001):
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPXDeadlineExceededError, match="Deadline exceeded"):
+            await https_helper_instance._make_request("GET", "http://test.com")
+
+    mock_httpx_client.build_request.assert_not_called()
+    mock_httpx_client.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_make_request_stops_retrying_when_deadline_too_close(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that a retry whose backoff outlasts the deadline is not made."""
+    request = httpx.Request("GET", "http://test.com")
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.return_value = httpx.Response(500, request=request)
+
+    # The first backoff is at least one second, longer than the deadline.
+    with deadline_scope(0.5):
+        with pytest.raises(HTTPXServerError):
+            await https_helper_instance._make_request("GET", "http://test.com")
+
+    assert mock_httpx_client.send.call_count == 1
+
+
+def test_stop_before_deadline_without_deadline() -> None:
+    """Tests that the stop condition never fires without a deadline."""
+    retry_state = Mock(upcoming_sleep=100.0)
+    assert stop_before_deadline()(retry_state) is False
+
+
+@pytest.mark.asyncio
+async def test_make_request_stops_retrying_when_retry_budget_spent(
+    https_helper_instance: HTTPSHelper, mock_httpx_client: AsyncMock
+) -> None:
+    """Tests that retries stop once the upstream's retry budget is spent."""
+    url = f"{config.JIRA_URL}/rest/api/2/issue/TEST-1"
+    request = httpx.Request("GET", url)
+    mock_httpx_client.build_request.return_value = request
+    mock_httpx_client.send.return_value = httpx.Response(502, request=request)
+    pool = https_helper_instance.pool_for(url)
+    pool.enable_retry_budget(ratio=0, min_retries_per_second=0.1, window_seconds=10)
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        with pytest.raises(HTTPXServerError):
+            await https_helper_instance._make_request("GET", url)
+
+    # One retry from the budget's allowance, then no more.
+    assert mock_httpx_client.send.call_count == 2
+    assert pool.stats()["retry_budget"]["retries_rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections_per_upstream(mock_httpx_client: AsyncMock) -> None:
+    """Tests that warm-up sends capped concurrent requests to each upstream."""
+    helper = HTTPSHelper(
+        upstream_urls={
+            "jira": "https://jira.example.com",
+            "confluence": "https://wiki.example.com",
+        }
+    )
+    helper._client = mock_httpx_client
+    helper.pool_for("https://wiki.example.com").max_connections = 2
+
+    async def head(url, **kwargs):
+        if "jira" in url:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(302)
+
+    mock_httpx_client.head = AsyncMock(side_effect=head)
+
+    warmed = await helper.warm_up(connections=3)
+
+    assert warmed == {"jira": 0, "confluence": 2}
+    assert mock_httpx_client.head.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_make_request_records_timings_per_endpoint_class() -> None:
+    """Tests that real sends are timed per endpoint class and phase."""
+    helper = HTTPSHelper(upstream_urls={"jira": "https://jira.example.com"})
+    helper.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    )
+
+    await helper._make_request("GET", "https://jira.example.com/rest/api/2/issue/AB-1")
+    await helper._make_request("GET", "https://jira.example.com/rest/api/2/issue/AB-2")
+
+    timings = helper.request_timings()
+    assert list(timings) == ["jira GET issue/{key}"]
+    assert timings["jira GET issue/{key}"]["total"]["count"] == 2
+    assert timings["jira GET issue/{key}"]["queue_wait"]["count"] == 2
+    assert "timings" in helper.get_metrics()
+    await helper.close()
@@ -0,0 +1,84 @@
+import pytest
+
+from src.api.rate_limiter import TokenBucket
+
+
+class FakeTime:
+    """A fake clock whose sleep advances time instantly."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_bucket(fake: FakeTime, rate: float = 0.0, burst: int = 1) -> TokenBucket:
+    return TokenBucket(rate, burst, clock=fake.clock, sleep=fake.sleep)
+
+
+@pytest.mark.asyncio
+async def test_unlimited_bucket_does_not_wait() -> None:
+    """Tests that a bucket without a rate never delays callers."""
+    fake = FakeTime()
+    bucket = make_bucket(fake)
+
+    for _ in range(100):
+        await bucket.acquire()
+
+    assert fake.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_out_requests_after_burst() -> None:
+    """Tests that requests beyond the burst are spaced at the configured rate."""
+    fake = FakeTime()
+    bucket = make_bucket(fake, rate=2.0, burst=2)
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert fake.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+@pytest.mark.asyncio
+async def test_throttle_pauses_every_caller() -> None:
+    """Tests that a throttle response makes all callers wait for Retry-After."""
+    fake = FakeTime()
+    bucket = make_bucket(fake)
+
+    bucket.throttle(3.0)
+    await bucket.acquire()
+
+    assert fake.sleeps == [pytest.approx(3.0)]
+    assert bucket.stats()["throttle_count"] == 1
+    assert bucket.paused_for == 0
+
+
+def test_throttle_halves_rate_and_success_recovers_it() -> None:
+    """Tests that a configured rate is cut on throttling and then recovers."""
+    fake = FakeTime()
+    bucket = make_bucket(fake, rate=10.0, burst=5)
+
+    bucket.throttle(0)
+    assert bucket.rate == 5.0
+
+    for _ in range(100):
+        bucket.record_success()
+    assert bucket.rate == 10.0
+
+
+def test_throttle_never_cuts_below_minimum_rate() -> None:
+    """Tests that repeated throttling keeps a minimum request rate."""
+    fake = FakeTime()
+    bucket = make_bucket(fake, rate=10.0)
+
+    for _ in range(20):
+        bucket.throttle(0)
+
+    assert bucket.rate == pytest.approx(1.0)
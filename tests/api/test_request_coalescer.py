@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from src.api.request_coalescer import RequestCoalescer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_fetch() -> None:
+    """Tests that overlapping calls with the same key run the fetch once."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> dict:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": "1", "items": [1, 2]}
+
+    tasks = [asyncio.create_task(coalescer.run("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert all(result == {"id": "1", "items": [1, 2]} for result in results)
+    assert coalescer.stats() == {
+        "hits": 4,
+        "misses": 1,
+        "hit_ratio": 0.8,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_results_are_independent_copies() -> None:
+    """Tests that one caller mutating its result does not affect the others."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+
+    async def fetch() -> dict:
+        await release.wait()
+        return {"items": []}
+
+    leader = asyncio.create_task(coalescer.run("key", fetch))
+    follower = asyncio.create_task(coalescer.run("key", fetch))
+    await asyncio.sleep(0)
+    release.set()
+    leader_result = await leader
+    leader_result["items"].append("mutated")
+
+    assert await follower == {"items": []}
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced() -> None:
+    """Tests that nothing is cached once a call has completed."""
+    coalescer = RequestCoalescer()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await coalescer.run("key", fetch) == 1
+    assert await coalescer.run("key", fetch) == 2
+    assert coalescer.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced() -> None:
+    """Tests that calls with different keys each run their own fetch."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+
+    async def fetch() -> str:
+        await release.wait()
+        return "ok"
+
+    tasks = [asyncio.create_task(coalescer.run(key, fetch)) for key in ("a", "b")]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert coalescer.misses == 2
+    assert coalescer.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_leader_exception_is_shared_with_followers() -> None:
+    """Tests that followers receive the exception raised by the leader."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+
+    async def fetch() -> None:
+        await release.wait()
+        raise ValueError("upstream failed")
+
+    tasks = [asyncio.create_task(coalescer.run("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert coalescer.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_follower_retries_when_leader_is_cancelled() -> None:
+    """Tests that cancelling the leader does not fail its followers."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "ok"
+
+    leader = asyncio.create_task(coalescer.run("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(coalescer.run("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "ok"
+    assert calls == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_follower_retries_on_leader_specific_error() -> None:
+    """Tests that followers retry instead of sharing a `retry_on` exception."""
+    coalescer = RequestCoalescer()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        if calls == 1:
+            raise TimeoutError("leader's deadline")
+        return "ok"
+
+    leader = asyncio.create_task(coalescer.run("key", fetch, (TimeoutError,)))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(coalescer.run("key", fetch, (TimeoutError,)))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(TimeoutError):
+        await leader
+    assert await follower == "ok"
+    assert calls == 2
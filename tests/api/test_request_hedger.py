@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from src.api.request_hedger import LatencyTracker, RequestHedger
+
+ENDPOINT = "confluence GET content/{id}"
+
+
+def warmed_up_hedger(latency: float = 0.01, **kwargs) -> RequestHedger:
+    settings = {"min_samples": 5, "min_delay": 0.0, "budget_ratio": 1.0}
+    settings.update(kwargs)
+    hedger = RequestHedger(**settings)
+    for _ in range(5):
+        hedger.record_latency(ENDPOINT, latency)
+    return hedger
+
+
+def test_latency_tracker_percentile() -> None:
+    """Tests the percentile over a bounded window of recent samples."""
+    tracker = LatencyTracker(max_samples=100)
+    assert tracker.percentile(0.95) is None
+
+    for i in range(1, 201):
+        tracker.record(float(i))
+
+    assert len(tracker) == 100
+    assert tracker.percentile(0.95) == 196.0
+    assert tracker.percentile(0.5) == 151.0
+
+
+def test_no_hedging_until_enough_samples() -> None:
+    """Tests that endpoint classes with few samples are not hedged."""
+    hedger = RequestHedger(min_samples=3)
+    hedger.record_latency(ENDPOINT, 0.2)
+
+    assert hedger.hedge_delay(ENDPOINT) is None
+    assert hedger.hedge_delay("jira GET myself") is None
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged() -> None:
+    """Tests that a request finishing before the hedge delay runs once."""
+    hedger = warmed_up_hedger(latency=1.0)
+    calls = 0
+
+    async def send() -> str:
+        nonlocal calls
+        calls += 1
+        return "fast"
+
+    assert await hedger.run(ENDPOINT, send) == "fast"
+    assert calls == 1
+    assert hedger.hedges_sent == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_hedge_wins() -> None:
+    """Tests that a stalled request is raced by a hedge that wins."""
+    hedger = warmed_up_hedger()
+    stalled = asyncio.Event()
+    attempts = []
+
+    async def send() -> str:
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stalled.set()
+                raise
+            return "slow"
+        return "hedge"
+
+    assert await hedger.run(ENDPOINT, send) == "hedge"
+    assert hedger.hedges_sent == 1
+    assert hedger.hedges_won == 1
+    await asyncio.wait_for(stalled.wait(), 1)  # the original was cancelled
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_limits_extra_requests() -> None:
+    """Tests that hedges are skipped once the budget is spent."""
+    hedger = warmed_up_hedger(budget_ratio=0.5)
+
+    async def send() -> str:
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    for _ in range(4):
+        await hedger.run(ENDPOINT, send)
+
+    assert hedger.hedges_sent == 2
+    assert hedger.budget_exhausted == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_original_falls_back_to_hedge() -> None:
+    """Tests that a failing original does not fail the call if the hedge works."""
+    hedger = warmed_up_hedger()
+    attempts = 0
+
+    async def send() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            await asyncio.sleep(0.05)
+            raise ValueError("original failed")
+        await asyncio.sleep(0.1)
+        return "hedge"
+
+    assert await hedger.run(ENDPOINT, send) == "hedge"
+
+
+@pytest.mark.asyncio
+async def test_both_failing_raises_original_error() -> None:
+    """Tests that the original's error is raised if both calls fail."""
+    hedger = warmed_up_hedger()
+    attempts = 0
+
+    async def send() -> str:
+        nonlocal attempts
+        attempts += 1
+        attempt = attempts
+        await asyncio.sleep(0.05)
+        raise ValueError(f"attempt {attempt}")
+
+    with pytest.raises(ValueError, match="attempt 1"):
+        await hedger.run(ENDPOINT, send)
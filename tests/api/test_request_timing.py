@@ -0,0 +1,88 @@
+"""Tests for the per-endpoint request timing histograms."""
+
+import pytest
+
+from src.api.request_timing import LatencyHistogram, RequestTimings, RequestTrace
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram_summarises_samples() -> None:
+    """Tests counts, sums and bucket-based percentile estimates."""
+    histogram = LatencyHistogram()
+    for _ in range(9):
+        histogram.record(0.02)
+    histogram.record(3.0)
+
+    stats = histogram.stats()
+
+    assert stats["count"] == 10
+    assert stats["sum_seconds"] == pytest.approx(3.18)
+    assert stats["max_seconds"] == 3.0
+    assert stats["p50_seconds"] == 0.025
+    assert stats["p99_seconds"] == 3.0
+    assert stats["buckets"]["0.025"] == 9
+    assert stats["buckets"]["+Inf"] == 10
+
+
+def test_empty_histogram_has_no_percentiles() -> None:
+    """Tests that an empty histogram reports no percentile."""
+    assert LatencyHistogram().percentile(0.95) is None
+
+
+@pytest.mark.asyncio
+async def test_trace_collects_connect_and_headers_time() -> None:
+    """Tests that httpcore trace events are turned into phase timestamps."""
+    clock = FakeClock()
+    trace = RequestTrace(clock=clock)
+
+    await trace("connection.connect_tcp.started", {})
+    clock.now = 0.03
+    await trace("connection.connect_tcp.complete", {})
+    await trace("connection.start_tls.started", {})
+    clock.now = 0.05
+    await trace("connection.start_tls.complete", {})
+    clock.now = 0.2
+    await trace("http11.receive_response_headers.complete", {})
+
+    assert trace.connect == pytest.approx(0.05)
+    assert trace.headers_received_at == 0.2
+
+
+@pytest.mark.asyncio
+async def test_trace_without_connect_reuses_connection() -> None:
+    """Tests that a request on a pooled connection has no connect phase."""
+    trace = RequestTrace(clock=FakeClock())
+    await trace("http2.receive_response_headers.complete", {})
+
+    assert trace.connect is None
+    assert trace.headers_received_at == 0.0
+
+
+@pytest.mark.asyncio
+async def test_timings_record_phases_and_order_by_total_time() -> None:
+    """Tests that endpoints are reported slowest in total first."""
+    timings = RequestTimings()
+    clock = FakeClock()
+    trace = RequestTrace(clock=clock)
+    clock.now = 1.4
+    await trace("http11.receive_response_headers.complete", {})
+
+    timings.record_request("jira GET search", 1.0, 1.1, 1.5, trace)
+    timings.record_request("confluence GET content/{id}", 0.0, 0.5, 3.0)
+
+    stats = timings.stats()
+
+    assert list(stats) == ["confluence GET content/{id}", "jira GET search"]
+    assert set(stats["jira GET search"]) == {"queue_wait", "ttfb", "total"}
+    assert stats["jira GET search"]["ttfb"]["sum_seconds"] == pytest.approx(0.3)
+    assert set(stats["confluence GET content/{id}"]) == {"queue_wait", "total"}
+    assert list(timings.stats(top=1)) == ["confluence GET content/{id}"]
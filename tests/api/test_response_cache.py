@@ -0,0 +1,66 @@
+import httpx
+
+from src.api.response_cache import ResponseCache
+
+
+def make_response(body: bytes, **headers: str) -> httpx.Response:
+    return httpx.Response(200, content=body, headers=headers)
+
+
+def test_store_requires_a_validator() -> None:
+    """Tests that responses without ETag or Last-Modified are not cached."""
+    cache = ResponseCache(max_bytes=1024)
+
+    assert cache.store("plain", make_response(b"{}")) is False
+    assert cache.store("etag", make_response(b"{}", ETag='"v1"')) is True
+    assert len(cache) == 1
+
+
+def test_conditional_headers_echo_validators() -> None:
+    """Tests that a cached entry produces the matching conditional headers."""
+    cache = ResponseCache(max_bytes=1024)
+    cache.store(
+        "key",
+        make_response(
+            b"{}", ETag='"v1"', **{"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        ),
+    )
+
+    assert cache.get("key").conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert cache.get("missing") is None
+
+
+def test_lru_eviction_within_byte_budget() -> None:
+    """Tests that the least recently used entries are evicted first."""
+    cache = ResponseCache(max_bytes=20)
+    cache.store("a", make_response(b"a" * 8, ETag="a"))
+    cache.store("b", make_response(b"b" * 8, ETag="b"))
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.store("c", make_response(b"c" * 8, ETag="c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size == 16
+    assert cache.evictions == 1
+
+
+def test_oversized_response_is_not_cached() -> None:
+    """Tests that a body larger than the whole budget is skipped."""
+    cache = ResponseCache(max_bytes=4)
+
+    assert cache.store("big", make_response(b"12345", ETag="x")) is False
+    assert cache.size == 0
+
+
+def test_replacing_an_entry_updates_size() -> None:
+    """Tests that re-storing a key replaces the old entry's size."""
+    cache = ResponseCache(max_bytes=100)
+    cache.store("key", make_response(b"1234", ETag="v1"))
+    cache.store("key", make_response(b"12", ETag="v2"))
+
+    assert cache.size == 2
+    assert cache.get("key").etag == "v2"
@@ -0,0 +1,75 @@
+from src.api.retry_budget import RetryBudget
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_min_allowance_permits_retries_without_traffic() -> None:
+    """Tests that a quiet upstream can still retry the occasional failure."""
+    budget = RetryBudget(
+        ratio=0.2, min_retries_per_second=0.5, window_seconds=4, clock=FakeClock()
+    )
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+    assert budget.retries_allowed == 2
+    assert budget.retries_rejected == 1
+
+
+def test_successes_replenish_the_budget() -> None:
+    """Tests that retries are limited to a share of recent successes."""
+    budget = RetryBudget(
+        ratio=0.2, min_retries_per_second=0, window_seconds=10, clock=FakeClock()
+    )
+    assert budget.try_spend() is False
+
+    for _ in range(10):
+        budget.record_success()
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+
+def test_window_expires_successes_and_retries() -> None:
+    """Tests that only events within the sliding window count."""
+    clock = FakeClock()
+    budget = RetryBudget(
+        ratio=0.5, min_retries_per_second=0, window_seconds=10, clock=clock
+    )
+    for _ in range(2):
+        budget.record_success()
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+    clock.now = 11.0
+    assert budget.limit == 0
+    budget.record_success()
+    budget.record_success()
+    assert budget.try_spend() is True
+
+
+def test_stats_reports_window_usage() -> None:
+    """Tests the counters reported for metrics."""
+    budget = RetryBudget(
+        ratio=0.2, min_retries_per_second=0.1, window_seconds=10, clock=FakeClock()
+    )
+    for _ in range(5):
+        budget.record_success()
+    budget.try_spend()
+    budget.try_spend()
+    budget.try_spend()
+
+    assert budget.stats() == {
+        "window_successes": 5,
+        "window_retries": 2,
+        "retry_limit": 2.0,
+        "retries_allowed": 2,
+        "retries_rejected": 1,
+    }
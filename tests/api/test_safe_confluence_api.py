@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import re
 from unittest.mock import AsyncMock, call, patch, MagicMock
 
 import httpx
@@ -6,10 +8,16 @@ import pytest
 from bs4 import BeautifulSoup
 import uuid
 
-from src.api.https_helper import HTTPSHelper, HTTPXClientError, HTTPXCustomError
+from src.api.https_helper import (
+    HTTPSHelper,
+    HTTPXCircuitOpenError,
+    HTTPXClientError,
+    HTTPXCustomError,
+)
 from src.api.safe_confluence_api import SafeConfluenceAPI
 from src.config import config
 from src.exceptions import ConfluenceApiError
+from src.models.data_models import HierarchyFilter
 
 # Configure logging to capture messages during tests
 logging.basicConfig(level=logging.INFO)
@@ -154,6 +162,7 @@ async def test_update_page_success(safe_confluence_api, mock_https_helper):
     assert success is True
     assert mock_https_helper.get.call_count == 1
     mock_https_helper.put.assert_awaited_once()
+    assert mock_https_helper.put.await_args.kwargs["decode_response"] is False
 
 
 @pytest.mark.asyncio
@@ -169,6 +178,39 @@ async def test_create_page_success(safe_confluence_api, mock_https_helper):
     mock_https_helper.post.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_set_content_property_creates_property(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a new content property is created with a POST."""
+    result = await safe_confluence_api.set_content_property("1", "wm", {"version": 3})
+
+    assert result is True
+    mock_https_helper.post.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/1/property",
+        headers=safe_confluence_api.headers,
+        json_data={"key": "wm", "value": {"version": 3}},
+        decode_response=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_content_property_updates_next_version(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that an existing content property is replaced by its next version."""
+    await safe_confluence_api.set_content_property(
+        "1", "wm", {"version": 3}, current_version=4
+    )
+
+    mock_https_helper.put.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/1/property/wm",
+        headers=safe_confluence_api.headers,
+        json_data={"key": "wm", "value": {"version": 3}, "version": {"number": 5}},
+        decode_response=False,
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_username_success(
     safe_confluence_api, mock_https_helper
@@ -206,6 +248,7 @@ async def test_get_user_by_key_success(
 @pytest.mark.asyncio
 async def test_get_all_descendants_success(safe_confluence_api, mock_https_helper):
     """Tests successful retrieval of all descendants."""
+    safe_confluence_api.descendant_strategy = "bfs"
     mock_https_helper.get.side_effect = [
         # First call for page_id "1" (root)
         {
@@ -229,6 +272,260 @@ async def test_get_all_descendants_success(safe_confluence_api, mock_https_helpe
     assert mock_https_helper.get.call_count == 4
 
 
+@pytest.mark.asyncio
+async def test_get_all_descendants_uses_descendant_endpoint(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that the descendant endpoint is paged through in parallel."""
+    pages = {
+        0: {"results": [{"id": "2"}, {"id": "3"}], "limit": 2, "size": 2},
+        2: {"results": [{"id": "4"}, {"id": "5"}], "limit": 2, "size": 2},
+        4: {"results": [{"id": "6"}], "limit": 2, "size": 1},
+    }
+
+    async def get(url, headers=None, params=None):
+        return pages.get(int(params["start"]), {"results": [], "limit": 2})
+
+    mock_https_helper.get.side_effect = get
+
+    descendant_ids = await safe_confluence_api.get_all_descendants("1")
+
+    assert descendant_ids == ["2", "3", "4", "5", "6"]
+    first_call = mock_https_helper.get.await_args_list[0]
+    assert first_call.args[0] == (
+        "http://confluence.example.com/rest/api/content/1/descendant/page"
+    )
+    assert first_call.kwargs["params"] == {"start": "0", "limit": "200"}
+    # After the first page, one window of pages is requested in parallel.
+    starts = [
+        int(c.kwargs["params"]["start"]) for c in mock_https_helper.get.await_args_list
+    ]
+    assert starts == [0] + [2 + 2 * i for i in range(config.CONFLUENCE_DESCENDANT_CONCURRENCY)]
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendants_stops_at_total_size(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that no page beyond the reported totalSize is requested."""
+    mock_https_helper.get.side_effect = [
+        {"results": [{"id": "2"}, {"id": "3"}], "limit": 2, "totalSize": 4},
+        {"results": [{"id": "4"}, {"id": "5"}], "limit": 2, "totalSize": 4},
+    ]
+
+    descendant_ids = await safe_confluence_api.get_all_descendants("1")
+
+    assert descendant_ids == ["2", "3", "4", "5"]
+    assert mock_https_helper.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendants_falls_back_to_cql_then_bfs(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests the fallback order when bulk discovery is not available."""
+    not_found = HTTPXClientError("Not found")
+
+    async def get(url, headers=None, params=None):
+        if url.endswith("/descendant/page"):
+            raise not_found
+        if url.endswith("/content/search"):
+            assert params["cql"] == "ancestor = 1 and type = page"
+            raise not_found
+        if "/content/1/child/page" in url:
+            return {"results": [{"id": "2"}]}
+        return {"results": []}
+
+    mock_https_helper.get.side_effect = get
+
+    descendant_ids = await safe_confluence_api.get_all_descendants("1")
+
+    assert descendant_ids == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendants_with_cql_strategy(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that the 'cql' strategy lists descendants with a CQL search."""
+    safe_confluence_api.descendant_strategy = "cql"
+    mock_https_helper.get.return_value = {"results": [{"id": "7"}, {"id": "8"}]}
+
+    descendant_ids = await safe_confluence_api.get_all_descendants("1")
+
+    assert descendant_ids == ["7", "8"]
+    mock_https_helper.get.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/search",
+        headers=safe_confluence_api.headers,
+        params={"cql": "ancestor = 1 and type = page", "start": "0", "limit": "200"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendant_pages_expands_listing(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that the expansion is requested with the bulk listing."""
+    page = {"id": "2", "body": {"storage": {"value": "<p/>"}}}
+    mock_https_helper.get.return_value = {"results": [page, page]}
+
+    pages = await safe_confluence_api.get_all_descendant_pages(
+        "1", expand="body.storage,version"
+    )
+
+    assert pages == [page]
+    mock_https_helper.get.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/1/descendant/page",
+        headers=safe_confluence_api.headers,
+        params={"expand": "body.storage,version", "start": "0", "limit": "200"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendant_pages_expands_bfs_listing(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that the breadth-first walk expands each child listing."""
+    safe_confluence_api.descendant_strategy = "bfs"
+    mock_https_helper.get.side_effect = [{"results": [{"id": "2"}]}, {"results": []}]
+
+    pages = await safe_confluence_api.get_all_descendant_pages("1", expand="version")
+
+    assert pages == [{"id": "2"}]
+    assert mock_https_helper.get.await_args_list[0].args[0] == (
+        "http://confluence.example.com/rest/api/content/1/child/page"
+        "?start=0&limit=50&expand=version"
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_descendant_pages_yields_before_walk_finishes(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that pages are yielded while deeper levels are still listed."""
+    safe_confluence_api.descendant_strategy = "bfs"
+    release = asyncio.Event()
+
+    async def get(url, headers=None, params=None):
+        if "/content/1/child/page" in url:
+            return {"results": [{"id": "2"}]} if "start=0" in url else {"results": []}
+        if "/content/2/child/page" in url:
+            await release.wait()
+        return {"results": []}
+
+    mock_https_helper.get.side_effect = get
+
+    pages = safe_confluence_api.iter_descendant_pages("1")
+    first = await asyncio.wait_for(pages.__anext__(), timeout=1)
+
+    assert first == {"id": "2"}
+    assert not release.is_set()
+    release.set()
+    assert [page async for page in pages] == []
+
+
+@pytest.mark.asyncio
+async def test_iter_descendant_pages_continues_failed_strategy_without_duplicates(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a bulk listing failing part way is completed by the next one."""
+
+    async def get(url, headers=None, params=None):
+        if url.endswith("/descendant/page"):
+            if params["start"] == "0":
+                return {"results": [{"id": "2"}, {"id": "3"}], "limit": 2, "size": 2}
+            raise HTTPXClientError("Not found")
+        if url.endswith("/content/search"):
+            return {"results": [{"id": "2"}, {"id": "3"}, {"id": "4"}]}
+        return {"results": []}
+
+    mock_https_helper.get.side_effect = get
+
+    pages = [page async for page in safe_confluence_api.iter_descendant_pages("1")]
+
+    assert [page["id"] for page in pages] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_iter_descendant_pages_prunes_walk(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that excluded subtrees and pages beyond max_depth are not listed."""
+    children = {
+        "1": [
+            {"id": "2", "title": "Archive 2020"},
+            {
+                "id": "3",
+                "title": "Sprint",
+                "metadata": {"labels": {"results": [{"name": "old"}]}},
+            },
+            {"id": "4", "title": "Design"},
+        ],
+        "4": [{"id": "5", "title": "Details"}],
+    }
+    listed = []
+
+    async def get(url, headers=None, params=None):
+        page_id = re.search(r"/content/(\d+)/child/page", url).group(1)
+        listed.append(page_id)
+        return {"results": children.get(page_id, []) if "start=0" in url else []}
+
+    mock_https_helper.get.side_effect = get
+    hierarchy_filter = HierarchyFilter(
+        max_depth=2, exclude_labels=["old"], exclude_title_patterns=["^Archive"]
+    )
+
+    pages = [
+        page
+        async for page in safe_confluence_api.iter_descendant_pages(
+            "1", expand="version", hierarchy_filter=hierarchy_filter
+        )
+    ]
+
+    assert [page["id"] for page in pages] == ["4", "5"]
+    # Pruned pages and pages at the depth limit are never listed.
+    assert sorted(set(listed)) == ["1", "4"]
+    assert "expand=version,metadata.labels" in (
+        mock_https_helper.get.await_args_list[0].args[0]
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_descendant_pages_pushes_filter_into_cql(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that excluded IDs and required labels become part of the search."""
+    mock_https_helper.get.return_value = {
+        "results": [
+            {"id": "7", "metadata": {"labels": {"results": [{"name": "team"}]}}},
+            {"id": "8"},
+        ]
+    }
+    hierarchy_filter = HierarchyFilter(
+        exclude_page_ids=["5", "6"], include_labels=["team"]
+    )
+
+    pages = [
+        page
+        async for page in safe_confluence_api.iter_descendant_pages(
+            "1", hierarchy_filter=hierarchy_filter
+        )
+    ]
+
+    assert [page["id"] for page in pages] == ["7"]
+    mock_https_helper.get.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/search",
+        headers=safe_confluence_api.headers,
+        params={
+            "cql": 'ancestor = 1 and type = page and id not in (5, 6) and '
+            'ancestor not in (5, 6) and label in ("team")',
+            "expand": "metadata.labels",
+            "start": "0",
+            "limit": "200",
+        },
+    )
+
+
 @pytest.mark.asyncio
 async def test_add_jira_links_to_page_success(
     safe_confluence_api, mock_https_helper
@@ -348,6 +645,7 @@ async def test_get_children_by_type_pagination(
     safe_confluence_api, mock_https_helper
 ):
     """Tests get_children_by_type with multiple pages of results."""
+    safe_confluence_api.children_concurrency = 1
     mock_https_helper.get.side_effect = [
         {"results": [{"id": f"c{i}"} for i in range(50)], "size": 100},
         {"results": [{"id": f"c{i}"} for i in range(50, 100)], "size": 100},
@@ -498,11 +796,11 @@ async def test_get_user_by_key_http_error(
 
 
 @pytest.mark.asyncio
-async def test__fetch_descendants_concurrently_error_handling(
+async def test__iter_descendants_concurrently_error_handling(
     safe_confluence_api, mock_https_helper
 ):
     """
-    Tests _fetch_descendants_concurrently when one of the child fetches fails.
+    Tests _iter_descendants_concurrently when one of the child fetches fails.
     The list of all_pages returned should only include pages successfully retrieved.
     """
     mock_https_helper.get.side_effect = [
@@ -523,7 +821,11 @@ async def test__fetch_descendants_concurrently_error_handling(
         {"results": [], "size": 0},
     ]
 
-    descendant_pages = await safe_confluence_api._fetch_descendants_concurrently("1")
+    descendant_pages = [
+        page
+        async for batch in safe_confluence_api._iter_descendants_concurrently("1")
+        for page in batch
+    ]
 
     assert len(descendant_pages) == 2
     assert {"id": "2", "title": "Child 2"} in descendant_pages
@@ -1022,12 +1324,11 @@ async def test_get_page_id_from_url_with_redirect(
 
 
 @pytest.mark.asyncio
-async def test__fetch_descendants_concurrently_handles_exceptions(
+async def test__iter_descendants_concurrently_handles_exceptions(
     safe_confluence_api,
 ):
     """
-    Tests that _fetch_descendants_concurrently handles exceptions raised by child tasks.
-    This covers the `isinstance(res, Exception)` branch.
+    Tests that _iter_descendants_concurrently handles exceptions raised by child tasks.
     """
     # We patch `get_children_by_type` directly on the instance for this test
     # to simulate a failure that `asyncio.gather` will capture as an exception.
@@ -1049,9 +1350,11 @@ async def test__fetch_descendants_concurrently_handles_exceptions(
         # 2. asyncio.gather(get_children_by_type("2"), get_children_by_type("3"))
         # 3. asyncio.gather(get_children_by_type("4"))
 
-        all_descendants = await safe_confluence_api._fetch_descendants_concurrently(
-            "1"
-        )
+        all_descendants = [
+            page
+            async for batch in safe_confluence_api._iter_descendants_concurrently("1")
+            for page in batch
+        ]
 
         # Assert that the successfully fetched descendants are returned despite one error
         descendant_ids = {page["id"] for page in all_descendants}
@@ -1059,10 +1362,10 @@ async def test__fetch_descendants_concurrently_handles_exceptions(
 
         # Verify the calls were made as expected
         expected_calls = [
-            call("1"),
-            call("2"),
-            call("3"),
-            call("4"),
+            call("1", expand=None),
+            call("2", expand=None),
+            call("3", expand=None),
+            call("4", expand=None),
         ]
         mock_get_children.assert_has_calls(expected_calls, any_order=True)
 
@@ -1102,6 +1405,7 @@ async def test_get_children_by_type_fails_on_second_page(
     Tests that get_children_by_type returns partial results if pagination fails mid-way.
     This covers the `except Exception` block inside the `while` loop.
     """
+    safe_confluence_api.children_concurrency = 1
     # First page of results is successful
     first_page_results = {"results": [{"id": f"c{i}"} for i in range(50)], "size": 51}
     # Second call fails
@@ -1137,7 +1441,7 @@ async def test_add_jira_links_to_page_fails_on_final_update(
     initial_body = """
     <ac:task-list><ac:task><ac:task-id>task1</ac:task-id><ac:task-status>incomplete</ac:task-status><ac:task-body>Task 1 Summary</ac:task-body></ac:task></ac:task-list>
     """
-    # Mock the initial page fetch and the subsequent fetch inside update_page
+    # Mock the initial page fetch; update_page reuses its version
     page_data = {
         "id": page_id,
         "title": "Test Page",
@@ -1155,8 +1459,8 @@ async def test_add_jira_links_to_page_fails_on_final_update(
         await safe_confluence_api.add_jira_links_to_page(page_id, mappings)
     assert "API call failed in SafeConfluenceAPI.update_page" in caplog.text
 
-    # The first GET is for the initial fetch, the second is inside the `update_page` call
-    assert mock_https_helper.get.call_count == 2
+    # The only GET is the initial fetch; a 403 is not retried
+    assert mock_https_helper.get.call_count == 1
     mock_https_helper.put.assert_awaited_once()
 
 @pytest.mark.asyncio
@@ -1454,6 +1758,7 @@ async def test_get_all_descendants_handles_duplicate_child(
     of multiple parents in the same hierarchy, ensuring it's processed only once.
     This covers the `if p_id in processed_page_ids:` branch at line 312.
     """
+    safe_confluence_api.descendant_strategy = "bfs"
     # page "3" is a child of both "1" and "2"
     mock_https_helper.get.side_effect = [
         # Children for root "root"
@@ -1466,8 +1771,9 @@ async def test_get_all_descendants_handles_duplicate_child(
         {"results": [], "size": 0},
     ]
 
-    # The function get_all_descendants uses _fetch_descendants_concurrently internally.
-    # We call the public method to test the integrated behavior.
+    # With the 'bfs' strategy, get_all_descendants walks the tree with
+    # _iter_descendants_concurrently. We call the public method to test the
+    # integrated behavior.
     all_ids = await safe_confluence_api.get_all_descendants("root")
 
     # The final list should not contain duplicates.
@@ -1476,3 +1782,200 @@ async def test_get_all_descendants_handles_duplicate_child(
     # get_children_by_type (which uses https_helper.get) should have been called
     # for "root", "1", "2", and "3". The duplicate processing of "3" should be skipped.
     assert mock_https_helper.get.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_mapped_to_confluence_api_error(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a request rejected by an open circuit becomes a 503 ApiError."""
+    mock_https_helper.get.side_effect = HTTPXCircuitOpenError(
+        "Circuit breaker open for upstream 'confluence'"
+    )
+
+    with pytest.raises(ConfluenceApiError) as excinfo:
+        await safe_confluence_api.get_page_by_id("123")
+
+    assert excinfo.value.status_code == 503
+
+
+def _page_with_task(page_id: str, version: int, extra: str = "") -> dict:
+    body = (
+        "<ac:task-list><ac:task><ac:task-id>task1</ac:task-id>"
+        "<ac:task-status>incomplete</ac:task-status>"
+        f"<ac:task-body>Task 1 Summary</ac:task-body></ac:task></ac:task-list>{extra}"
+    )
+    return {
+        "id": page_id,
+        "title": "Test Page",
+        "body": {"storage": {"value": body, "representation": "storage"}},
+        "version": {"number": version},
+    }
+
+
+def _conflict() -> HTTPXClientError:
+    return HTTPXClientError(
+        "Conflict",
+        request=httpx.Request("PUT", "url"),
+        response=httpx.Response(409),
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_page_with_known_version_skips_fetch(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that update_page writes directly when the version is given."""
+    success = await safe_confluence_api.update_page(
+        "123", "Title", "Body", current_version=4
+    )
+
+    assert success is True
+    mock_https_helper.get.assert_not_called()
+    payload = mock_https_helper.put.await_args.kwargs["json_data"]
+    assert payload["version"] == {"number": 5}
+
+
+@pytest.mark.asyncio
+async def test_add_jira_links_to_page_with_given_page_is_one_request(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a page the caller already holds is written with one PUT."""
+    mappings = [{"confluence_task_id": "task1", "jira_key": "PROJ-1"}]
+
+    success = await safe_confluence_api.add_jira_links_to_page(
+        "123", mappings, page=_page_with_task("123", 7)
+    )
+
+    assert success is True
+    mock_https_helper.get.assert_not_called()
+    mock_https_helper.put.assert_awaited_once()
+    payload = mock_https_helper.put.await_args.kwargs["json_data"]
+    assert payload["version"] == {"number": 8}
+    assert "PROJ-1" in payload["body"]["storage"]["value"]
+
+
+@pytest.mark.asyncio
+async def test_add_jira_links_to_page_retries_on_conflict(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a 409 re-reads the page and re-applies the links to it."""
+    mappings = [{"confluence_task_id": "task1", "jira_key": "PROJ-1"}]
+    mock_https_helper.get.return_value = _page_with_task("123", 8, "<p>edit</p>")
+    mock_https_helper.put.side_effect = [_conflict(), {}]
+
+    success = await safe_confluence_api.add_jira_links_to_page(
+        "123", mappings, page=_page_with_task("123", 7)
+    )
+
+    assert success is True
+    mock_https_helper.get.assert_awaited_once()
+    assert mock_https_helper.get.await_args.kwargs["params"] == {
+        "expand": "body.storage,version"
+    }
+    assert mock_https_helper.put.await_count == 2
+    payload = mock_https_helper.put.await_args.kwargs["json_data"]
+    assert payload["version"] == {"number": 9}
+    assert "<p>edit</p>" in payload["body"]["storage"]["value"]
+    assert "PROJ-1" in payload["body"]["storage"]["value"]
+
+
+@pytest.mark.asyncio
+async def test_add_jira_links_to_page_gives_up_after_conflict_retries(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that persistent conflicts raise once the retries are used up."""
+    mappings = [{"confluence_task_id": "task1", "jira_key": "PROJ-1"}]
+    mock_https_helper.get.return_value = _page_with_task("123", 8)
+    mock_https_helper.put.side_effect = _conflict()
+
+    with pytest.raises(ConfluenceApiError) as exc_info:
+        await safe_confluence_api.add_jira_links_to_page(
+            "123", mappings, page=_page_with_task("123", 7), max_conflict_retries=2
+        )
+
+    assert exc_info.value.status_code == 409
+    assert mock_https_helper.put.await_count == 3
+    assert mock_https_helper.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_from_page_resolves_each_assignee_once(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that repeated assignees are looked up once per page and cached."""
+    tasks_html = "".join(
+        f"<ac:task><ac:task-id>t{i}</ac:task-id>"
+        "<ac:task-status>incomplete</ac:task-status>"
+        f'<ac:task-body>Task {i} <ri:user ri:userkey="key{i % 2}"></ri:user>'
+        "</ac:task-body></ac:task>"
+        for i in range(6)
+    )
+    page_details = {
+        "id": "123",
+        "title": "Test Page",
+        "body": {"storage": {"value": f"<ac:task-list>{tasks_html}</ac:task-list>"}},
+        "version": {"number": 1},
+    }
+    mock_https_helper.get.side_effect = lambda url, headers: {
+        "username": url.rsplit("=", 1)[1] + "_name"
+    }
+
+    tasks = await safe_confluence_api.get_tasks_from_page(page_details)
+    await safe_confluence_api.get_tasks_from_page(page_details)
+
+    assert [task.assignee_name for task in tasks] == ["key0_name", "key1_name"] * 3
+    assert mock_https_helper.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_children_by_type_fetches_remaining_pages_concurrently(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that pages after the first are fetched in parallel, in order."""
+    safe_confluence_api.children_page_size = 10
+    safe_confluence_api.children_concurrency = 4
+    children = [{"id": f"c{i}"} for i in range(35)]
+    in_flight = 0
+    peak = 0
+
+    async def get(url, headers=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 if "start=10&" in url else 0)
+        in_flight -= 1
+        start = int(re.search(r"start=(\d+)", url).group(1))
+        window = children[start : start + 10]
+        links = {"next": "/next"} if start + 10 < len(children) else {}
+        return {"results": window, "size": len(window), "_links": links}
+
+    mock_https_helper.get.side_effect = get
+
+    result = await safe_confluence_api.get_children_by_type("parent123")
+
+    assert result == children
+    assert mock_https_helper.get.await_count == 5
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_get_children_by_type_stops_without_next_link(
+    safe_confluence_api, mock_https_helper
+):
+    """Tests that a full first page without a next link ends the listing."""
+    safe_confluence_api.children_page_size = 2
+    mock_https_helper.get.return_value = {
+        "results": [{"id": "c1"}, {"id": "c2"}],
+        "size": 2,
+        "_links": {"self": "/self"},
+    }
+
+    result = await safe_confluence_api.get_children_by_type("parent123")
+
+    assert result == [{"id": "c1"}, {"id": "c2"}]
+    mock_https_helper.get.assert_awaited_once_with(
+        "http://confluence.example.com/rest/api/content/parent123/child/page"
+        "?start=0&limit=2",
+        headers=safe_confluence_api.headers,
+    )
@@ -134,6 +134,7 @@ async def test_transition_issue_success(safe_jira_api, mock_https_helper):
         "http://jira.example.com/rest/api/2/issue/PROJ-1/transitions",  # URL matches fixture's base_url
         headers=safe_jira_api.headers,
         json_data={"transition": {"id": "1"}},
+        decode_response=False,
     )
 
 
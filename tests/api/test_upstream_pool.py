@@ -0,0 +1,167 @@
+import httpx
+
+from src.api.upstream_pool import UpstreamPool
+
+
+def test_from_settings_builds_pool() -> None:
+    """Tests that a pool is created from a config settings entry."""
+    pool = UpstreamPool.from_settings(
+        "jira",
+        {"max_concurrent": 7, "max_connections": 4, "keepalive_expiry": 30.0},
+        host="jira.example.com",
+    )
+
+    assert pool.name == "jira"
+    assert pool.limiter.limit == 7
+    assert pool.mount_pattern == "all://jira.example.com"
+    stats = pool.stats()
+    assert stats["host"] == "jira.example.com"
+    assert stats["max_connections"] == 4
+    assert stats["keepalive_expiry"] == 30.0
+    assert stats["limit"] == 7
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_default_pool_has_no_mount_pattern() -> None:
+    """Tests that the catch-all pool is not mounted to a specific host."""
+    pool = UpstreamPool("default", 5, 5, 5.0)
+    assert pool.mount_pattern is None
+
+
+def test_build_transport_applies_limits() -> None:
+    """Tests that the transport's pool is created with this upstream's limits."""
+    pool = UpstreamPool("confluence", 3, 9, 12.5, host="wiki.example.com")
+
+    transport = pool.build_transport(verify=False, http2=False)
+
+    assert isinstance(transport, httpx.AsyncHTTPTransport)
+    assert transport._pool._max_connections == 9
+    assert transport._pool._keepalive_expiry == 12.5
+
+
+def test_record_response_drives_adaptive_controller() -> None:
+    """Tests that overload responses and timeouts cut the adaptive limit."""
+    pool = UpstreamPool("jira", 8, 8, 5.0, host="jira.example.com")
+    pool.enable_adaptive_concurrency(min_limit=1, max_limit=16)
+
+    pool.record_response(200, 0.05)
+    pool.record_response(429, 0.05)
+
+    assert pool.limiter.limit == 4
+    assert pool.stats()["adaptive_concurrency"]["decreases"] == 1
+
+
+def test_record_response_without_controller_is_noop() -> None:
+    """Tests that pools without adaptive concurrency keep a static limit."""
+    pool = UpstreamPool("jira", 8, 8, 5.0)
+
+    pool.record_response(503, 0.05)
+    pool.record_timeout()
+
+    assert pool.limiter.limit == 8
+    assert "adaptive_concurrency" not in pool.stats()
+
+
+def test_record_throttle_pauses_rate_limiter() -> None:
+    """Tests that a throttle response pauses the shared token bucket."""
+    pool = UpstreamPool("jira", 8, 8, 5.0, rate_limit_per_second=10, rate_limit_burst=5)
+
+    pool.record_throttle(30)
+
+    rate_stats = pool.stats()["rate_limit"]
+    assert rate_stats["throttle_count"] == 1
+    assert rate_stats["paused_for_seconds"] > 25
+    assert rate_stats["rate_per_second"] == 5
+
+
+def test_circuit_breaker_counts_server_errors_not_client_errors() -> None:
+    """Tests which outcomes the circuit breaker treats as failures."""
+    pool = UpstreamPool("confluence", 8, 8, 5.0)
+    pool.enable_circuit_breaker(
+        failure_rate_threshold=0.5,
+        minimum_requests=2,
+        window_seconds=30,
+        open_seconds=30,
+    )
+
+    pool.record_response(404, 0.1)
+    pool.record_response(429, 0.1)
+    pool.record_response(500, 0.1)
+    assert pool.allow_request() is True
+
+    pool.record_timeout()
+    pool.record_error()
+
+    assert pool.allow_request() is False
+    assert pool.stats()["circuit_breaker"]["state"] == "open"
+
+
+def test_pool_without_breaker_always_allows_requests() -> None:
+    """Tests that pools without a circuit breaker never reject requests."""
+    pool = UpstreamPool("jira", 8, 8, 5.0)
+
+    for _ in range(50):
+        pool.record_error()
+
+    assert pool.allow_request() is True
+    assert "circuit_breaker" not in pool.stats()
+
+
+def test_retry_budget_is_fed_by_successful_responses() -> None:
+    """Tests that successful responses let the pool spend more retries."""
+    pool = UpstreamPool("jira", 8, 8, 5.0)
+    pool.enable_retry_budget(ratio=0.5, min_retries_per_second=0, window_seconds=60)
+    assert pool.allow_retry() is False
+
+    pool.record_response(200, 0.1)
+    pool.record_response(404, 0.1)
+    pool.record_response(200, 0.1)
+
+    assert pool.allow_retry() is True
+    assert pool.allow_retry() is False
+    assert pool.stats()["retry_budget"]["retries_rejected"] == 2
+
+
+def test_pool_without_retry_budget_always_allows_retries() -> None:
+    """Tests that pools without a retry budget never refuse retries."""
+    pool = UpstreamPool("jira", 8, 8, 5.0)
+
+    assert all(pool.allow_retry() for _ in range(50))
+    assert "retry_budget" not in pool.stats()
+
+
+def test_transport_negotiates_the_pool_compression() -> None:
+    """Tests that the pool's transport sends the configured Accept-Encoding."""
+    pool = UpstreamPool("jira", 8, 8, 5.0, accept_encoding="gzip")
+
+    transport = pool.build_transport(verify=True, http2=False)
+
+    assert transport.compression is pool.compression
+    assert pool.stats()["compression"]["accept_encoding"] == "gzip"
+
+
+def test_keepalive_connections_default_to_and_are_capped_by_max_connections() -> None:
+    """Tests the idle-connection limit passed on to the transport."""
+    default = UpstreamPool("jira", 8, 6, 5.0)
+    assert default.max_keepalive_connections == 6
+
+    pool = UpstreamPool.from_settings(
+        "jira",
+        {
+            "max_concurrent": 8,
+            "max_connections": 6,
+            "max_keepalive_connections": 2,
+            "keepalive_expiry": 60.0,
+        },
+    )
+    transport = pool.build_transport(verify=True, http2=False)
+
+    assert transport._pool._max_keepalive_connections == 2
+    assert pool.stats()["max_keepalive_connections"] == 2
+    assert (
+        UpstreamPool(
+            "jira", 8, 6, 5.0, max_keepalive_connections=50
+        ).max_keepalive_connections
+        == 6
+    )
@@ -0,0 +1,123 @@
+"""Tests for the cached user-key resolver."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.api.user_resolver import UserResolver
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def user_lookup() -> AsyncMock:
+    return AsyncMock(side_effect=lambda key: {"username": f"name-{key}"})
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_looks_up_each_distinct_key_once() -> None:
+    lookup = user_lookup()
+    resolver = UserResolver(lookup)
+
+    usernames = await resolver.resolve_many(["a", "b", "a", "a", "b"])
+
+    assert usernames == {"a": "name-a", "b": "name-b"}
+    assert lookup.await_count == 2
+    assert resolver.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_answers_are_cached_until_they_expire() -> None:
+    lookup = user_lookup()
+    clock = FakeClock()
+    resolver = UserResolver(lookup, ttl_seconds=60, clock=clock)
+
+    await resolver.resolve("a")
+    clock.now = 59
+    assert await resolver.resolve("a") == "name-a"
+    assert lookup.await_count == 1
+
+    clock.now = 60
+    await resolver.resolve("a")
+    assert lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_users_are_cached() -> None:
+    lookup = AsyncMock(return_value=None)
+    resolver = UserResolver(lookup)
+
+    assert await resolver.resolve("ghost") is None
+    assert await resolver.resolve("ghost") is None
+    lookup.assert_awaited_once_with("ghost")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_lookup() -> None:
+    release = asyncio.Event()
+
+    async def slow_lookup(key: str) -> dict:
+        await release.wait()
+        return {"username": key.upper()}
+
+    lookup = AsyncMock(side_effect=slow_lookup)
+    resolver = UserResolver(lookup)
+
+    first = asyncio.create_task(resolver.resolve_many(["a"]))
+    second = asyncio.create_task(resolver.resolve_many(["a", "b"]))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == {"a": "A"}
+    assert await second == {"a": "A", "b": "B"}
+    assert lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_bounded_by_concurrency() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def lookup(key: str) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return {"username": key}
+
+    resolver = UserResolver(lookup, concurrency=3)
+
+    await resolver.resolve_many([str(i) for i in range(10)])
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_lookups_are_not_cached() -> None:
+    lookup = AsyncMock(side_effect=[RuntimeError("down"), {"username": "a"}])
+    resolver = UserResolver(lookup)
+
+    with pytest.raises(RuntimeError):
+        await resolver.resolve("a")
+    assert await resolver.resolve("a") == "a"
+
+
+@pytest.mark.asyncio
+async def test_oldest_entries_are_dropped_beyond_the_limit() -> None:
+    lookup = user_lookup()
+    resolver = UserResolver(lookup, max_entries=2)
+
+    await resolver.resolve_many(["a", "b", "c"])
+
+    assert resolver.cached("a") == (False, None)
+    assert resolver.cached("c") == (True, "name-c")
+    assert resolver.stats()["entries"] == 2
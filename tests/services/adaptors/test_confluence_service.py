@@ -12,7 +12,11 @@ import pytest_asyncio
 
 # Assuming your project structure allows this import path
 from src.api.safe_confluence_api import SafeConfluenceAPI
+from src.exceptions import ConfluenceApiError
 from src.services.adaptors.confluence_service import ConfluenceService
+from src.services.adaptors.page_cache import PageCache
+from src.services.adaptors.page_id_cache import PageIdCache
+from src.services.business.sync_watermark import watermark_expand
 
 
 # --- Stub for the underlying API ---
@@ -38,6 +42,10 @@ class SafeConfluenceAPIStub(SafeConfluenceAPI):
         await self.mock.get_all_descendants(page_id)
         return [{"id": "child1"}, {"id": "child2"}]
 
+    async def get_all_descendant_pages(self, page_id: str, expand: str = None) -> list:
+        await self.mock.get_all_descendant_pages(page_id, expand=expand)
+        return [{"id": "child1", "body": {"storage": {"value": "<p/>"}}}]
+
     async def get_page_by_id(self, page_id: str, expand: str = None) -> dict:
         await self.mock.get_page_by_id(page_id, expand=expand)
         return {"id": page_id, "title": "Stubbed Page", "version": {"number": 2}}
@@ -50,10 +58,20 @@ class SafeConfluenceAPIStub(SafeConfluenceAPI):
         await self.mock.get_tasks_from_page(page_details)
         return [{"id": "task1", "status": "incomplete"}]
 
-    async def add_jira_links_to_page(self, page_id: str, mappings: list) -> dict:
-        await self.mock.add_jira_links_to_page(page_id, mappings)
+    async def add_jira_links_to_page(
+        self, page_id: str, mappings: list, page=None
+    ) -> dict:
+        await self.mock.add_jira_links_to_page(page_id, mappings, page=page)
         return {"id": page_id, "body": {"storage": {"value": "updated_body"}}}
 
+    async def set_content_property(
+        self, page_id: str, key: str, value: dict, current_version=None
+    ) -> bool:
+        await self.mock.set_content_property(
+            page_id, key, value, current_version=current_version
+        )
+        return True
+
     async def create_page(self, **kwargs) -> dict:
         await self.mock.create_page(**kwargs)
         return {"id": "new_stubbed_page", "title": kwargs.get("title")}
@@ -105,6 +123,17 @@ async def test_get_all_descendants(confluence_service_with_stub):
     assert result == [{"id": "child1"}, {"id": "child2"}]
 
 
+@pytest.mark.asyncio
+async def test_get_all_descendant_pages(confluence_service_with_stub):
+    """Verify get_all_descendant_pages passes the expansion to the api."""
+    service, mock_api = confluence_service_with_stub
+    result = await service.get_all_descendant_pages("12345", expand="body.storage")
+    mock_api.get_all_descendant_pages.assert_called_once_with(
+        "12345", expand="body.storage"
+    )
+    assert result[0]["id"] == "child1"
+
+
 @pytest.mark.asyncio
 async def test_get_page_by_id(confluence_service_with_stub):
     """Verify get_page_by_id calls the api and returns its data."""
@@ -143,7 +172,9 @@ async def test_add_jira_links_to_page(confluence_service_with_stub):
     page_id = "12345"
     mappings = [{"confluence_task_id": "t1", "jira_key": "PROJ-1"}]
     await service.add_jira_links_to_page(page_id, mappings)
-    mock_api.add_jira_links_to_page.assert_called_once_with(page_id, mappings)
+    mock_api.add_jira_links_to_page.assert_called_once_with(
+        page_id, mappings, page=None
+    )
 
 
 @pytest.mark.asyncio
@@ -164,3 +195,232 @@ async def test_get_user_by_username(confluence_service_with_stub):
     result = await service.get_user_by_username(username)
     mock_api.get_user_by_username.assert_called_once_with(username)
     assert result["displayName"] == "Stubbed User"
+
+
+@pytest.mark.asyncio
+async def test_set_content_property(confluence_service_with_stub):
+    """Verify set_content_property passes the property to the api."""
+    service, mock_api = confluence_service_with_stub
+    result = await service.set_content_property(
+        "12345", "wm", {"version": 2}, current_version=1
+    )
+    mock_api.set_content_property.assert_called_once_with(
+        "12345", "wm", {"version": 2}, current_version=1
+    )
+    assert result is True
+
+
+# --- Page cache ---
+
+
+def make_cached_service():
+    api = AsyncMock(spec=SafeConfluenceAPI)
+    cache = PageCache(max_bytes=1_000_000)
+    return ConfluenceService(api, page_cache=cache), api, cache
+
+
+def page(page_id: str, version: int) -> dict:
+    return {
+        "id": page_id,
+        "title": "Page",
+        "version": {"number": version},
+        "body": {"storage": {"value": f"<p>v{version}</p>"}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_page_by_id_downloads_each_version_once():
+    """Repeated body reads are answered from the cache."""
+    service, api, cache = make_cached_service()
+    api.get_page_by_id.side_effect = [{"version": {"number": 2}}, page("1", 2)]
+
+    first = await service.get_page_by_id("1", expand="body.storage,version")
+    second = await service.get_page_by_id("1", expand="version,body.storage")
+
+    assert first == second == page("1", 2)
+    assert api.get_page_by_id.await_count == 2
+    api.get_page_by_id.assert_any_await("1", expand="version")
+    api.get_page_by_id.assert_any_await("1", expand="body.storage,version")
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_page_by_id_refetches_after_write():
+    """A write makes the next read check the latest version again."""
+    service, api, cache = make_cached_service()
+    cache.store(page("1", 2), frozenset({"body.storage", "version"}))
+    api.update_page.return_value = True
+    api.get_page_by_id.side_effect = [{"version": {"number": 3}}, page("1", 3)]
+
+    await service.update_page_content("1", "Page", "<p>v3</p>")
+    result = await service.get_page_by_id("1", expand="body.storage,version")
+
+    assert result["version"]["number"] == 3
+    assert api.get_page_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_page_by_id_caches_historical_versions():
+    """Historical versions are cached without looking up the latest version."""
+    service, api, _ = make_cached_service()
+    api.get_page_by_id.return_value = page("1", 1)
+
+    for _ in range(2):
+        result = await service.get_page_by_id("1", version=1, expand="body.storage")
+
+    assert result == page("1", 1)
+    api.get_page_by_id.assert_awaited_once_with(
+        "1", expand="body.storage,version", version=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_page_by_id_bypasses_cache_without_body():
+    """Metadata-only reads always go to the API."""
+    service, api, cache = make_cached_service()
+    api.get_page_by_id.return_value = {"version": {"number": 2}}
+
+    await service.get_page_by_id("1", expand="version")
+
+    api.get_page_by_id.assert_awaited_once_with("1", expand="version")
+    assert cache.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_all_descendant_pages_seeds_cache():
+    """Pages listed with their bodies are served from the cache afterwards."""
+    service, api, _ = make_cached_service()
+    api.get_all_descendant_pages.return_value = [page("2", 5)]
+
+    await service.get_all_descendant_pages("1", expand="body.storage,version")
+    result = await service.get_page_by_id("2", expand="body.storage")
+
+    assert result == page("2", 5)
+    api.get_page_by_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_iter_descendant_pages_seeds_cache_while_streaming():
+    """Each streamed page is cached before it is handed to the caller."""
+    service, api, cache = make_cached_service()
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        yield page("2", 5)
+        yield page("3", 1)
+
+    api.iter_descendant_pages = iter_descendant_pages
+
+    streamed = []
+    async for listed in service.iter_descendant_pages(
+        "1", expand="body.storage,version"
+    ):
+        streamed.append(listed["id"])
+        assert cache.latest_version(listed["id"]) is not None
+
+    assert streamed == ["2", "3"]
+    assert await service.get_page_by_id("3", expand="body.storage") == page("3", 1)
+    api.get_page_by_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_listed_version_spares_version_check_for_changed_page():
+    """A page listed with its version costs one GET for its body, not two."""
+    service, api, cache = make_cached_service()
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        yield {"id": "2", "version": {"number": 5}}
+
+    api.iter_descendant_pages = iter_descendant_pages
+    api.get_page_by_id.return_value = page("2", 5)
+
+    async for listed in service.iter_descendant_pages(
+        "1", expand=watermark_expand("jira-sync-watermark")
+    ):
+        await service.get_page_by_id(listed["id"], expand="body.storage,version")
+
+    api.get_page_by_id.assert_awaited_once_with(
+        "2", expand="body.storage,version"
+    )
+    assert cache.stats()["version_checks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_add_jira_links_to_page_passes_cached_page():
+    """The page held in the cache is handed to the API for a single write."""
+    service, api, cache = make_cached_service()
+    cache.store(page("1", 2), frozenset({"body.storage", "version"}))
+    api.add_jira_links_to_page.return_value = True
+    mappings = [{"confluence_task_id": "t1", "jira_key": "PROJ-1"}]
+
+    assert await service.add_jira_links_to_page("1", mappings) is True
+
+    api.get_page_by_id.assert_not_awaited()
+    api.add_jira_links_to_page.assert_awaited_once_with(
+        "1", mappings, page=page("1", 2)
+    )
+    assert cache.latest_version("1") is None
+
+
+# --- Page ID cache ---
+
+SHORT_URL = "https://confluence.example.com/x/AbCd"
+
+
+def make_service_with_page_id_cache():
+    api = AsyncMock(spec=SafeConfluenceAPI)
+    return ConfluenceService(api, page_id_cache=PageIdCache(max_entries=10)), api
+
+
+@pytest.mark.asyncio
+async def test_get_page_id_from_url_caches_short_links():
+    """A short link is resolved once and then answered from the cache."""
+    service, api = make_service_with_page_id_cache()
+    api.get_page_id_from_url.return_value = "123"
+
+    assert await service.get_page_id_from_url(SHORT_URL) == "123"
+    assert await service.get_page_id_from_url(SHORT_URL) == "123"
+
+    api.get_page_id_from_url.assert_awaited_once_with(SHORT_URL)
+
+
+@pytest.mark.asyncio
+async def test_get_page_id_from_url_does_not_cache_failures():
+    """Unresolvable links are tried again on the next request."""
+    service, api = make_service_with_page_id_cache()
+    api.get_page_id_from_url.side_effect = [None, "123"]
+
+    assert await service.get_page_id_from_url(SHORT_URL) is None
+    assert await service.get_page_id_from_url(SHORT_URL) == "123"
+
+
+@pytest.mark.asyncio
+async def test_get_page_id_from_url_skips_cache_for_long_urls():
+    """URLs that contain the page ID are not cached."""
+    service, api = make_service_with_page_id_cache()
+    api.get_page_id_from_url.return_value = "42"
+    url = "https://confluence.example.com/pages/viewpage.action?pageId=42"
+
+    await service.get_page_id_from_url(url)
+
+    assert service._page_id_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_page_ids_from_urls_deduplicates_and_drops_errors():
+    """Each distinct URL is resolved once; failed URLs are left out."""
+    service, api = make_service_with_page_id_cache()
+    resolved = {SHORT_URL: "123", "https://c/x/none": None}
+
+    async def resolve(url):
+        if url == "https://c/x/error":
+            raise ConfluenceApiError("boom")
+        return resolved[url]
+
+    api.get_page_id_from_url.side_effect = resolve
+
+    page_ids = await service.get_page_ids_from_urls(
+        [SHORT_URL, "https://c/x/none", SHORT_URL, "https://c/x/error"]
+    )
+
+    assert page_ids == {SHORT_URL: "123", "https://c/x/none": None}
+    assert api.get_page_id_from_url.await_count == 3
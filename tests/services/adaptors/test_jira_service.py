@@ -188,6 +188,27 @@ async def test_get_user_display_name_caching(jira_service):
     api_stub.mock.get_current_user.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_get_user_display_name_is_cached_across_calls(jira_service):
+    service, api_stub = jira_service
+    assert await service.get_user_display_name() == "AutomationBot"
+    assert await service.get_user_display_name() == "AutomationBot"
+    api_stub.mock.get_current_user.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_issue_type_name_caches_found_names_only(jira_service):
+    service, api_stub = jira_service
+    api_stub.add_issue_type("10000", {"id": "10000", "name": "Epic"})
+    api_stub.add_issue_type("99999", None)
+
+    for _ in range(2):
+        assert await service.get_issue_type_name("10000") == "Epic"
+        assert await service.get_issue_type_name("99999") is None
+
+    assert api_stub.mock.get_issue_type_by_id.call_count == 3
+
+
 @pytest.mark.asyncio
 async def test_get_user_display_name_fallback(jira_service):
     service, api_stub = jira_service
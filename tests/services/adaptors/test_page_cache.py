@@ -0,0 +1,102 @@
+"""Tests for the version-keyed Confluence page cache."""
+
+from src.services.adaptors.page_cache import PageCache, parse_expand
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_page(page_id: str, version: int, body: str = "<p>body</p>") -> dict:
+    return {
+        "id": page_id,
+        "title": f"Page {page_id}",
+        "version": {"number": version},
+        "body": {"storage": {"value": body}},
+    }
+
+
+BODY = parse_expand("body.storage,version")
+
+
+def test_parse_expand_ignores_blanks() -> None:
+    assert parse_expand(" body.storage, ,version") == {"body.storage", "version"}
+    assert parse_expand(None) == frozenset()
+
+
+def test_get_returns_copy_of_stored_version() -> None:
+    cache = PageCache(max_bytes=10_000)
+    cache.store(make_page("1", 3), BODY)
+
+    page = cache.get("1", 3, BODY)
+    page["title"] = "changed"
+
+    assert cache.get("1", 3, BODY)["title"] == "Page 1"
+    assert cache.get("1", 4, BODY) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_misses_when_expansions_are_missing() -> None:
+    cache = PageCache(max_bytes=10_000)
+    cache.store(make_page("1", 3), BODY)
+
+    assert cache.get("1", 3, BODY | {"ancestors"}) is None
+    assert cache.expansions_of("1", 3) == BODY
+
+
+def test_latest_version_expires_and_can_be_invalidated() -> None:
+    clock = FakeClock()
+    cache = PageCache(max_bytes=10_000, version_ttl_seconds=30, clock=clock)
+    cache.store(make_page("1", 3), BODY)
+    cache.store(make_page("1", 2), BODY, latest=False)
+
+    assert cache.latest_version("1") == 3
+    clock.now = 31
+    assert cache.latest_version("1") is None
+
+    cache.confirm_latest("1", 4)
+    cache.invalidate("1")
+    assert cache.latest_version("1") is None
+    assert cache.get("1", 3, BODY) is not None
+
+
+def test_evicts_least_recently_used_within_budget() -> None:
+    body = "x" * 1000
+    cache = PageCache(max_bytes=4500)
+    for page_id in ("1", "2"):
+        cache.store(make_page(page_id, 1, body), BODY)
+    cache.get("1", 1, BODY)
+    cache.store(make_page("3", 1, body), BODY)
+
+    assert cache.get("2", 1, BODY) is None
+    assert cache.get("1", 1, BODY) is not None
+    assert cache.stats()["evictions"] == 1
+    assert not cache.store(make_page("4", 1, "x" * 5000), BODY)
+    assert len(cache) == 2
+
+
+def test_pages_without_version_are_not_cached() -> None:
+    cache = PageCache(max_bytes=10_000)
+    assert not cache.store({"id": "1", "body": {}}, BODY)
+
+
+def test_latest_versions_stay_bounded_by_budget() -> None:
+    body = "x" * 1000
+    cache = PageCache(max_bytes=4500)
+    for page_id in range(100):
+        cache.store(make_page(str(page_id), 1, body), BODY)
+        cache.confirm_latest(f"listed-{page_id}", 1)
+
+    assert len(cache) == 2
+    # Evicted pages lose their latest version with their entry.
+    assert cache.latest_version("0") is None
+    assert cache.latest_version("99") == 1
+    # Pages confirmed without an entry are capped by what the budget could hold.
+    assert len(cache._latest) <= 4500 // 1024
@@ -0,0 +1,79 @@
+"""Tests for the cache of resolved Confluence URLs."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import redis.asyncio as redis
+
+from src.services.adaptors.page_id_cache import REDIS_KEY_PREFIX, PageIdCache
+
+SHORT_URL = "https://confluence.example.com/x/AbCd"
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = PageIdCache(max_entries=10, ttl_seconds=60, clock=clock)
+
+    await cache.set(SHORT_URL, "123")
+    clock.now = 59
+    assert await cache.get(SHORT_URL) == "123"
+    clock.now = 60
+    assert await cache.get(SHORT_URL) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_dropped() -> None:
+    cache = PageIdCache(max_entries=2)
+
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    await cache.get("a")
+    await cache.set("c", "3")
+
+    assert await cache.get("a") == "1"
+    assert await cache.get("b") is None
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_is_written_and_read_through() -> None:
+    redis_client = AsyncMock()
+    redis_client.get.return_value = "456"
+    cache = PageIdCache(max_entries=10, ttl_seconds=3600, redis_client=redis_client)
+
+    await cache.set(SHORT_URL, "123")
+    assert await cache.get("https://confluence.example.com/x/Other") == "456"
+    assert await cache.get("https://confluence.example.com/x/Other") == "456"
+
+    redis_client.set.assert_awaited_once_with(
+        REDIS_KEY_PREFIX + SHORT_URL, "123", ex=3600
+    )
+    redis_client.get.assert_awaited_once_with(
+        REDIS_KEY_PREFIX + "https://confluence.example.com/x/Other"
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_memory() -> None:
+    redis_client = AsyncMock()
+    redis_client.get.side_effect = redis.ConnectionError("down")
+    redis_client.set.side_effect = redis.ConnectionError("down")
+    cache = PageIdCache(max_entries=10, redis_client=redis_client)
+
+    await cache.set(SHORT_URL, "123")
+
+    assert await cache.get(SHORT_URL) == "123"
+    assert await cache.get("https://confluence.example.com/x/Other") is None
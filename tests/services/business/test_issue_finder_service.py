@@ -7,7 +7,12 @@ import pytest_asyncio
 
 from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.jira_interface import IJiraService
-from src.models.data_models import ConfluenceTask, JiraIssue, JiraIssueStatus
+from src.models.data_models import (
+    ConfluenceTask,
+    HierarchyFilter,
+    JiraIssue,
+    JiraIssueStatus,
+)
 from src.models.api_models import SyncTaskContext
 from src.services.business.issue_finder import IssueFinder
 
@@ -40,9 +45,35 @@ class ConfluenceApiStub(IConfluenceService):
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
         return "stub_id"
 
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        return {url: await self.get_page_id_from_url(url) for url in urls}
+
     async def get_all_descendants(self, page_id: str) -> List[str]:
         return []
 
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return [{"id": pid} for pid in await self.get_all_descendants(page_id)]
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ):
+        for page in await self.get_all_descendant_pages(page_id, expand=expand):
+            yield page
+
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        return True
+
     async def get_tasks_from_page(
         self, page_details: Dict[str, Any]
     ) -> List[ConfluenceTask]:
@@ -0,0 +1,54 @@
+from src.services.business.sync_watermark import SyncWatermark, watermark_expand
+
+KEY = "jira-sync-watermark"
+
+
+def page_with_property(value, property_version=3, page_version=5):
+    return {
+        "id": "1",
+        "version": {"number": page_version},
+        "metadata": {
+            "properties": {
+                KEY: {"key": KEY, "value": value, "version": {"number": property_version}}
+            }
+        },
+    }
+
+
+def test_watermark_expand_lists_version_and_property():
+    assert watermark_expand(KEY) == "version,metadata.properties.jira-sync-watermark"
+
+
+def test_from_page_reads_stored_watermark():
+    page = page_with_property({"version": 5, "taskIds": ["10", 11]})
+
+    watermark = SyncWatermark.from_page(page, KEY)
+
+    assert watermark.page_version == 5
+    assert watermark.task_ids == ["10", "11"]
+    assert watermark.property_version == 3
+    assert watermark.is_current(page)
+
+
+def test_from_page_without_property():
+    assert SyncWatermark.from_page({"id": "1", "version": {"number": 2}}, KEY) is None
+
+
+def test_from_page_malformed_property_is_never_current():
+    page = page_with_property("garbage")
+
+    watermark = SyncWatermark.from_page(page, KEY)
+
+    assert not watermark.is_current(page)
+    # The property's version is kept, so that it can be overwritten.
+    assert watermark.property_version == 3
+
+
+def test_is_current_detects_new_page_version():
+    watermark = SyncWatermark(5)
+
+    assert not watermark.is_current({"version": {"number": 6}})
+
+
+def test_to_value():
+    assert SyncWatermark(5, ["1"]).to_value() == {"version": 5, "taskIds": ["1"]}
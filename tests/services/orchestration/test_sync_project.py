@@ -1,4 +1,5 @@
 # Mute logging during tests to keep test output clean
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock
@@ -11,12 +12,13 @@ from src.exceptions import InvalidInputError
 from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.issue_finder_interface import IFindIssue
 from src.interfaces.jira_interface import IJiraService
-from src.models.data_models import JiraIssue, JiraIssueStatus
+from src.models.data_models import HierarchyFilter, JiraIssue, JiraIssueStatus
 
 # Now import the service and models using the correct, updated path
 from src.services.orchestration.sync_project import (
     SyncProjectService,
 )
+from src.utils.deadline import DEADLINE_EXCEEDED_STATUS, deadline_scope
 
 logging.disable(logging.CRITICAL)
 # --- Stub Implementations for Dependencies ---
@@ -31,9 +33,35 @@ class ConfluenceServiceStub(IConfluenceService):
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
         return "page1" if "page1" in url else None
 
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        return {url: await self.get_page_id_from_url(url) for url in urls}
+
     async def get_all_descendants(self, page_id: str) -> List[str]:
         return []
 
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return [{"id": pid} for pid in await self.get_all_descendants(page_id)]
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ):
+        for page in await self.get_all_descendant_pages(page_id, expand=expand):
+            yield page
+
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        return True
+
     async def get_page_by_id(self, page_id: str, **kwargs) -> Optional[Dict[str, Any]]:
         content = self._pages_content.get(page_id)
         if content is None:
@@ -1133,3 +1161,109 @@ async def test_get_relevant_issues_with_no_valid_type_ids(
     # No candidates should be returned, and a warning should be logged.
     assert candidates == []
     assert "No target issue type IDs provided for JQL search" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sync_project_skips_pages_after_deadline(
+    confluence_issue_updater_service, confluence_updater_stub
+):
+    """Tests that pages are not processed once the deadline has passed."""
+    confluence_updater_stub.set_page_content(
+        "page1",
+        '<ac:structured-macro ac:name="jira"><ac:parameter ac:name="key">OLD-1'
+        "</ac:parameter></ac:structured-macro>",
+    )
+    confluence_issue_updater_service._get_project_issues = AsyncMock(
+        return_value=[{"key": "PROJ-2", "fields": {"summary": "Phase"}}]
+    )
+
+    with deadline_scope(0.001):
+        await asyncio.sleep(0.01)
+        results = await confluence_issue_updater_service.sync_project(
+            project_page_url="http://example.com/page1", project_key="PROJ-1"
+        )
+
+    assert [r.status for r in results] == [DEADLINE_EXCEEDED_STATUS]
+    assert confluence_updater_stub._updated_pages == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_project_reuses_pages_listed_with_bodies(
+    confluence_issue_updater_service, confluence_updater_stub
+):
+    """Tests that descendants listed with their bodies are not fetched again."""
+    macro = (
+        '<ac:structured-macro ac:name="jira"><ac:parameter ac:name="key">OLD-1'
+        "</ac:parameter></ac:structured-macro>"
+    )
+    confluence_updater_stub.set_page_content("page1", macro)
+    confluence_updater_stub.get_all_descendant_pages = AsyncMock(
+        return_value=[
+            {
+                "id": "child1",
+                "title": "Child",
+                "body": {"storage": {"value": macro}},
+                "version": {"number": 4},
+            }
+        ]
+    )
+    confluence_updater_stub.get_page_by_id = AsyncMock(
+        wraps=confluence_updater_stub.get_page_by_id
+    )
+    confluence_issue_updater_service._get_project_issues = AsyncMock(
+        return_value=[{"key": "PROJ-2", "fields": {"summary": "Phase"}}]
+    )
+    confluence_issue_updater_service._replace_page_macros = AsyncMock(
+        return_value=("<p>new</p>", True)
+    )
+
+    results = await confluence_issue_updater_service.sync_project(
+        project_page_url="http://example.com/page1", project_key="PROJ-1"
+    )
+
+    assert sorted(r.page_id for r in results) == ["child1", "page1"]
+    confluence_updater_stub.get_page_by_id.assert_awaited_once_with(
+        "page1", expand=SyncProjectService.PAGE_EXPAND
+    )
+    assert set(confluence_updater_stub._updated_pages) == {"child1", "page1"}
+
+
+@pytest.mark.asyncio
+async def test_sync_project_searches_jira_while_discovery_runs(
+    confluence_issue_updater_service, confluence_updater_stub
+):
+    """Tests that the Jira search does not wait for the page tree listing."""
+    macro = (
+        '<ac:structured-macro ac:name="jira"><ac:parameter ac:name="key">OLD-1'
+        "</ac:parameter></ac:structured-macro>"
+    )
+    confluence_updater_stub.set_page_content("page1", macro)
+    search_started = asyncio.Event()
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        await asyncio.wait_for(search_started.wait(), timeout=1)
+        yield {
+            "id": "child1",
+            "title": "Child",
+            "body": {"storage": {"value": macro}},
+            "version": {"number": 2},
+        }
+
+    async def get_project_issues(*args, **kwargs):
+        search_started.set()
+        return [{"key": "PROJ-2", "fields": {"summary": "Phase"}}]
+
+    confluence_updater_stub.iter_descendant_pages = iter_descendant_pages
+    confluence_issue_updater_service._get_project_issues = AsyncMock(
+        side_effect=get_project_issues
+    )
+    confluence_issue_updater_service._replace_page_macros = AsyncMock(
+        return_value=("<p>new</p>", True)
+    )
+
+    results = await confluence_issue_updater_service.sync_project(
+        project_page_url="http://example.com/page1", project_key="PROJ-1"
+    )
+
+    assert sorted(r.page_id for r in results) == ["child1", "page1"]
+    confluence_issue_updater_service._get_project_issues.assert_awaited_once()
@@ -1,5 +1,6 @@
 # File: tests/services/orchestration/test_sync_task_orchestrator.py
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, patch
@@ -8,14 +9,16 @@ import pytest
 import pytest_asyncio
 
 from src.config import config
-from src.exceptions import InvalidInputError
+from src.exceptions import ConfluenceApiError, InvalidInputError
 from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.issue_finder_interface import IFindIssue
 from src.interfaces.jira_interface import IJiraService
 from src.interfaces.history_service_interface import IHistoryService
 from src.models.api_models import SyncTaskContext
-from src.models.data_models import ConfluenceTask, JiraIssueStatus
+from src.models.data_models import ConfluenceTask, HierarchyFilter, JiraIssueStatus
+from src.services.business.sync_watermark import watermark_expand
 from src.services.orchestration.sync_task import SyncTaskService
+from src.utils.deadline import DEADLINE_EXCEEDED_STATUS, deadline_scope
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +57,35 @@ class ConfluenceServiceStub(IConfluenceService):
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
         return "page123" if "nonexistent" not in url else None
 
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        return {url: await self.get_page_id_from_url(url) for url in urls}
+
     async def get_all_descendants(self, page_id: str) -> List[str]:
         return []
 
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return [{"id": pid} for pid in await self.get_all_descendants(page_id)]
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ):
+        for page in await self.get_all_descendant_pages(page_id, expand=expand):
+            yield page
+
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        return True
+
     async def get_page_by_id(self, page_id: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
         return {
             "id": page_id, "title": "Mock Page Title",
@@ -541,23 +570,50 @@ async def test_process_tasks_no_successes(
 
 
 @pytest.mark.asyncio
-async def test_update_confluence_page_get_page_fails(
+async def test_run_skips_work_after_deadline(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    jira_stub: JiraServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """Tests that tasks are not created once the request deadline has passed."""
+    jira_stub.created_issue_key = "JIRA-DEADLINE"
+    input_data = {"confluence_page_urls": ["http://example.com/page1"]}
+
+    with deadline_scope(0.001):
+        await asyncio.sleep(0.01)
+        results = await sync_task.run(input_data, sync_context, request_id="dl-1")
+
+    assert results.deadline_exceeded is True
+    assert len(results.jira_task_creation_results) == 1
+    jira_result = results.jira_task_creation_results[0]
+    assert jira_result.creation_status_text == DEADLINE_EXCEEDED_STATUS
+    assert jira_result.new_jira_task_key is None
+    assert confluence_stub.updated_with_links is False
+
+
+@pytest.mark.asyncio
+async def test_update_confluence_page_does_not_reread_page(
     sync_task, confluence_stub
 ):
     """
-    Tests the failure path when get_page_by_id returns None inside _update_confluence_page.
-    This covers the `if not page_details:` branch.
+    Tests that _update_confluence_page reports the title it was given
+    instead of fetching the page just to read it.
     """
-    # Make get_page_by_id return None for the specific page
     confluence_stub.get_page_by_id = AsyncMock(return_value=None)
-    page_id = "nonexistent_page"
+    confluence_stub.add_jira_links_to_page = AsyncMock(return_value=True)
+    page_id = "page123"
     mappings = [{"confluence_task_id": "t1", "jira_key": "KEY-1"}]
 
-    result = await sync_task._update_confluence_page(page_id, mappings)
+    result = await sync_task._update_confluence_page(page_id, mappings, "My Page")
 
-    assert result.updated is False
-    assert result.page_id == page_id
-    assert f"Could not find page {page_id} for update" in result.error_message
+    assert result.updated is True
+    assert result.page_title == "My Page"
+    assert result.jira_keys_replaced == ["KEY-1"]
+    confluence_stub.get_page_by_id.assert_not_awaited()
+    confluence_stub.add_jira_links_to_page.assert_awaited_once_with(
+        page_id, mappings
+    )
 
 
 @pytest.mark.asyncio
@@ -653,7 +709,7 @@ async def test_run_handles_exception_in_hierarchy_processing(
         sync_task, "process_page_hierarchy", new_callable=AsyncMock
     ) as mock_process:
 
-        async def mock_side_effect(url, context):
+        async def mock_side_effect(url, context, root_page_id=None):
             if "fail" in url:
                 raise RuntimeError("Simulated processing error")
             else:
@@ -677,12 +733,11 @@ async def test_run_handles_exception_in_hierarchy_processing(
 
 
 @pytest.mark.asyncio
-async def test_collect_tasks_handles_none_page_details(
+async def test_collect_page_tasks_handles_none_page_details(
     sync_task, confluence_stub, caplog
 ):
     """
-    Tests that `_collect_tasks` correctly skips a page if `get_page_by_id` returns None.
-    This covers the `else` path of `if page_details:` at line 114.
+    Tests that `_collect_page_tasks` skips a page if `get_page_by_id` returns None.
     """
     page_ids = ["page123", "nonexistent_page"]
 
@@ -695,7 +750,11 @@ async def test_collect_tasks_handles_none_page_details(
 
     confluence_stub.get_page_by_id = side_effect
 
-    tasks = await sync_task._collect_tasks(page_ids)
+    tasks = [
+        task
+        for page_id in page_ids
+        for task in await sync_task._collect_page_tasks(page_id)
+    ]
 
     # Only the task from the valid page should be collected
     assert len(tasks) == 1
@@ -721,7 +780,7 @@ async def test_run_handles_unproccesable_url_and_returns_partial_status(
     ) as mock_process:
 
         # Define an async helper to control the mock's behavior
-        async def mock_side_effect(url, context):
+        async def mock_side_effect(url, context, root_page_id=None):
             if "fail" in url:
                 # Raise an exception for the "un-processable" URL
                 raise ValueError("Simulated processing error for this URL")
@@ -754,3 +813,227 @@ async def test_run_handles_unproccesable_url_and_returns_partial_status(
         # 3. The sub-statuses should reflect that the successful URL found no tasks to process.
         assert response.overall_jira_task_creation_status == "Skipped - No actions processed"
         assert response.overall_confluence_page_update_status == "Skipped - No actions processed"
+
+
+@pytest.mark.asyncio
+async def test_process_page_hierarchy_reuses_pages_listed_with_bodies(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """Descendants listed with their bodies are not fetched a second time."""
+    # Only without watermarks are the bodies part of the listing.
+    sync_task.use_watermarks = False
+    listed_page = {
+        "id": "child1",
+        "title": "Child",
+        "body": {"storage": {"value": "content"}},
+        "version": {"number": 3},
+    }
+    confluence_stub.get_all_descendant_pages = AsyncMock(return_value=[listed_page])
+    confluence_stub.get_page_by_id = AsyncMock(
+        wraps=confluence_stub.get_page_by_id
+    )
+    confluence_stub.get_tasks_from_page = AsyncMock(return_value=[])
+
+    await sync_task.process_page_hierarchy("http://example.com/root", sync_context)
+
+    confluence_stub.get_all_descendant_pages.assert_awaited_once_with(
+        "page123", expand=SyncTaskService.PAGE_EXPAND
+    )
+    confluence_stub.get_page_by_id.assert_awaited_once_with(
+        "page123", expand=SyncTaskService.PAGE_EXPAND
+    )
+    scanned = [c.args[0] for c in confluence_stub.get_tasks_from_page.await_args_list]
+    assert listed_page in scanned
+
+
+@pytest.mark.asyncio
+async def test_run_resolves_urls_in_bulk(
+    sync_task: SyncTaskService, confluence_stub, sync_context: SyncTaskContext
+):
+    """
+    Tests that run resolves all URLs with one bulk call, passes the IDs on and
+    skips URLs without a page ID.
+    """
+    confluence_stub.get_page_ids_from_urls = AsyncMock(
+        return_value={"http://x/a": "1", "http://x/nonexistent": None}
+    )
+    input_data = {"confluence_page_urls": ["http://x/a", "http://x/nonexistent"]}
+
+    with patch.object(
+        sync_task, "process_page_hierarchy", new_callable=AsyncMock
+    ) as mock_process:
+        mock_process.return_value = ([], [])
+        await sync_task.run(input_data, sync_context, "req-bulk")
+
+    confluence_stub.get_page_ids_from_urls.assert_awaited_once_with(
+        ["http://x/a", "http://x/nonexistent"]
+    )
+    mock_process.assert_awaited_once_with("http://x/a", sync_context, "1")
+
+
+@pytest.mark.asyncio
+async def test_process_page_hierarchy_scans_pages_while_discovery_runs(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """A streamed page is scanned before the rest of the tree is listed."""
+    first_scanned = asyncio.Event()
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        yield {"id": "child1", "body": {"storage": {"value": "content"}}}
+        await asyncio.wait_for(first_scanned.wait(), timeout=1)
+        yield {"id": "child2", "body": {"storage": {"value": "content"}}}
+
+    async def get_tasks_from_page(page_details):
+        if page_details["id"] == "child1":
+            first_scanned.set()
+        return []
+
+    confluence_stub.iter_descendant_pages = iter_descendant_pages
+    confluence_stub.get_tasks_from_page = AsyncMock(side_effect=get_tasks_from_page)
+
+    await sync_task.process_page_hierarchy("http://example.com/root", sync_context)
+
+    scanned = {c.args[0]["id"] for c in confluence_stub.get_tasks_from_page.await_args_list}
+    assert scanned == {"page123", "child1", "child2"}
+
+
+@pytest.mark.asyncio
+async def test_process_page_hierarchy_passes_hierarchy_filter(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+) -> None:
+    """The context's hierarchy filter is pushed down into discovery."""
+    hierarchy_filter = HierarchyFilter(max_depth=1, exclude_page_ids=["42"])
+    context = SyncTaskContext(request_user="user", hierarchy_filter=hierarchy_filter)
+    filters_used = []
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        filters_used.append(hierarchy_filter)
+        return
+        yield
+
+    confluence_stub.iter_descendant_pages = iter_descendant_pages
+    confluence_stub.get_tasks_from_page = AsyncMock(return_value=[])
+
+    await sync_task.process_page_hierarchy("http://example.com/root", context)
+
+    assert filters_used == [hierarchy_filter]
+
+
+def watermarked_page(page_id: str, version: int, synced_version: int) -> Dict[str, Any]:
+    return {
+        "id": page_id,
+        "version": {"number": version},
+        "metadata": {
+            "properties": {
+                "jira-sync-watermark": {
+                    "key": "jira-sync-watermark",
+                    "value": {"version": synced_version, "taskIds": []},
+                    "version": {"number": 4},
+                }
+            }
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_page_hierarchy_skips_pages_unchanged_since_last_sync(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """Pages still at their watermarked version are neither fetched nor parsed."""
+    sync_task.use_watermarks = True
+    sync_task.watermark_key = "jira-sync-watermark"
+    listing_expands = []
+
+    async def iter_descendant_pages(page_id, expand=None, hierarchy_filter=None):
+        listing_expands.append(expand)
+        yield watermarked_page("unchanged", 7, synced_version=7)
+        yield watermarked_page("edited", 8, synced_version=7)
+
+    confluence_stub.iter_descendant_pages = iter_descendant_pages
+    confluence_stub.get_page_by_id = AsyncMock(
+        wraps=confluence_stub.get_page_by_id
+    )
+    confluence_stub.get_tasks_from_page = AsyncMock(return_value=[])
+    confluence_stub.set_content_property = AsyncMock(return_value=True)
+
+    await sync_task.process_page_hierarchy("http://example.com/root", sync_context)
+
+    assert listing_expands == [watermark_expand("jira-sync-watermark")]
+    fetched = [
+        (c.args[0], c.kwargs["expand"])
+        for c in confluence_stub.get_page_by_id.await_args_list
+    ]
+    assert ("unchanged", SyncTaskService.PAGE_EXPAND) not in fetched
+    assert ("edited", SyncTaskService.PAGE_EXPAND) in fetched
+    scanned = {c.args[0]["id"] for c in confluence_stub.get_tasks_from_page.await_args_list}
+    assert scanned == {"page123", "edited"}
+    # The edited page's existing property is updated, the root's is created.
+    saved = {
+        c.args[0]: (c.args[2], c.kwargs["current_version"])
+        for c in confluence_stub.set_content_property.await_args_list
+    }
+    assert saved == {
+        "page123": ({"version": 1, "taskIds": []}, None),
+        "edited": ({"version": 1, "taskIds": []}, 4),
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_watermarks_only_fully_synced_pages(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    jira_stub: JiraServiceStub,
+    issue_finder_stub: IssueFinderServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """
+    A page whose links were written is watermarked at the version written; a
+    page with a failed task is left to be scanned again.
+    """
+    sync_task.use_watermarks = True
+    confluence_stub.set_content_property = AsyncMock(return_value=True)
+    jira_stub.created_issue_key = "JIRA-100"
+    input_data = {"confluence_page_urls": ["http://example.com/page1"]}
+
+    await sync_task.run(input_data, sync_context, request_id="wm-1")
+
+    confluence_stub.set_content_property.assert_awaited_once_with(
+        "page123",
+        sync_task.watermark_key,
+        {"version": 2, "taskIds": ["task1"]},
+        current_version=None,
+    )
+
+    confluence_stub.set_content_property.reset_mock()
+    issue_finder_stub.found_issue_key = None
+    await sync_task.run(input_data, sync_context, request_id="wm-2")
+
+    confluence_stub.set_content_property.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_process_page_hierarchy_ignores_watermark_write_failure(
+    sync_task: SyncTaskService,
+    confluence_stub: ConfluenceServiceStub,
+    sync_context: SyncTaskContext,
+) -> None:
+    """A watermark that cannot be stored does not fail the sync."""
+    sync_task.use_watermarks = True
+    confluence_stub.get_tasks_from_page = AsyncMock(return_value=[])
+    confluence_stub.set_content_property = AsyncMock(
+        side_effect=ConfluenceApiError("Conflict", status_code=409)
+    )
+
+    results = await sync_task.process_page_hierarchy(
+        "http://example.com/root", sync_context
+    )
+
+    assert results == ([], [])
+    confluence_stub.set_content_property.assert_awaited_once()
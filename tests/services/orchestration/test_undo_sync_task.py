@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock
@@ -11,10 +12,11 @@ from src.interfaces.confluence_interface import IConfluenceService
 from src.interfaces.issue_finder_interface import IFindIssue
 from src.interfaces.jira_interface import IJiraService
 from src.models.api_models import SyncTaskContext, UndoSyncTaskRequest
-from src.models.data_models import ConfluenceTask, JiraIssueStatus
+from src.models.data_models import ConfluenceTask, HierarchyFilter, JiraIssueStatus
 from src.services.orchestration.undo_sync_task import (
     UndoSyncService,
 )
+from src.utils.deadline import DEADLINE_EXCEEDED_STATUS, deadline_scope
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -77,9 +79,35 @@ class ConfluenceServiceStub(IConfluenceService):
     async def get_page_id_from_url(self, url: str) -> Optional[str]:
         return None
 
+    async def get_page_ids_from_urls(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        return {url: await self.get_page_id_from_url(url) for url in urls}
+
     async def get_all_descendants(self, page_id: str) -> List[str]:
         return []
 
+    async def get_all_descendant_pages(
+        self, page_id: str, expand: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return [{"id": pid} for pid in await self.get_all_descendants(page_id)]
+
+    async def iter_descendant_pages(
+        self,
+        page_id: str,
+        expand: Optional[str] = None,
+        hierarchy_filter: Optional[HierarchyFilter] = None,
+    ):
+        for page in await self.get_all_descendant_pages(page_id, expand=expand):
+            yield page
+
+    async def set_content_property(
+        self,
+        page_id: str,
+        key: str,
+        value: Dict[str, Any],
+        current_version: Optional[int] = None,
+    ) -> bool:
+        return True
+
     async def get_tasks_from_page(
         self, page_details: Dict[str, Any]
     ) -> List[ConfluenceTask]:
@@ -219,6 +247,29 @@ async def test_undo_run_success_with_tasks(
     assert confluence_undo_stub._page_content == "ORIGINAL_HTML_CONTENT_BEFORE_SYNC"
 
 
+@pytest.mark.asyncio
+async def test_undo_run_skips_actions_after_deadline(
+    undo_orchestrator: UndoSyncService,
+    confluence_undo_stub: ConfluenceServiceStub,
+    jira_undo_stub: JiraServiceStub,
+    sample_synced_item: UndoSyncTaskRequest,
+) -> None:
+    """Tests that no undo action is attempted once the deadline has passed."""
+    with deadline_scope(0.001):
+        await asyncio.sleep(0.01)
+        undo_response = await undo_orchestrator.run(
+            [sample_synced_item], request_id="undo-deadline"
+        )
+
+    assert undo_response.deadline_exceeded is True
+    assert undo_response.results
+    assert all(
+        r.error_message == DEADLINE_EXCEEDED_STATUS for r in undo_response.results
+    )
+    assert jira_undo_stub.transitioned_issues == {}
+    assert confluence_undo_stub.page_updated_count == 0
+
+
 @pytest.mark.asyncio
 async def test_undo_run_no_input(undo_orchestrator: UndoSyncService) -> None:
     """Test that an error is raised for no input."""
@@ -1,6 +1,6 @@
 # File: test/test_main.py
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
@@ -15,6 +15,7 @@ from src.dependencies import (
     get_sync_task,
     get_undo_sync_task,
     get_history_service,
+    get_page_cache,
 )
 from src.exceptions import (
     InvalidInputError,
@@ -22,7 +23,8 @@ from src.exceptions import (
     SyncError,
     UndoError,
 )
-from src.main import app
+from src.main import app, warm_up
+from src.services.adaptors.page_cache import PageCache
 from src.models.api_models import (
     ConfluencePageUpdateResult,
     JiraTaskCreationResult,
@@ -32,6 +34,7 @@ from src.models.api_models import (
     UndoSyncTaskRequest,
     UndoSyncTaskResponse,
 )
+from src.models.data_models import HierarchyFilter
 
 
 # --- Fixtures for common mocks ---
@@ -127,6 +130,7 @@ def common_dependencies_override(
     mock_http_helper = AsyncMock()
     mock_http_helper.client = AsyncMock()
     mock_http_helper.client.aclose = AsyncMock(return_value=None)
+    mock_http_helper.circuit_breaker_states = Mock(return_value={})
 
     with patch("httpx.AsyncClient") as MockAsyncClient:
         MockAsyncClient.return_value = mock_http_helper.client
@@ -267,6 +271,47 @@ async def test_sync_project_success(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_sync_project_passes_hierarchy_filter(
+    mock_confluence_issue_updater_service, client
+):
+    """Verify /sync_project hands the request's hierarchy filter on."""
+    request_body = {
+        "project_page_url": "http://example.com/project_root",
+        "project_key": "PROJ-123",
+        "request_user": "test_user",
+        "hierarchy_filter": {"max_depth": 2, "exclude_page_ids": ["42"]},
+    }
+    response = client.post(
+        "/sync_project", json=request_body, headers={"X-API-Key": "valid_key"}
+    )
+    assert response.status_code == 200
+    kwargs = mock_confluence_issue_updater_service.sync_project.await_args.kwargs
+    assert kwargs["hierarchy_filter"] == HierarchyFilter(
+        max_depth=2, exclude_page_ids=["42"]
+    )
+
+
+@pytest.mark.parametrize(
+    "hierarchy_filter",
+    [
+        {"exclude_title_patterns": ["(unclosed"]},
+        {"exclude_page_ids": ["12) or (1=1"]},
+        {"max_depth": -1},
+    ],
+)
+def test_sync_task_rejects_invalid_hierarchy_filter(hierarchy_filter, client):
+    """Verify /sync_task rejects filters that cannot be applied."""
+    request_body = {
+        "confluence_page_urls": ["http://page.com"],
+        "context": {"request_user": "user", "hierarchy_filter": hierarchy_filter},
+    }
+    response = client.post(
+        "/sync_task", json=request_body, headers={"X-API-Key": "valid_key"}
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_health_check_returns_ok(client):
     """Verify the /health endpoint returns 200 OK."""
@@ -285,6 +330,74 @@ async def test_readiness_check_success(mock_jira_api, mock_confluence_api, clien
     assert response.json()["detail"] == "Application and dependencies are ready."
 
 
+def test_readiness_check_reports_circuit_breakers(client):
+    """Verify /ready includes the state of each upstream's circuit breaker."""
+    helper = Mock()
+    helper.circuit_breaker_states.return_value = {
+        "jira": "closed",
+        "confluence": "half_open",
+    }
+    app.dependency_overrides[get_https_helper] = lambda: helper
+
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["circuit_breakers"] == {
+        "jira": "closed",
+        "confluence": "half_open",
+    }
+
+
+def test_readiness_check_fails_while_circuit_is_open(mock_confluence_api, client):
+    """Verify /ready returns 503 without probing while a circuit is open."""
+    helper = Mock()
+    helper.circuit_breaker_states.return_value = {
+        "jira": "closed",
+        "confluence": "open",
+    }
+    app.dependency_overrides[get_https_helper] = lambda: helper
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert "confluence" in response.json()["detail"]
+    mock_confluence_api.get_all_spaces.assert_not_awaited()
+
+
+def test_readiness_check_fails_while_warming_up(mock_jira_api, client):
+    """Verify /ready returns 503 until the start-up warm-up has finished."""
+    warm_up_task = Mock()
+    warm_up_task.done.return_value = False
+    app.state.warm_up_task = warm_up_task
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert "Warming up" in response.json()["detail"]
+    mock_jira_api.get_current_user.assert_not_awaited()
+
+    warm_up_task.done.return_value = True
+    assert client.get("/ready").status_code == 200
+    app.state.warm_up_task = None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections_and_primes_caches():
+    """Verify warm-up opens connections and primes the Jira service caches."""
+    helper = Mock()
+    helper.warm_up = AsyncMock(return_value={"jira": 4})
+    jira_service = Mock()
+    jira_service.get_user_display_name = AsyncMock(return_value="Bot")
+    jira_service.get_issue_type_name = AsyncMock(return_value="Task")
+
+    with patch("src.main.get_jira_service", return_value=jira_service):
+        await warm_up(helper)
+
+    helper.warm_up.assert_awaited_once()
+    jira_service.get_user_display_name.assert_awaited_once()
+    assert jira_service.get_issue_type_name.await_count >= 1
+
+
 @pytest.mark.asyncio
 async def test_readiness_check_jira_api_failure(mock_jira_api, client):
     """Verify /ready returns a 500 response when a dependency fails."""
@@ -344,3 +457,42 @@ async def test_undo_sync_task_custom_exceptions(
     # After applying Fix 2, the status code will now match the expected status
     assert response.status_code == expected_status
     assert expected_message in response.json()["detail"]
+
+
+def test_metrics_returns_http_client_metrics(client):
+    """Verify /metrics exposes the HTTPS helper's metrics snapshot."""
+    helper = Mock()
+    helper.get_metrics.return_value = {"connections": {"connections": 3}}
+    app.dependency_overrides[get_https_helper] = lambda: helper
+    app.dependency_overrides[get_page_cache] = lambda: None
+
+    response = client.get("/metrics", headers={"X-API-Key": "valid_key"})
+
+    assert response.status_code == 200
+    assert response.json() == {"http": {"connections": {"connections": 3}}}
+
+
+def test_metrics_includes_page_cache_stats(client):
+    """Verify /metrics reports the page cache's hit ratio when it is enabled."""
+    helper = Mock()
+    helper.get_metrics.return_value = {}
+    app.dependency_overrides[get_https_helper] = lambda: helper
+    app.dependency_overrides[get_page_cache] = lambda: PageCache(1024)
+
+    response = client.get("/metrics", headers={"X-API-Key": "valid_key"})
+
+    assert response.status_code == 200
+    assert response.json()["page_cache"]["hit_ratio"] == 0.0
+
+
+def test_metrics_timings_passes_top_to_helper(client):
+    """Verify /metrics/timings returns the helper's latency histograms."""
+    helper = Mock()
+    helper.request_timings.return_value = {"jira GET search": {}}
+    app.dependency_overrides[get_https_helper] = lambda: helper
+
+    response = client.get("/metrics/timings?top=3", headers={"X-API-Key": "valid_key"})
+
+    assert response.status_code == 200
+    assert response.json() == {"timings": {"jira GET search": {}}}
+    helper.request_timings.assert_called_once_with(3)
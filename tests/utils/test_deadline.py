@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from src.utils.deadline import (
+    deadline_exceeded,
+    deadline_scope,
+    deadline_var,
+    time_remaining,
+)
+
+
+def test_no_deadline_by_default() -> None:
+    assert time_remaining() is None
+    assert deadline_exceeded() is False
+
+
+def test_deadline_scope_sets_and_resets_deadline() -> None:
+    with deadline_scope(10) as deadline:
+        assert deadline is not None
+        remaining = time_remaining()
+        assert remaining is not None and 9 < remaining <= 10
+        assert deadline_exceeded() is False
+    assert deadline_var.get() is None
+
+
+@pytest.mark.parametrize("seconds", [None, 0, -1])
+def test_deadline_scope_without_positive_seconds_keeps_outer_deadline(seconds) -> None:
+    with deadline_scope(seconds) as deadline:
+        assert deadline is None
+    with deadline_scope(5) as outer:
+        with deadline_scope(seconds) as inner:
+            assert inner == outer
+
+
+def test_nested_deadline_scope_only_shortens() -> None:
+    with deadline_scope(5) as outer:
+        with deadline_scope(60) as longer:
+            assert longer == outer
+        with deadline_scope(1) as shorter:
+            assert shorter is not None and outer is not None
+            assert shorter < outer
+        assert deadline_var.get() == outer
+
+
+@pytest.mark.asyncio
+async def test_deadline_is_seen_by_gathered_tasks_and_expires() -> None:
+    async def check() -> bool:
+        await asyncio.sleep(0.02)
+        return deadline_exceeded()
+
+    with deadline_scope(0.01):
+        results = await asyncio.gather(check(), check())
+
+    assert results == [True, True]
+    assert deadline_exceeded() is False